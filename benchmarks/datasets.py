@@ -0,0 +1,142 @@
+"""
+Seeded synthetic datasets covering the profiler's scaling axes.
+
+Every generator takes a `scale` factor (1.0 = default size) and a `seed`, and returns the same
+frame for the same arguments, so timings are comparable across commits and machines.
+"""
+import numpy as np
+import pandas as pd
+
+_SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'te', 'vi', 'do', 'pa', 'zu', 'ge', 'ho', 'ji', 'ba', 'fo']
+
+
+def _rows(base: int, scale: float) -> int:
+    return max(10, int(base * scale))
+
+
+def _vocabulary(rng, size: int) -> np.ndarray:
+    lengths = rng.integers(1, 5, size)
+    words = {''.join(rng.choice(_SYLLABLES, length)) for length in lengths}
+    return np.array(sorted(words))
+
+
+def _sentences(rng, vocabulary: np.ndarray, rows: int, min_words: int, max_words: int) -> np.ndarray:
+    # Zipf-distributed word choice, like natural text
+    ranks = np.minimum(rng.zipf(1.3, size=rows * max_words), len(vocabulary)) - 1
+    words = vocabulary[ranks].reshape(rows, max_words)
+    lengths = rng.integers(min_words, max_words + 1, rows)
+    return np.array([' '.join(row[:length]) for row, length in zip(words, lengths)], dtype=object)
+
+
+def tall_narrow(scale: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Many rows, few numeric columns: exercises the per-row costs (stats, duplicates, binning).
+    """
+    rng = np.random.default_rng(seed)
+    n = _rows(200_000, scale)
+    outliers = rng.normal(size=n)
+    outliers[rng.random(n) < 0.01] *= 50
+    return pd.DataFrame({
+        'normal': rng.normal(size=n),
+        'lognormal': rng.lognormal(size=n),
+        'uniform': rng.uniform(-1, 1, n),
+        'outliers': outliers,
+        'counts': rng.poisson(3, n),
+        'ids': np.arange(n),
+        'rounded': np.round(rng.normal(size=n), 1),
+        'small_int': rng.integers(0, 10, n),
+    })
+
+
+def short_wide(scale: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Few rows, many columns: exercises per-column overhead, correlation matrices and plot count.
+    """
+    rng = np.random.default_rng(seed)
+    n, num_columns = 2_000, max(4, int(100 * scale))
+    latent = rng.normal(size=(n, 5))
+    data = latent @ rng.normal(size=(5, num_columns)) + rng.normal(size=(n, num_columns))
+    frame = pd.DataFrame(data, columns=[f'x{j}' for j in range(num_columns)])
+    for j in range(0, num_columns, 10):
+        frame[f'c{j}'] = rng.choice(list('abcdefgh'), n)
+    return frame
+
+
+def high_cardinality_strings(scale: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """
+    String columns with many distinct values: exercises value counts, sketches and Cramér's V.
+    """
+    rng = np.random.default_rng(seed)
+    n = _rows(100_000, scale)
+    return pd.DataFrame({
+        'id': [f'{value:016x}' for value in rng.integers(0, 2 ** 62, n)],
+        'sku': np.char.add('sku-', rng.integers(0, 50_000, n).astype(str)).astype(object),
+        'zip': rng.integers(10_000, 20_000, n).astype(str).astype(object),
+        'country': rng.choice([f'country_{i}' for i in range(200)], n),
+        'amount': rng.gamma(2.0, 50.0, n),
+    })
+
+
+def free_text(scale: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Long free-text columns: exercises tokenization, word frequencies and word clouds.
+    """
+    rng = np.random.default_rng(seed)
+    n = _rows(20_000, scale)
+    vocabulary = _vocabulary(rng, 5_000)
+    return pd.DataFrame({
+        'review': _sentences(rng, vocabulary, n, 5, 60),
+        'title': _sentences(rng, vocabulary, n, 1, 6),
+        'rating': rng.integers(1, 6, n),
+    })
+
+
+def heavily_null(scale: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """
+    Mostly-missing columns with shared gaps: exercises the nullity mask and missingness patterns.
+    """
+    rng = np.random.default_rng(seed)
+    n = _rows(100_000, scale)
+    groups = rng.integers(0, 4, n)  # Columns in the same group go missing together
+    frame = {}
+    for j in range(20):
+        missing = (groups == j % 4) | (rng.random(n) < 0.6)
+        if j % 2:
+            values = pd.Series(rng.normal(size=n))
+        else:
+            values = pd.Series(rng.choice(['low', 'mid', 'high'], n), dtype=object)
+        values[missing] = np.nan
+        frame[f'col{j}'] = values
+    return pd.DataFrame(frame)
+
+
+def mixed_types(scale: float = 1.0, seed: int = 0) -> pd.DataFrame:
+    """
+    One column of every kind the type inference distinguishes.
+    """
+    rng = np.random.default_rng(seed)
+    n = _rows(50_000, scale)
+    nullable = pd.array(rng.integers(0, 100, n), dtype='Int64')
+    nullable[rng.random(n) < 0.1] = pd.NA
+    return pd.DataFrame({
+        'float': rng.normal(size=n),
+        'int': rng.integers(-1000, 1000, n),
+        'nullable_int': nullable,
+        'bool': rng.random(n) < 0.3,
+        'category': pd.Categorical(rng.choice(['red', 'green', 'blue'], n)),
+        'datetime': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 10 ** 8, n), unit='s'),
+        'string': rng.choice(['alpha', 'beta', 'gamma', 'delta'], n),
+        'numeric_string': rng.integers(0, 500, n).astype(str).astype(object),
+        'url': np.char.add('https://example.com/item/', rng.integers(0, 1000, n).astype(str)).astype(object),
+        'constant': np.ones(n),
+    })
+
+
+DATASETS = {
+    'tall_narrow': tall_narrow,
+    'short_wide': short_wide,
+    'high_cardinality_strings': high_cardinality_strings,
+    'free_text': free_text,
+    'heavily_null': heavily_null,
+    'mixed_types': mixed_types,
+}
@@ -0,0 +1,76 @@
+"""
+Import-time benchmark for data_visualizer.
+
+Measures how long `import data_visualizer` takes on top of pandas (each sample in a fresh
+interpreter) and checks that a minimal, plot-free run never loads the heavy optional
+libraries. Exits non-zero on a regression, so it can guard CI:
+
+    python benchmarks/import_time.py --repeat 5 --max-seconds 0.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must stay unloaded after `import data_visualizer` and a minimal, plot-free analysis
+LAZY_MODULES = ['matplotlib', 'seaborn', 'plotly', 'wordcloud', 'scipy', 'jinja2', 'visions', 'shapely', 'imagehash', 'PIL']
+
+_TIMING_SCRIPT = """
+import json, sys, time
+import pandas
+start = time.perf_counter()
+import data_visualizer
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [m for m in %(lazy)r if m in sys.modules]}))
+"""
+
+_MINIMAL_RUN_SCRIPT = """
+import contextlib, io, json, sys
+import numpy as np, pandas as pd
+import data_visualizer
+df = pd.DataFrame({'x': np.arange(1000.0), 'y': np.arange(1000) %% 7, 'z': ['a', 'b'] * 500})
+settings = data_visualizer.Settings(minimal=True, include_plots=False, include_correlations_plots=False)
+with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+    data_visualizer.AnalysisReport(df, settings).analyse()
+print(json.dumps({'loaded': [m for m in %(lazy)r if m in sys.modules]}))
+"""
+
+
+def _run(script: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get('PYTHONPATH')])))
+    output = subprocess.run([sys.executable, '-c', script % {'lazy': LAZY_MODULES}],
+                            capture_output=True, text=True, check=True, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='fresh-interpreter samples to take')
+    parser.add_argument('--max-seconds', type=float, default=0.5, help='fail if the median import time exceeds this')
+    args = parser.parse_args(argv)
+
+    samples = [_run(_TIMING_SCRIPT) for _ in range(args.repeat)]
+    median = statistics.median(sample['seconds'] for sample in samples)
+    loaded_on_import = samples[0]['loaded']
+    loaded_on_minimal_run = _run(_MINIMAL_RUN_SCRIPT)['loaded']
+
+    print(f"import data_visualizer: median {median * 1000:.1f} ms over {args.repeat} runs (excluding pandas)")
+    print(f"heavy modules loaded on import: {loaded_on_import or 'none'}")
+    print(f"heavy modules loaded by a minimal run: {loaded_on_minimal_run or 'none'}")
+
+    failed = False
+    if median > args.max_seconds:
+        print(f"FAIL: import time above {args.max_seconds:.3f} s")
+        failed = True
+    if loaded_on_import or loaded_on_minimal_run:
+        print("FAIL: optional libraries were imported eagerly")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Stage-by-stage benchmark of AnalysisReport on synthetic datasets.
+
+Every dataset from `datasets.py` is profiled under every settings preset (minimal, no plots,
+seaborn, plotly, sampled). Each stage is timed (best of `--repeat` runs) and memory-profiled (tracemalloc
+peak, in a separate run so tracing does not skew the timings):
+
+    overview, type_inference, numeric/categorical/string/other analyzers, correlations,
+    analyse (end to end, plots deferred), plot_rendering, html
+
+With `--arrow` the datasets are passed as Arrow tables, as a pyarrow/Polars user would (string
+columns stay Arrow-backed). Results are written as JSON per commit (benchmarks/results/<commit>.json by default); pass an
+earlier file to `--compare` to list stages that got slower or hungrier. Exits non-zero when
+any stage regressed beyond `--threshold`:
+
+    python benchmarks/run_benchmarks.py --scale 0.2 --presets no_plots,seaborn
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import data_visualizer  # noqa: E402
+from data_visualizer import AnalysisReport, Settings, generate_html_report  # noqa: E402
+from data_visualizer.arrow_data import arrow_to_pandas  # noqa: E402
+from data_visualizer.correlations import calculate_correlations  # noqa: E402
+from data_visualizer.duplicates import find_duplicates  # noqa: E402
+from data_visualizer.missingness import NullityMask  # noqa: E402
+from data_visualizer.numeric_stats import compute_numeric_stats  # noqa: E402
+from data_visualizer.sampling import sample_positions, stage_rows  # noqa: E402
+from data_visualizer.type_analyzers import _analyse_generic  # noqa: E402
+from data_visualizer.type_inference import infer_column_type  # noqa: E402
+from data_visualizer.type_registry import get_analyzer  # noqa: E402
+from datasets import DATASETS  # noqa: E402
+
+PRESETS = {
+    'minimal': dict(minimal=True, include_plots=False, include_correlations_plots=False),
+    'no_plots': dict(include_plots=False, include_correlations_plots=False),
+    'seaborn': dict(),
+    'plotly': dict(use_plotly=True),
+    'sampled': dict(sampling='uniform', sample_size=20_000),  # Expensive stages on a row sample
+}
+
+# Analyzer stages, by the visions type names the analyzers are registered under
+ANALYZER_STAGES = {
+    'numeric_analyzers': {'Float', 'Integer'},
+    'categorical_analyzers': {'Categorical', 'Boolean'},
+    'string_analyzers': {'String'},
+}
+
+MIN_COMPARABLE_SECONDS = 0.05  # Faster stages are too noisy to flag
+MIN_COMPARABLE_MB = 1.0
+TEMPLATE_DIR = os.path.join(os.path.dirname(data_visualizer.__file__), 'templates')
+
+
+def _measure(func, trace_memory: bool):
+    # Returns (result, seconds, peak MiB or None); the package's progress output is silenced
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            result = func()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20 if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _overview(frame, settings):
+    nullity = NullityMask(frame)
+    find_duplicates(frame, subset=settings.duplicate_subset, chunksize=settings.duplicate_chunksize,
+                    max_indices=settings.max_duplicate_indices)
+    if settings.include_missingness:
+        nullity.summary(settings)
+    return nullity
+
+
+def _analyzer_stage(report, frame, columns, column_types):
+    for column_name in columns:
+        get_analyzer(column_types[column_name], _analyse_generic)(report, frame[column_name])
+
+
+def run_stages(frame, settings: Settings, workdir: str, trace_memory: bool = False) -> dict:
+    """
+    Run every stage once; returns stage -> seconds (or peak MiB when `trace_memory`).
+    """
+    measurements = {}
+
+    def stage(name, func):
+        result, seconds, peak = _measure(func, trace_memory)
+        measurements[name] = peak if trace_memory else seconds
+        return result
+
+    report = AnalysisReport(frame, settings)
+    report.nullity = stage('overview', lambda: _overview(frame, settings))
+    positions = sample_positions(frame, settings)  # Sampled stages run on these rows, as in analyse()
+    report.sample = frame.iloc[positions] if positions is not None else None
+
+    if not settings.minimal:
+        column_types = stage('type_inference', lambda: {
+            column_name: str(infer_column_type(stage_rows(report, frame[column_name], 'type_inference'), settings))
+            for column_name in frame.columns})
+        grouped = {name: [column_name for column_name, type_name in column_types.items() if type_name in types]
+                   for name, types in ANALYZER_STAGES.items()}
+        grouped['other_analyzers'] = [column_name for column_name in frame.columns
+                                      if not any(column_name in columns for columns in grouped.values())]
+
+        def numeric_stage(columns=grouped.pop('numeric_analyzers')):
+            numeric_block = frame[columns].select_dtypes(include='number')
+            report.numeric_stats = compute_numeric_stats(numeric_block, settings.outlier_threshold)
+            _analyzer_stage(report, frame, columns, column_types)
+
+        stage('numeric_analyzers', numeric_stage)
+        for name, columns in grouped.items():
+            stage(name, lambda columns=columns: _analyzer_stage(report, frame, columns, column_types))
+
+    if settings.include_correlations:
+        correlation_sample = report.sample if 'correlations' in settings.sample_stages else None
+        stage('correlations', lambda: calculate_correlations(frame, settings=settings, sample=correlation_sample))
+
+    # End to end, with the plots drawn in their own stage afterwards
+    full_report = AnalysisReport(frame, settings.model_copy(update={'defer_plots': True}))
+    stage('analyse', full_report.analyse)
+    if settings.include_plots or settings.include_correlations_plots:
+        stage('plot_rendering', full_report.render_plots)
+    if os.path.isdir(TEMPLATE_DIR):
+        output = os.path.join(workdir, 'report.html')
+        stage('html', lambda: generate_html_report(full_report.results, output, assets=settings.report_assets))
+    return measurements
+
+
+def _git_revision() -> str:
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return revision + ('-dirty' if dirty else '')
+
+
+def _load(dataset_name: str, scale: float, arrow: bool):
+    frame = DATASETS[dataset_name](scale)
+    if arrow:
+        import pyarrow as pa
+        # The frame AnalysisReport builds from an Arrow table, so every stage sees the same columns
+        frame = arrow_to_pandas(pa.Table.from_pandas(frame, preserve_index=False))
+    return frame
+
+
+def run_suite(dataset_names, preset_names, scale: float, repeat: int, trace_memory: bool, arrow: bool = False) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Untimed pass on a tiny frame, so lazy imports (visions, matplotlib, ...) are not
+        # charged to whichever dataset happens to run first
+        warm_up_frame = _load('mixed_types', 0.0, arrow)
+        for preset_name in preset_names:
+            run_stages(warm_up_frame, Settings(**PRESETS[preset_name]), workdir)
+
+        for dataset_name in dataset_names:
+            frame = _load(dataset_name, scale, arrow)
+            results[dataset_name] = {'shape': list(frame.shape)}
+            for preset_name in preset_names:
+                settings = Settings(**PRESETS[preset_name])
+                runs = [run_stages(frame, settings, workdir) for _ in range(repeat)]
+                stages = {name: {'seconds': min(run[name] for run in runs)} for name in runs[0]}
+                if trace_memory:
+                    for name, peak in run_stages(frame, settings, workdir, trace_memory=True).items():
+                        stages[name]['peak_mb'] = peak
+                results[dataset_name][preset_name] = stages
+                print(f"{dataset_name:<26} {preset_name:<9} " + '  '.join(
+                    f"{name} {stage['seconds']:.2f}s" for name, stage in stages.items()), flush=True)
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Stages whose time or peak memory grew by more than `threshold` (a ratio) since `baseline`.
+    """
+    regressions = []
+    for dataset_name, presets in current['results'].items():
+        for preset_name, stages in presets.items():
+            if preset_name == 'shape':
+                continue
+            old_stages = baseline['results'].get(dataset_name, {}).get(preset_name, {})
+            for name, stage in stages.items():
+                old = old_stages.get(name)
+                if old is None:
+                    continue
+                for metric, floor in (('seconds', MIN_COMPARABLE_SECONDS), ('peak_mb', MIN_COMPARABLE_MB)):
+                    if metric in stage and metric in old and old[metric] >= floor:
+                        ratio = stage[metric] / old[metric]
+                        if ratio > threshold:
+                            regressions.append((dataset_name, preset_name, name, metric, old[metric], stage[metric], ratio))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--datasets', default=','.join(DATASETS), help='comma-separated dataset names')
+    parser.add_argument('--presets', default=','.join(PRESETS), help='comma-separated settings presets')
+    parser.add_argument('--scale', type=float, default=1.0, help='dataset size factor')
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per stage (the best is kept)')
+    parser.add_argument('--arrow', action='store_true', help='profile the datasets as Arrow tables')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='earlier results file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown/growth ratio counted as a regression')
+    args = parser.parse_args(argv)
+
+    dataset_names = args.datasets.split(',')
+    preset_names = args.presets.split(',')
+    for name in dataset_names + preset_names:
+        if name not in DATASETS and name not in PRESETS:
+            parser.error(f"unknown dataset or preset: {name}")
+
+    revision = _git_revision()
+    current = {
+        'revision': revision,
+        'version': data_visualizer.__version__,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'input': 'arrow' if args.arrow else 'pandas',
+        'results': run_suite(dataset_names, preset_names, args.scale, args.repeat, not args.no_memory, args.arrow),
+    }
+    if not os.path.isdir(TEMPLATE_DIR):
+        print("note: report template not found, html stage skipped")
+
+    output = args.output or os.path.join(REPO_ROOT, 'benchmarks', 'results', f'{revision}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('scale') != args.scale:
+            print(f"warning: baseline was run at scale {baseline.get('scale')}, this run at {args.scale}")
+        if baseline.get('input', 'pandas') != current['input']:
+            print(f"warning: baseline profiled {baseline.get('input', 'pandas')} input, this run {current['input']}")
+        regressions = compare(baseline, current, args.threshold)
+        for dataset_name, preset_name, name, metric, old, new, ratio in regressions:
+            print(f"REGRESSION {dataset_name}/{preset_name}/{name} {metric}: {old:.3f} -> {new:.3f} ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"no regressions against {baseline.get('revision', args.compare)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
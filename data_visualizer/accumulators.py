@@ -0,0 +1,274 @@
+# data_visualizer/accumulators.py
+"""
+Mergeable per-column accumulators. Each one is updated with a slice of rows at a time, can be
+merged with another accumulator of the same kind, and finalizes into the same keys the
+in-memory analyzers produce, plus the list of fields that came from sketches.
+"""
+import numpy as np
+import pandas as pd
+from .sketches import HyperLogLog, HeavyHitters, KLLSketch, hash_values
+from .numeric_stats import moment_statistics
+from .text_analysis import TokenCounter
+
+NUM_HISTOGRAM_BINS = 20
+
+
+class MomentAccumulator:
+    """
+    Count, mean and the sums of 2nd/3rd/4th powers of deviations, merged with Pebay's
+    pairwise update formulas so chunks can be combined in any order.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        chunk = MomentAccumulator()
+        chunk.n = len(values)
+        chunk.mean = float(values.mean())
+        deviations = values - chunk.mean
+        deviations2 = deviations ** 2
+        chunk.m2 = float(deviations2.sum())
+        chunk.m3 = float((deviations2 * deviations).sum())
+        chunk.m4 = float((deviations2 ** 2).sum())
+        self.merge(chunk)
+
+    def merge(self, other: "MomentAccumulator"):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = other.n, other.mean, other.m2, other.m3, other.m4
+            return self
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta ** 2 * na * nb / n
+        m3 = (self.m3 + other.m3 + delta ** 3 * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4 + delta ** 4 * na * nb * (na ** 2 - na * nb + nb ** 2) / n ** 3
+              + 6 * delta ** 2 * (na ** 2 * other.m2 + nb ** 2 * self.m2) / n ** 2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, self.mean + delta * nb / n, m2, m3, m4
+        return self
+
+
+class NumericAccumulator:
+    """
+    Exact count/mean/std/skewness/kurtosis/min/max plus a KLL sketch for quartiles,
+    IQR outliers and the histogram.
+    """
+
+    def __init__(self, settings):
+        self.moments = MomentAccumulator()
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = KLLSketch(settings.quantile_sketch_k)
+
+    def update(self, column: pd.Series):
+        values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.moments.update(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+
+    def merge(self, other: "NumericAccumulator"):
+        self.moments.merge(other.moments)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def finalize(self, num_rows: int, settings) -> dict:
+        n = self.moments.n
+        std, skewness, kurtosis = (float(v[0]) for v in moment_statistics(
+            np.array([n]), np.array([self.moments.m2]), np.array([self.moments.m3]), np.array([self.moments.m4])))
+        q1, median, q3 = (float(v) for v in self.sketch.quantiles([0.25, 0.5, 0.75]))
+
+        iqr = q3 - q1
+        lower_bound = q1 - settings.outlier_threshold * iqr
+        upper_bound = q3 + settings.outlier_threshold * iqr
+        outlier_count = 0
+        if n > 0:
+            outlier_count = int(round(self.sketch.rank(lower_bound) + (n - self.sketch.rank(upper_bound, inclusive=True))))
+
+        stats = {
+            'count': float(n),
+            'mean': float(self.moments.mean) if n > 0 else np.nan,
+            'std': std,
+            'min': self.min if n > 0 else np.nan,
+            '25%': q1,
+            '50%': median,
+            '75%': q3,
+            'max': self.max if n > 0 else np.nan,
+            'skewness': skewness if not np.isnan(skewness) else 0.0,
+            'kurtosis': kurtosis if not np.isnan(kurtosis) else 0.0,
+            'outlier_count': outlier_count,
+            'outlier_percentage': (outlier_count / num_rows * 100) if num_rows > 0 else 0.0,
+        }
+        approximate_fields = ['25%', '50%', '75%', 'outlier_count', 'outlier_percentage']
+        return stats, approximate_fields
+
+    def histogram(self):
+        if self.moments.n == 0:
+            return None
+        return self.sketch.histogram(NUM_HISTOGRAM_BINS, (self.min, self.max))
+
+
+class ValueAccumulator:
+    """
+    Top values (heavy hitters) and distinct count (exact while the values fit in the
+    heavy-hitter summary, HyperLogLog otherwise) for categorical, string and generic columns.
+    String columns also track word frequencies.
+    """
+
+    def __init__(self, settings, track_words: bool = False):
+        self.values = HeavyHitters(settings.sketch_capacity)
+        self.distinct = HyperLogLog(settings.hll_precision)
+        self.words = TokenCounter(settings) if track_words else None
+
+    def update(self, column: pd.Series):
+        values = column.dropna()
+        if values.empty:
+            return
+        counts = values.value_counts()
+        self.values.update_counts(counts)
+        self.distinct.update_hashes(hash_values(counts.index.to_series()))
+        if self.words is not None:
+            self.words.update(values)
+
+    def merge(self, other: "ValueAccumulator"):
+        self.values.merge(other.values)
+        self.distinct.merge(other.distinct)
+        if self.words is not None and other.words is not None:
+            self.words.merge(other.words)
+        return self
+
+    def num_unique(self):
+        if self.values.is_exact:
+            return len(self.values.counts), True
+        return self.distinct.estimate(), False
+
+    def finalize(self, num_rows: int, settings, unique_key: str = 'num_unique', generic: bool = False) -> tuple:
+        """
+        Returns (stats, approximate_fields). `unique_key` follows the analyzer being emulated
+        ('unique_values' for categoricals, 'num_unique' otherwise); `generic` only reports the
+        distinct count, as `_analyse_generic` does.
+        """
+        num_unique, unique_exact = self.num_unique()
+        approximate_fields = [] if unique_exact else [unique_key]
+        if generic:
+            return {'num_unique': str(num_unique)}, approximate_fields
+
+        if not self.values.is_exact:
+            approximate_fields += ['most_frequent', 'value_counts_top_n']
+
+        stats = {
+            unique_key: num_unique,
+            'most_frequent': self.values.most_frequent(),
+            'cardinality': 'High' if num_unique > 50 else 'Low',
+            'value_counts_top_n': self.values.top(settings.top_n_values),
+        }
+        if self.words is not None:
+            stats['word_frequencies'] = self.words.top(settings.text_top_k)
+            if not self.words.is_exact:
+                approximate_fields.append('word_frequencies')
+        return stats, approximate_fields
+
+
+class BooleanAccumulator:
+    """
+    Exact value counts (at most a handful of distinct values).
+    """
+
+    def __init__(self, settings):
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, column: pd.Series):
+        counts = column.value_counts()
+        self.counts = counts if self.counts.empty else self.counts.add(counts, fill_value=0).astype('int64')
+
+    def merge(self, other: "BooleanAccumulator"):
+        self.counts = other.counts if self.counts.empty else self.counts.add(other.counts, fill_value=0).astype('int64')
+        return self
+
+    def finalize(self, num_rows: int, settings) -> tuple:
+        return {'value_counts': self.counts.sort_values(ascending=False, kind='stable').to_dict()}, []
+
+
+
+class PearsonAccumulator:
+    """
+    Sufficient statistics for pairwise-complete Pearson correlations (like `DataFrame.corr()`):
+    for every pair of columns, the number of rows where both are present and the sums of x, x²
+    and x·y over those rows. Values are shifted by a value of their own column (the first one
+    seen) before summing, which avoids cancellation in the sums and keeps a constant column's
+    variance exactly zero; merging re-bases the other side's sums.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.shift = None
+        self.n = np.zeros((k, k))
+        self.sum_x = np.zeros((k, k))  # [i, j]: sum of column i over rows where i and j are present
+        self.sum_xx = np.zeros((k, k))
+        self.sum_xy = np.zeros((k, k))
+
+    def update(self, chunk: pd.DataFrame):
+        if not self.columns or chunk.empty:
+            return
+        block = np.column_stack([pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+                                 for column in self.columns])
+        present = ~np.isnan(block)
+        if self.shift is None:
+            self.shift = np.full(len(self.columns), np.nan)
+        unset = np.isnan(self.shift) & present.any(axis=0)
+        if unset.any():
+            # Columns that were all-null so far have no sums yet, so their shift can still be chosen
+            self.shift[unset] = block[present[:, unset].argmax(axis=0), np.flatnonzero(unset)]
+        x = np.where(present, block - np.nan_to_num(self.shift), 0.0)
+        weights = present.astype(np.float64)
+        self.n += weights.T @ weights
+        self.sum_x += x.T @ weights
+        self.sum_xx += (x * x).T @ weights
+        self.sum_xy += x.T @ x
+
+    def merge(self, other: "PearsonAccumulator"):
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlation statistics over different numeric columns")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = np.full(len(self.columns), np.nan)
+        # Columns without values on one side take the other's shift (their sums are all zero)
+        self.shift = np.where(np.isnan(self.shift), other.shift, self.shift)
+        # Other's sums re-based from its shift to ours: x + d, with d the difference of shifts
+        d = np.nan_to_num(other.shift - self.shift)
+        rows, cols = d[:, None], d[None, :]
+        self.sum_xy += other.sum_xy + other.sum_x * cols + other.sum_x.T * rows + other.n * rows * cols
+        self.sum_xx += other.sum_xx + 2 * rows * other.sum_x + other.n * rows ** 2
+        self.sum_x += other.sum_x + other.n * rows
+        self.n += other.n
+        return self
+
+    def finalize(self) -> pd.DataFrame:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_x = self.sum_x / self.n
+            covariance = self.sum_xy - self.sum_x * mean_x.T
+            variance = self.sum_xx - self.sum_x * mean_x
+            correlation = covariance / np.sqrt(variance * variance.T)
+        correlation = np.clip(correlation, -1.0, 1.0)
+        diagonal = np.diag(variance) > 0
+        correlation[np.diag_indices_from(correlation)] = np.where(diagonal, 1.0, np.nan)
+        return pd.DataFrame(correlation, index=self.columns, columns=self.columns)
@@ -0,0 +1,129 @@
+# data_visualizer/arrow_data.py
+"""
+Apache Arrow and Polars input.
+
+Arrow tables and Polars frames are handed to the profiler as pandas frames whose string columns
+stay in their Arrow buffers (`string[pyarrow]` dtype), so no Python object is created per value.
+For such columns, the value statistics (distinct count, mode, top values) and whitespace
+tokenization run on the buffers with `pyarrow.compute`. Arrow datasets are scanned batch by
+batch through the streaming profiler.
+"""
+import pandas as pd
+
+DATASET_BATCH_ROWS = 100_000  # Rows per record batch when scanning a pyarrow dataset
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Arrow and Polars input requires pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def is_arrow_data(data) -> bool:
+    """
+    Whether `data` is a pyarrow Table, RecordBatch or Dataset, or a Polars DataFrame.
+    """
+    return type(data).__module__.split('.')[0] in ('pyarrow', 'polars')
+
+
+def is_arrow_dataset(data) -> bool:
+    if type(data).__module__.split('.')[0] != 'pyarrow':
+        return False
+    import pyarrow.dataset as ds
+    return isinstance(data, ds.Dataset)
+
+
+def _string_dtype(arrow_type):
+    # Arrow string columns keep their buffers as pandas' Arrow-backed string dtype
+    pa = _pyarrow()
+    if arrow_type in (pa.string(), pa.large_string()):
+        return pd.StringDtype('pyarrow')
+    return None
+
+
+def arrow_to_pandas(data) -> pd.DataFrame:
+    """
+    Wrap an Arrow table or record batch (or a Polars frame, exported to Arrow) as a pandas frame.
+    String columns are not copied into Python objects; numeric columns without nulls are not
+    consolidated into a new block.
+    """
+    pa = _pyarrow()
+    if type(data).__module__.split('.')[0] == 'polars':
+        data = data.to_arrow()
+    if hasattr(pa, 'string_view'):
+        # Newer writers (e.g. Polars) may use the view layout, which pandas cannot wrap yet
+        views = [i for i, field in enumerate(data.schema) if field.type == pa.string_view()]
+        for i in views:
+            data = data.set_column(i, data.schema.field(i).name, data.column(i).cast(pa.large_string()))
+    return data.to_pandas(types_mapper=_string_dtype, split_blocks=True)
+
+
+def iter_dataset_chunks(dataset, batch_size: int = DATASET_BATCH_ROWS):
+    """
+    Yield pandas chunks (string columns still Arrow-backed) from a `pyarrow.dataset.Dataset`.
+    """
+    for batch in dataset.to_batches(batch_size=batch_size):
+        if batch.num_rows:
+            yield arrow_to_pandas(batch)
+
+
+def is_arrow_backed(column_data: pd.Series) -> bool:
+    """
+    Whether a column is an Arrow-backed string column (its statistics can be computed natively).
+    """
+    dtype = column_data.dtype
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow'
+
+
+def _arrow_values(column_data: pd.Series):
+    # The column's Arrow chunks, without a copy
+    return column_data.array.__arrow_array__()
+
+
+def value_stats(column_data: pd.Series, top_n: int) -> dict:
+    """
+    Distinct count, mode and `top_n` value counts of an Arrow-backed column from one
+    `pyarrow.compute.value_counts` pass; same results as pandas' nunique/mode/value_counts.
+    """
+    import pyarrow.compute as pc
+
+    counts = pc.value_counts(_arrow_values(column_data))
+    counts = counts.filter(pc.is_valid(counts.field('values')))
+    num_unique = len(counts)
+    if not num_unique:
+        return {'num_unique': 0, 'most_frequent': None, 'value_counts_top_n': {}}
+
+    # Ranked by pandas itself on the bare counts (both list values in order of first appearance),
+    # so ties are broken exactly as value_counts().nlargest() breaks them
+    ranked = pd.Series(counts.field('counts').to_numpy()).sort_values(ascending=False).nlargest(top_n)
+    top = counts.take(ranked.index.to_numpy())
+    max_count = top.field('counts')[0]
+    # pandas' mode() sorts tied values, so the smallest of them comes first
+    most_frequent = pc.min(counts.field('values').filter(pc.equal(counts.field('counts'), max_count))).as_py()
+    return {
+        'num_unique': num_unique,
+        'most_frequent': most_frequent,
+        'value_counts_top_n': dict(zip(top.field('values').to_pylist(), top.field('counts').to_pylist())),
+    }
+
+
+def token_counts(values: pd.Series, lowercase: bool = False, stopwords: frozenset = frozenset()) -> pd.Series:
+    """
+    Whitespace-token counts of an Arrow-backed column, like `tokenize(...).value_counts()` but
+    without materialising a Python string per token.
+    """
+    pa = _pyarrow()
+    import pyarrow.compute as pc
+
+    text = _arrow_values(values)
+    if lowercase:
+        text = pc.utf8_lower(text)
+    tokens = pc.list_flatten(pc.utf8_split_whitespace(text))
+    keep = pc.not_equal(pc.utf8_length(tokens), 0)  # Leading/trailing whitespace leaves empty pieces
+    if stopwords:
+        stopped = pc.is_in(pc.utf8_lower(tokens), value_set=pa.array(sorted(stopwords), tokens.type))
+        keep = pc.and_(keep, pc.invert(stopped))
+    counts = pc.value_counts(tokens.filter(keep))
+    return pd.Series(counts.field('counts').to_numpy(), index=counts.field('values').to_pylist(), dtype='int64')
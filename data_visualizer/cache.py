@@ -0,0 +1,133 @@
+# data_visualizer/cache.py
+"""
+Persistent, content-addressed cache for per-column results and correlation rows.
+
+Entries are pickles named by a hash of the column's values, dtype and name plus the Settings
+fields that affect the result, so an unchanged column is a cache hit no matter which table or
+run it comes from. Least-recently-used entries are evicted once the directory exceeds its size limit.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+from .duplicates import non_string_mask
+
+CACHE_FORMAT_VERSION = 2  # Bumped whenever keys or entries change meaning, so older entries are never hit
+
+# Settings that never change a column's (or a correlation cell's) result
+_RESULT_NEUTRAL_SETTINGS = {
+    'execution_backend', 'n_workers', 'dask_split_every', 'cache_dir', 'cache_max_bytes',
+    'include_overview', 'include_sample_data', 'duplicate_threshold',
+    'duplicate_subset', 'duplicate_chunksize', 'max_duplicate_indices',
+    'include_missingness', 'missing_patterns_top_n', 'report_assets',
+    'render_backend', 'defer_plots', 'overlap_plots', 'instrument', 'instrument_memory',
+    'include_correlations', 'include_correlations_plots', 'include_correlations_json',
+    'correlations_top_k', 'correlations_min_abs', 'heatmap_max_annotated', 'heatmap_top_n', 'heatmap_order',
+}
+
+
+def hash_column(column_data: pd.Series) -> str:
+    """
+    Fast content hash of a column's values, dtype and name (the index is ignored). Object
+    columns also hash which values are not strings, so [1, 2] and ['1', '2'] get different keys.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((column_data.name, str(column_data.dtype), len(column_data))).encode())
+    digest.update(pd.util.hash_pandas_object(column_data, index=False).to_numpy().tobytes())
+    non_strings = non_string_mask(column_data)
+    if non_strings is not None:
+        digest.update(np.packbits(non_strings).tobytes())
+    return digest.hexdigest()
+
+
+def settings_fingerprint(settings, fields=None) -> str:
+    """
+    Hash of the Settings fields that can affect a result (all result-relevant fields by default).
+    """
+    values = settings.model_dump(exclude=_RESULT_NEUTRAL_SETTINGS)
+    if fields is not None:
+        values = {name: values[name] for name in fields}
+    digest = hashlib.blake2b(repr((CACHE_FORMAT_VERSION, sorted(values.items()))).encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+def make_key(*parts) -> str:
+    return hashlib.blake2b(repr(parts).encode(), digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk pickle cache with size-based LRU eviction and hit/miss/byte counters.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_read': 0, 'bytes_written': 0, 'evictions': 0}
+        self._total_bytes = sum(size for _, _, size in self._entries())
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.pkl'):
+                stat = entry.stat()
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def get(self, key: str):
+        """
+        Return the cached value, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+            value = pickle.loads(payload)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.stats['misses'] += 1
+            return None
+
+        # mtime doubles as the LRU clock (atime is often disabled)
+        os.utime(path)
+        self.stats['hits'] += 1
+        self.stats['bytes_read'] += len(payload)
+        return value
+
+    def set(self, key: str, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path(key)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        self.stats['bytes_written'] += len(payload)
+        self._total_bytes += len(payload) - previous_size
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self._total_bytes = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.stats['evictions'] += 1
+
+    @property
+    def size_bytes(self) -> int:
+        return self._total_bytes
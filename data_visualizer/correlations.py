@@ -1,39 +1,57 @@
-import io
 import math
 import numpy as np
 import pandas as pd
-from scipy.stats import chi2_contingency
-from itertools import combinations
-import matplotlib.pyplot as plt
-import seaborn as sns
-import base64
+from .visualizer import heatmap_spec, render_plot
+from .settings import Settings
+from .execution import map_ordered
+from .cache import make_key, settings_fingerprint, hash_column
 
+_DENSE_TABLE_LIMIT = 1 << 22  # Largest contingency table (cells) built densely with bincount
+_MAX_NULL_PATTERNS = 32  # Null patterns Spearman pairs blockwise; beyond, partly-null pairs go to pandas
+_VARIANCE_TOLERANCE = 1e-13  # Relative to the sum of squares: smaller pairwise variances count as constant
 
-def calculate_correlations(data):
+
+def calculate_correlations(data, cache=None, column_hashes=None, settings=None, sample=None, progress=None):
+    """
+    Pearson/Spearman matrices for numeric columns and Cramér's V for categorical columns.
+
+    With a `ResultCache` (and the columns' content hashes), each column's row of every matrix is
+    cached separately, so only rows of columns whose data changed are recomputed.
+
+    With a `sample` (a subset of `data`'s rows), the ranking and contingency based measures,
+    Spearman and Cramér's V, are computed on it; Pearson always uses every row.
+
+    Cramér's V rows are reported to `progress` (see `events.py`) as they finish.
+    """
     columns = data.columns
 
     # Segregating Data Types 
-    categorical_df = data.select_dtypes(include='object')
+    categorical_df = data.select_dtypes(include=['object', 'string'])  # 'string' covers Arrow-backed text
     numerical_df = data.select_dtypes(include='number')
+    ranked_hashes = column_hashes
+    if sample is not None:
+        categorical_df, ranked_df = sample[categorical_df.columns], sample[numerical_df.columns]
+        if cache is not None:
+            ranked_hashes = {column: hash_column(sample[column]) for column in [*categorical_df.columns, *ranked_df.columns]}
+    else:
+        ranked_df = numerical_df
 
-    pearson_corr= numerical_df.corr(method='pearson') # Linear relations and scatter plots (numerical df)
-    spearman_corr= numerical_df.corr(method='spearman') # Checks General Trend (numerical df)
-
-    categorical_columns = categorical_df.columns
-    
-    cramers_v_matrix= pd.DataFrame(index=categorical_columns,
-                            columns=categorical_columns)  # To store values (rows & columns == Variables) 
-
-    for col1, col2 in combinations(categorical_columns, 2):
-        cramers_v = _cramers_v(categorical_df[col1], categorical_df[col2])
-        # Created a Correlation Matrix for Cramér's V results to solve the return problem
-        cramers_v_matrix.loc[col1, col2] = cramers_v
-        cramers_v_matrix.loc[col2, col1] = cramers_v  # To make the result symmetrical
-    
-    # Fill diagonal with 1s after processing all pairs
-    if len(categorical_columns) > 0:
-        np.fill_diagonal(cramers_v_matrix.values, 1.0)
-        cramers_v_matrix = cramers_v_matrix.astype(float)
+    if cache is None:
+        pearson_corr = pearson_matrix(numerical_df)  # Linear relations and scatter plots (numerical df)
+        spearman_corr = spearman_matrix(ranked_df)  # Checks General Trend (numerical df)
+        cramers_v_matrix = _cramers_v_matrix(categorical_df, settings, progress)
+    else:
+        pearson_corr = _cached_correlation_matrix(
+            numerical_df, 'pearson', cache, column_hashes,
+            compute_matrix=pearson_matrix, compute_rows=_pearson_rows)
+        spearman_corr = _cached_correlation_matrix(
+            ranked_df, 'spearman', cache, ranked_hashes,
+            compute_matrix=spearman_matrix, compute_rows=_spearman_rows)
+        cramers_v_matrix = _cached_correlation_matrix(
+            categorical_df, 'cramers_v', cache, ranked_hashes,
+            compute_matrix=lambda df: _cramers_v_matrix(df, settings, progress),
+            compute_rows=lambda df, positions: _cramers_v_rows(df, positions, settings),
+            fingerprint=settings_fingerprint(settings or Settings(), fields=['cramers_v_max_categories']))
     
     correlations = {
         "pearson": pearson_corr,
@@ -43,45 +61,381 @@ def calculate_correlations(data):
     
     return correlations
 
-    
 
-def _cramers_v(c_1_series, c_2_series):
+def _float_block(frame: pd.DataFrame) -> np.ndarray:
+    return frame.to_numpy(dtype=np.float64, na_value=np.nan)
 
-    contingency_table = pd.crosstab(c_1_series, c_2_series) # Created a contingency table for cross tabulation
 
-    chi2 = chi2_contingency(contingency_table)[0] # Chi-squared statistic
-    n = contingency_table.values.sum() # Total number of observations
-    min_dim = min(contingency_table.shape) # Minimum dimension of the contingency table
-    
-    try:
-        v = math.sqrt(chi2 / (n * (min_dim - 1))) # Cramér's V
-    except ZeroDivisionError:
-        # If a ZeroDivisionError occurs, it means one column was constant.
-        # In this case, the correlation is 0.
-        v = 0.0
-    
-    return v
+def _unit_columns(block: np.ndarray) -> np.ndarray:
+    # NaN-free columns centred and scaled to unit length (constant columns become NaN), so the
+    # product of two such blocks is their correlation matrix
+    centred = block - block[:1]  # Constant columns become exact zeros
+    centred -= centred.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centred, centred))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return centred / np.where(norms > 0, norms, np.nan)
 
-# Heatmap Generation
-def generate_correlation_heatmap(correlation_matrix):
+
+def _rank_columns(block: np.ndarray) -> np.ndarray:
+    # Average ranks of NaN-free columns, as pandas ranks them for `corr(method='spearman')`
+    # (and without loading scipy)
+    return pd.DataFrame(block, copy=False).rank(axis=0).to_numpy(dtype=np.float64)
+
+
+def _correlate(left: np.ndarray, right: np.ndarray = None) -> np.ndarray:
     """
-    Generates a heatmap for the correlation matrix and returns it as a Base64 encoded string.
+    Pearson correlations between the NaN-free columns of `left` and `right` (`left` with itself
+    by default) as one matrix product.
     """
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(correlation_matrix, annot=True, fmt=".2f", cmap="coolwarm", square=True, cbar_kws={"shrink": .8})
-    plt.title("Correlation Heatmap")
-    plt.tight_layout()
+    if not len(left):
+        return np.full((left.shape[1], (left if right is None else right).shape[1]), np.nan)
+    unit_left = _unit_columns(left)
+    if right is None:
+        matrix = np.clip(unit_left.T @ unit_left, -1.0, 1.0)
+        diagonal = np.arange(len(matrix))
+        matrix[diagonal, diagonal] = np.where(np.isnan(matrix[diagonal, diagonal]), np.nan, 1.0)
+        return matrix
+    return np.clip(unit_left.T @ _unit_columns(right), -1.0, 1.0)
 
-    # Save plot to a memory buffer
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    plt.close()
 
-    # Encode buffer to a base64 string
-    data = base64.b64encode(buf.getbuffer()).decode('ascii')
-    
-    return f"data:image/png;base64,{data}"
+def _masked_pearson(block: np.ndarray, present: np.ndarray, left: np.ndarray = None) -> np.ndarray:
+    # Pairwise-complete Pearson from matrix products of the zero-filled, centred columns: the
+    # rows `left` of the matrix (all of it by default)
+    k = block.shape[1]
+    first = block[present.argmax(axis=0), np.arange(k)]
+    x = np.where(present, block - first, 0.0)  # Constant columns become exact zeros
+    x = np.where(present, x - x.sum(axis=0) / np.maximum(present.sum(axis=0), 1), 0.0)
+    weights = present.astype(np.float64)
+    x_left, weights_left = (x, weights) if left is None else (x[:, left], weights[:, left])
+    n = weights_left.T @ weights
+    sum_x = x_left.T @ weights  # [a, j]: sum of column a over the rows where columns a and j are present
+    sum_xx = (x_left * x_left).T @ weights
+    if left is None:
+        sum_y, sum_yy = sum_x.T, sum_xx.T
+    else:
+        sum_y = weights_left.T @ x  # [a, j]: sum of column j over the same rows
+        sum_yy = weights_left.T @ (x * x)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = x_left.T @ x - sum_x * sum_y / n
+        var_x = sum_xx - sum_x ** 2 / n
+        var_y = sum_yy - sum_y ** 2 / n
+        # Cancellation leaves constant pairs a tiny variance
+        varies = (var_x > _VARIANCE_TOLERANCE * sum_xx) & (var_y > _VARIANCE_TOLERANCE * sum_yy)
+        matrix = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+    matrix[~varies] = np.nan
+    return _unit_diagonal(matrix, np.arange(k) if left is None else left)
+
 
+def _unit_diagonal(rows: np.ndarray, positions) -> np.ndarray:
+    # Each column's correlation with itself is 1, or NaN when it is constant
+    index = np.arange(len(rows))
+    rows[index, positions] = np.where(np.isnan(rows[index, positions]), np.nan, 1.0)
+    return rows
 
 
+def pearson_matrix(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pairwise-complete Pearson correlations of numeric columns, like `frame.corr()`, computed with
+    BLAS: one product of the standardized block for NaN-free data, four otherwise.
+    """
+    block = _float_block(frame)
+    present = ~np.isnan(block)
+    matrix = _correlate(block) if present.all() else _masked_pearson(block, present)
+    return pd.DataFrame(matrix, index=frame.columns, columns=frame.columns)
 
+
+def _pearson_rows(frame: pd.DataFrame, positions: np.ndarray) -> np.ndarray:
+    # The rows `positions` of `pearson_matrix(frame)`, from the same products
+    block = _float_block(frame)
+    present = ~np.isnan(block)
+    if present.all():
+        return _unit_diagonal(_correlate(block[:, positions], block), positions)
+    return _masked_pearson(block, present, positions)
+
+
+def _null_pattern_groups(present: np.ndarray) -> list:
+    # (rows, columns) per null pattern: columns missing on exactly the same rows
+    patterns = {}
+    packed = np.ascontiguousarray(np.packbits(present, axis=0).T)
+    for j in range(present.shape[1]):
+        patterns.setdefault(packed[j].tobytes(), []).append(j)
+    return [(present[:, columns[0]], np.array(columns)) for columns in patterns.values()]
+
+
+def spearman_matrix(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pairwise-complete Spearman correlations, like `frame.corr(method='spearman')`, as Pearson
+    products of rank blocks.
+
+    Columns sharing a null pattern share their rows, so each such group is ranked once and its
+    pairs come from one product; NaN-free data is a single group. Pairs across two groups are
+    ranked over the rows both have, one block per pair of groups. With more than
+    `_MAX_NULL_PATTERNS` patterns, pairs between partly-null columns are left to pandas.
+    """
+    block = _float_block(frame)
+    present = ~np.isnan(block)
+    k = block.shape[1]
+    if present.all():
+        return pd.DataFrame(_correlate(_rank_columns(block)), index=frame.columns, columns=frame.columns)
+
+    groups = _null_pattern_groups(present)
+    ranks = [_rank_columns(block[np.ix_(rows, columns)]) for rows, columns in groups]
+
+    matrix = np.full((k, k), np.nan)
+    partial = [g for g, (rows, _) in enumerate(groups) if not rows.all()]
+    delegated = len(partial) > _MAX_NULL_PATTERNS
+    if delegated:
+        partial_columns = np.concatenate([groups[g][1] for g in partial])
+        subframe = frame.iloc[:, partial_columns]
+        matrix[np.ix_(partial_columns, partial_columns)] = subframe.corr(method='spearman').to_numpy()
+
+    for g, (rows_g, columns_g) in enumerate(groups):
+        if rows_g.any():
+            matrix[np.ix_(columns_g, columns_g)] = _correlate(ranks[g])
+        for h in range(g + 1, len(groups)):
+            rows_h, columns_h = groups[h]
+            if delegated and g in partial and h in partial:
+                continue
+            rows = rows_g & rows_h
+            if not rows.any():
+                continue
+            # A group's own ranks serve whenever the shared rows are all of its rows
+            left = ranks[g] if rows.sum() == rows_g.sum() else _rank_columns(block[np.ix_(rows, columns_g)])
+            right = ranks[h] if rows.sum() == rows_h.sum() else _rank_columns(block[np.ix_(rows, columns_h)])
+            cross = _correlate(left, right)
+            matrix[np.ix_(columns_g, columns_h)] = cross
+            matrix[np.ix_(columns_h, columns_g)] = cross.T
+    return pd.DataFrame(matrix, index=frame.columns, columns=frame.columns)
+
+
+def _spearman_rows(frame: pd.DataFrame, positions: np.ndarray) -> np.ndarray:
+    """
+    The rows `positions` of `spearman_matrix(frame)`, ranked the same way: each pair over the
+    rows both columns have, a null-pattern group's own ranks whenever those are all its rows,
+    and pairs between partly-null columns left to pandas beyond `_MAX_NULL_PATTERNS` patterns.
+    """
+    block = _float_block(frame)
+    present = ~np.isnan(block)
+    if present.all():
+        ranks = _rank_columns(block)
+        return _unit_diagonal(_correlate(ranks[:, positions], ranks), positions)
+
+    groups = _null_pattern_groups(present)
+    group_ranks = {}
+    partial = [g for g, (rows, _) in enumerate(groups) if not rows.all()]
+    delegated = len(partial) > _MAX_NULL_PATTERNS
+    partial_columns = np.concatenate([groups[g][1] for g in partial]) if delegated else None
+
+    group_of = {j: g for g, (_, columns) in enumerate(groups) for j in columns}
+
+    result = np.full((len(positions), block.shape[1]), np.nan)
+    for a, i in enumerate(positions):
+        rows_i = present[:, i]
+        own_delegated = delegated and group_of[i] in partial
+        if own_delegated:
+            others = frame.iloc[:, partial_columns]
+            result[a, partial_columns] = others.corrwith(frame.iloc[:, i], method='spearman').to_numpy()
+        left = _rank_columns(block[rows_i][:, [i]])
+        for g, (rows_g, columns_g) in enumerate(groups):
+            if own_delegated and g in partial and g != group_of[i]:
+                continue
+            rows = rows_i & rows_g
+            if not rows.any():
+                continue
+            if rows.sum() == rows_g.sum():
+                if g not in group_ranks:
+                    group_ranks[g] = _rank_columns(block[np.ix_(rows_g, columns_g)])
+                right = group_ranks[g]
+            else:
+                right = _rank_columns(block[np.ix_(rows, columns_g)])
+            pair_left = left if rows.sum() == rows_i.sum() else _rank_columns(block[rows][:, [i]])
+            result[a, columns_g] = _correlate(pair_left, right)[0]
+    return _unit_diagonal(result, positions)
+
+
+def strongest_pairs(matrix: pd.DataFrame, top_k: int = None, min_abs: float = None) -> list:
+    """
+    Off-diagonal pairs of a correlation matrix by decreasing strength, as
+    `[{'column_1', 'column_2', 'value'}]`: the `top_k` strongest and/or those with
+    |value| >= `min_abs`. Undefined (NaN) pairs are left out.
+    """
+    values = matrix.to_numpy(dtype=np.float64)
+    rows, cols = np.triu_indices(len(values), 1)
+    pair_values = values[rows, cols]
+    strength = np.abs(pair_values)
+    keep = ~np.isnan(pair_values)
+    if min_abs is not None:
+        keep &= strength >= min_abs
+    rows, cols, pair_values, strength = rows[keep], cols[keep], pair_values[keep], strength[keep]
+    if top_k is not None and len(strength) > top_k:
+        chosen = np.argpartition(-strength, top_k - 1)[:top_k]
+    else:
+        chosen = np.arange(len(strength))
+    chosen = chosen[np.argsort(-strength[chosen], kind='stable')]
+    names = matrix.columns
+    return [{'column_1': names[rows[i]], 'column_2': names[cols[i]], 'value': float(pair_values[i])} for i in chosen]
+
+
+def _factorize_categories(series, max_categories=None):
+    """
+    Integer codes for a categorical column (-1 for missing) and the number of categories.
+    With `max_categories`, the least frequent categories are lumped into one "other" code.
+    """
+    codes, uniques = pd.factorize(series)
+    n_categories = len(uniques)
+    if max_categories is not None and n_categories > max_categories:
+        frequencies = np.bincount(codes[codes >= 0], minlength=n_categories)
+        kept = np.argsort(-frequencies, kind='stable')[:max_categories - 1]
+        remap = np.full(n_categories, max_categories - 1, dtype=codes.dtype)
+        remap[kept] = np.arange(max_categories - 1)
+        codes = np.where(codes >= 0, remap[np.maximum(codes, 0)], -1)
+        n_categories = max_categories
+    return codes, n_categories
+
+
+def _cramers_v_codes(codes_1, k_1, codes_2, k_2):
+    """
+    Cramér's V of two factorized columns, matching crosstab + `scipy.stats.chi2_contingency`.
+    Pairs involving a constant column are 0.
+    """
+    valid = (codes_1 >= 0) & (codes_2 >= 0)
+    combined = codes_1[valid].astype(np.int64) * k_2 + codes_2[valid]
+
+    # Dense bincount for small tables, sorted unique cells when k_1 * k_2 would not fit
+    if k_1 * k_2 <= _DENSE_TABLE_LIMIT:
+        table = np.bincount(combined, minlength=k_1 * k_2)
+        cells = np.flatnonzero(table)
+        observed = table[cells].astype(np.float64)
+    else:
+        cells, observed = np.unique(combined, return_counts=True)
+        observed = observed.astype(np.float64)
+
+    rows, cols = cells // k_2, cells % k_2
+    row_totals = np.bincount(rows, weights=observed, minlength=k_1)
+    col_totals = np.bincount(cols, weights=observed, minlength=k_2)
+    n = observed.sum()
+    # crosstab only has rows/columns for categories that occur in the paired data
+    min_dim = min(np.count_nonzero(row_totals), np.count_nonzero(col_totals))
+    if n == 0 or min_dim < 2:
+        return 0.0
+
+    if np.count_nonzero(row_totals) == 2 and np.count_nonzero(col_totals) == 2:
+        # 2x2 table: chi2_contingency applies Yates' continuity correction
+        present_rows, present_cols = np.flatnonzero(row_totals), np.flatnonzero(col_totals)
+        table = np.zeros((2, 2))
+        np.add.at(table, (np.searchsorted(present_rows, rows), np.searchsorted(present_cols, cols)), observed)
+        expected = np.outer(row_totals[present_rows], col_totals[present_cols]) / n
+        diff = expected - table
+        table = table + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+        chi2 = ((table - expected) ** 2 / expected).sum()
+    else:
+        # sum((O - E)^2 / E) == n * sum(O^2 / (row * col)) - n; empty cells contribute nothing
+        chi2 = n * (observed ** 2 / (row_totals[rows] * col_totals[cols])).sum() - n
+
+    return math.sqrt(max(chi2, 0.0) / (n * (min_dim - 1)))
+
+
+def _cramers_v_row_job(job):
+    # Module-level so the process backend can pickle it
+    (codes, n_categories), others = job
+    return [_cramers_v_codes(codes, n_categories, other_codes, other_n) for other_codes, other_n in others]
+
+
+def _cramers_v_matrix(categorical_df, settings=None, progress=None):
+    """
+    Cramér's V for every pair of columns. Each column is factorized once and every pair's
+    contingency table is a bincount of the combined codes; rows of the upper triangle are
+    spread over the configured execution backend.
+    """
+    settings = settings or Settings()
+    categorical_columns = categorical_df.columns
+    n = len(categorical_columns)
+    matrix = np.eye(n)
+
+    if n > 1:
+        factorized = [_factorize_categories(categorical_df[column], settings.cramers_v_max_categories)
+                      for column in categorical_columns]
+        jobs = ((factorized[i], factorized[i + 1:]) for i in range(n - 1))
+        rows = map_ordered(_cramers_v_row_job, jobs, settings, total=n - 1, desc="Cramér's V", unit="row",
+                           progress=progress, stage='cramers_v', labels=list(categorical_columns[:-1]))
+        for i, row in enumerate(rows):
+            matrix[i, i + 1:] = row
+            matrix[i + 1:, i] = row
+
+    return pd.DataFrame(matrix, index=categorical_columns, columns=categorical_columns)
+
+
+def _cramers_v_rows(categorical_df, positions, settings=None):
+    # Every column is factorized once and its codes shared by all the requested rows
+    max_categories = (settings or Settings()).cramers_v_max_categories
+    factorized = [_factorize_categories(categorical_df.iloc[:, j], max_categories)
+                  for j in range(categorical_df.shape[1])]
+    rows = np.ones((len(positions), len(factorized)))
+    for a, i in enumerate(positions):
+        codes, n_categories = factorized[i]
+        for j, (other_codes, other_n) in enumerate(factorized):
+            if j != i:
+                rows[a, j] = _cramers_v_codes(codes, n_categories, other_codes, other_n)
+    return rows
+
+
+def _cached_correlation_matrix(frame, method, cache, column_hashes, compute_matrix, compute_rows, fingerprint=None):
+    """
+    Assemble a correlation matrix from per-column cached rows (keyed by column content hash),
+    computing only the cells involving changed columns. When most columns changed, the whole
+    matrix is computed in one go instead.
+
+    `compute_rows(frame, positions)` returns the rows `positions` of `compute_matrix(frame)` as
+    an array, computed the same way, so cached and fresh cells agree.
+    """
+    columns = list(frame.columns)
+    if not columns:
+        return compute_matrix(frame)
+
+    hashes = [column_hashes[column] for column in columns]
+    row_keys = [make_key('correlation', method, fingerprint, h) for h in hashes]
+    cached_rows = [cache.get(key) or {} for key in row_keys]
+
+    n = len(columns)
+    matrix = np.full((n, n), np.nan)
+    known = np.zeros((n, n), dtype=bool)
+    for i in range(n):
+        for j in range(i, n):
+            # A cell may live in either column's row
+            value = cached_rows[i].get(hashes[j], cached_rows[j].get(hashes[i]))
+            if value is not None:
+                matrix[i, j] = matrix[j, i] = value
+                known[i, j] = known[j, i] = True
+
+    # Recompute the rows of columns without a cached row, then cover any cell still unknown
+    dirty = [i for i in range(n) if not cached_rows[i]]
+    covered = np.zeros(n, dtype=bool)
+    covered[dirty] = True
+    for i in range(n):
+        if not covered[i] and (~known[i] & ~covered).any():
+            dirty.append(i)
+            covered[i] = True
+
+    if dirty:
+        if len(dirty) > n / 2:
+            full = compute_matrix(frame).to_numpy(dtype=float)
+            matrix[:, :] = full
+        else:
+            rows = compute_rows(frame, np.array(dirty))
+            matrix[dirty, :] = rows
+            matrix[:, dirty] = rows.T
+
+        for i in dirty:
+            cache.set(row_keys[i], {hashes[j]: float(matrix[i, j]) for j in range(n)})
+
+    return pd.DataFrame(matrix, index=frame.columns, columns=frame.columns)
+
+    
+
+# Heatmap Generation
+def generate_correlation_heatmap(correlation_matrix, settings=None):
+    """
+    Generates a heatmap for the correlation matrix and returns it as a Base64 encoded string.
+    """
+    settings = settings if settings is not None else Settings()
+    return render_plot(heatmap_spec(correlation_matrix, settings.heatmap_top_n, settings.heatmap_order), settings)
@@ -0,0 +1,70 @@
+# data_visualizer/dask_backend.py
+"""
+Profiling of Dask DataFrames, partition by partition.
+
+Every partition is profiled into a `ProfileState` by its own task. Column types are inferred once
+from the head of the first non-empty partition, so all states use the same analyzers. The states are
+merged in a tree (`settings.dask_split_every` per task) on the workers, and only the reduced
+state (counters, sketches, correlation sums and the distinct row hashes used to count
+duplicates, which grow with the table unless `settings.streaming_duplicates` is 'approximate'
+or 'off') reaches the client, where it is finalized like a streamed report.
+
+Tasks run on the active Dask scheduler: a `distributed.Client` (a `LocalCluster` on one
+machine, or a multi-node cluster) if one is running, otherwise Dask's local threads.
+"""
+import pickle
+from .execution import require_dask
+from .streaming import ProfileState
+
+TYPING_ROWS = 100_000  # Rows of the first non-empty partition that column types are inferred from
+
+
+def is_dask_data(data) -> bool:
+    """
+    Whether `data` is a Dask DataFrame.
+    """
+    if type(data).__module__.split('.')[0] not in ('dask', 'dask_expr'):
+        return False
+    import dask.dataframe as dd
+    return isinstance(data, dd.DataFrame)
+
+
+def _typing_rows(data):
+    # Filters often leave the leading partitions empty: look further, doubling the partitions
+    # scanned per step. An entirely empty frame is typed from its metadata.
+    start, step = 0, 1
+    while start < data.npartitions:
+        head = data.partitions[start:start + step].head(TYPING_ROWS, npartitions=-1, compute=True)
+        if len(head):
+            return head
+        start, step = start + step, step * 2
+    return data._meta
+
+
+def _partition_state(partition, template: ProfileState) -> ProfileState:
+    # A copy of the typed template, so tasks sharing it in one process never share accumulators
+    state = pickle.loads(pickle.dumps(template, protocol=pickle.HIGHEST_PROTOCOL))
+    state.update(partition)
+    return state
+
+
+def _merge_states(*states: ProfileState) -> ProfileState:
+    # In partition order, so the head, tail and duplicate samples come out as in one pass
+    merged = states[0]
+    for state in states[1:]:
+        merged.merge(state)
+    return merged
+
+
+def profile_dask(data, settings) -> ProfileState:
+    """
+    The merged `ProfileState` of a Dask DataFrame, computed on the active Dask scheduler.
+    """
+    dask = require_dask()
+    template = dask.delayed(ProfileState.typed_from(_typing_rows(data), settings))  # One copy in the graph, shared by every task
+
+    states = [dask.delayed(_partition_state)(partition, template) for partition in data.to_delayed()]
+    while len(states) > 1:
+        states = [dask.delayed(_merge_states)(*states[start:start + settings.dask_split_every])
+                  for start in range(0, len(states), settings.dask_split_every)]
+    return states[0].compute()
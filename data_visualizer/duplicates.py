@@ -0,0 +1,168 @@
+# data_visualizer/duplicates.py
+"""
+Duplicate-row detection from a single 64-bit hash per row.
+
+Rows are hashed once with `pd.util.hash_pandas_object`; the duplicate count, a bounded sample
+of duplicate index labels and the sample rows are all derived from that hash vector. In chunked
+mode only the distinct hashes (8 bytes per distinct row) are held, in sorted runs.
+"""
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+MAX_DUPLICATE_SAMPLES = 5  # Duplicate rows shown in the overview
+_MIXED_KINDS = ('mixed', 'mixed-integer')  # `infer_dtype` kinds that can mix strings with other values
+_OBJECT_SALT = 0x9E3779B97F4A7C15  # Times (column position + 1), xor-ed into the row hash of non-string objects
+
+
+def non_string_mask(column_data: pd.Series, kind: str = None):
+    """
+    Which values of an object column are present and not strings, or None when there are no
+    such values (or the column is not of object dtype). Object values are hashed by their
+    string form, so 1 and '1' hash alike although they are not equal; a hash that adds this
+    mask tells them apart. `kind` is the column's `infer_dtype(skipna=True)`, if known.
+    """
+    if column_data.dtype != object:
+        return None
+    kind = kind or pd.api.types.infer_dtype(column_data, skipna=True)
+    if kind in ('string', 'empty'):
+        return None
+    present = column_data.notna().to_numpy()
+    if kind in _MIXED_KINDS:
+        present &= ~column_data.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    return present
+
+
+def _canonical_number(value):
+    # Equal numbers of different types (True, 1, 1.0, np.int64(1)) as one value
+    if isinstance(value, (bool, np.bool_, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)) and value.is_integer():
+        return int(value)
+    return value
+
+
+def hash_rows(frame: pd.DataFrame, subset=None) -> np.ndarray:
+    """
+    One uint64 hash per row over `subset` (all columns by default); equal rows hash equally,
+    with missing values treated as equal, like `DataFrame.duplicated`. A string and a
+    non-string with the same string form (1 and '1') hash differently, as they are not equal.
+    """
+    if subset is not None:
+        frame = frame[list(subset)]
+    if frame.shape[1] == 0:
+        # No columns to compare: like DataFrame.duplicated, nothing counts as a duplicate
+        return np.arange(len(frame), dtype=np.uint64)
+    # Object values are hashed through their first equal value's string form, which depends on
+    # what else is in the chunk (1, 1.0 and True are equal), so numbers are made canonical first
+    # Object values are hashed through their first equal value's string form, which depends on
+    # what else is in the chunk (1, 1.0 and True are equal), so numbers are made canonical first
+    frame = frame.copy(deep=False)
+    non_strings = {}
+    for position in range(frame.shape[1]):
+        column = frame.iloc[:, position]
+        if column.dtype != object:
+            continue
+        kind = pd.api.types.infer_dtype(column, skipna=True)
+        non_strings[position] = non_string_mask(column, kind)
+        if non_strings[position] is not None:
+            frame.isetitem(position, column.map(_canonical_number, na_action='ignore').astype(object))
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    for position, mask in non_strings.items():
+        if mask is not None:
+            hashes[mask] ^= np.uint64(_OBJECT_SALT * (position + 1) & 0xFFFFFFFFFFFFFFFF)
+    return hashes
+
+
+class RowHashIndex:
+    """
+    Sorted runs of 64-bit row hashes used to count duplicate rows across chunks
+    (8 bytes per distinct row, runs merged log-structured style).
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def _seen_mask(self, hashes: np.ndarray) -> np.ndarray:
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            seen |= _contains(run, hashes)
+        return seen
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Insert row hashes and return a mask of the rows that were already seen.
+        """
+        duplicated = pd.Series(hashes).duplicated().to_numpy()
+        if self.runs:
+            duplicated |= self._seen_mask(hashes)
+        new_run = np.unique(hashes[~duplicated])
+        if len(new_run):
+            self.runs.append(new_run)
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.union1d(self.runs[-1], last)
+        return duplicated
+
+    def merge(self, other: "RowHashIndex"):
+        for run in other.runs:
+            self.add(run)
+        return self
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+
+def find_duplicates(data: pd.DataFrame, subset=None, chunksize: Optional[int] = None,
+                    max_indices: Optional[int] = 100, max_samples: int = MAX_DUPLICATE_SAMPLES) -> dict:
+    """
+    Count duplicate rows (every occurrence after the first, like `duplicated()`) and collect up to
+    `max_indices` of their index labels (None = all) plus the first `max_samples` rows that
+    belong to a duplicated group (like `duplicated(keep=False)`).
+
+    With `chunksize`, rows are hashed a chunk at a time into a `RowHashIndex`, so peak memory
+    is one chunk plus the distinct hashes instead of a full hash vector and hash table.
+    """
+    if chunksize is None or chunksize >= len(data):
+        hashes = pd.Series(hash_rows(data, subset))
+        duplicated = hashes.duplicated().to_numpy()
+        positions = np.flatnonzero(duplicated)
+        sample_positions = np.flatnonzero(hashes.duplicated(keep=False).to_numpy())[:max_samples]
+    else:
+        index = RowHashIndex()
+        positions = []
+        duplicate_hashes = []
+        for start in range(0, len(data), chunksize):
+            hashes = hash_rows(data.iloc[start:start + chunksize], subset)
+            duplicated = index.add(hashes)
+            if duplicated.any():
+                positions.append(np.flatnonzero(duplicated) + start)
+                duplicate_hashes.append(np.unique(hashes[duplicated]))
+        positions = np.concatenate(positions) if positions else np.empty(0, dtype=np.intp)
+        sample_positions = _first_positions_with_hash(data, subset, chunksize, duplicate_hashes, max_samples)
+
+    shown = positions if max_indices is None else positions[:max_indices]
+    return {
+        'count': int(len(positions)),
+        'indices': data.index[shown].tolist(),
+        'samples': data.iloc[sample_positions].to_dict('records'),
+    }
+
+
+def _first_positions_with_hash(data, subset, chunksize, duplicate_hashes, limit) -> np.ndarray:
+    # Second, early-stopping pass: first rows whose hash belongs to a duplicated group
+    if not duplicate_hashes or limit <= 0:
+        return np.empty(0, dtype=np.intp)
+    targets = np.unique(np.concatenate(duplicate_hashes))
+    found = []
+    for start in range(0, len(data), chunksize):
+        hashes = hash_rows(data.iloc[start:start + chunksize], subset)
+        found.extend((np.flatnonzero(_contains(targets, hashes)) + start)[:limit - len(found)])
+        if len(found) >= limit:
+            break
+    return np.asarray(found, dtype=np.intp)
+
+
+def _contains(sorted_values: np.ndarray, values: np.ndarray) -> np.ndarray:
+    positions = np.searchsorted(sorted_values, values).clip(max=len(sorted_values) - 1)
+    return sorted_values[positions] == values
@@ -0,0 +1,117 @@
+# data_visualizer/events.py
+"""
+Progress reporting and cancellation.
+
+A report sends its progress to a `ConsoleProgress` (the banners and tqdm bars) unless it has an
+event callback, in which case a `CallbackProgress` hands the same information to the callback as
+dicts and nothing is written to stdout:
+
+    {'event': 'message', 'message': str}
+    {'event': 'stage_started', 'stage': str}
+    {'event': 'stage_finished', 'stage': str, 'wall_s': float}
+    {'event': 'item_done', 'stage': str, 'item': column name, plot key or chunk number,
+     'done': int, 'total': int or None}
+
+Item stages are 'columns', 'plots', 'cramers_v' and 'chunks'. A `CallbackProgress` can also be
+cancelled from another thread: the next event then raises `AnalysisCancelled`, so a run stops
+between columns, plots, chunks and stages.
+"""
+import contextlib
+import threading
+import time
+from colorama import Style
+from tqdm import tqdm
+
+
+class AnalysisCancelled(Exception):
+    """
+    Raised inside a run whose progress was cancelled.
+    """
+
+
+class _TqdmBar:
+    def __init__(self, total, desc, unit):
+        self.bar = tqdm(total=total, desc=desc, unit=unit)
+
+    def update(self, item=None):
+        self.bar.update(1)
+
+    def close(self):
+        self.bar.close()
+
+
+class ConsoleProgress:
+    """
+    Progress on the console: colored banners and tqdm bars.
+    """
+
+    def message(self, text: str, color: str = None):
+        print(color + text + Style.BRIGHT if color else text)
+
+    def stage(self, stage: str):
+        return contextlib.nullcontext()
+
+    def bar(self, stage: str, total=None, desc=None, unit="column"):
+        return _TqdmBar(total, desc, unit)
+
+
+class _CallbackBar:
+    def __init__(self, progress, stage, total):
+        self.progress = progress
+        self.stage = stage
+        self.total = total
+        self.done = 0
+
+    def update(self, item=None):
+        self.done += 1
+        self.progress.emit({'event': 'item_done', 'stage': self.stage, 'item': item,
+                            'done': self.done, 'total': self.total})
+
+    def close(self):
+        pass
+
+
+class CallbackProgress:
+    """
+    Progress as event dicts passed to `callback`, from whichever thread drives the run (the
+    async API forwards them to its event loop). `cancel()` stops the run at its next event.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise AnalysisCancelled()
+
+    def emit(self, event: dict):
+        self.check()
+        self.callback(event)
+
+    def message(self, text: str, color: str = None):
+        self.emit({'event': 'message', 'message': text})
+
+    @contextlib.contextmanager
+    def stage(self, stage: str):
+        self.emit({'event': 'stage_started', 'stage': stage})
+        start = time.perf_counter()
+        yield
+        self.emit({'event': 'stage_finished', 'stage': stage, 'wall_s': time.perf_counter() - start})
+
+    def bar(self, stage: str, total=None, desc=None, unit="column"):
+        self.check()
+        return _CallbackBar(self, stage, total)
+
+
+CONSOLE = ConsoleProgress()
+
+
+def progress_bar(progress, stage: str, total=None, desc=None, unit="column"):
+    """
+    A bar on `progress`, or on the console when `progress` is None; `update(item)` once per item.
+    """
+    return (progress or CONSOLE).bar(stage, total, desc, unit)
@@ -0,0 +1,93 @@
+# data_visualizer/execution.py
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .events import progress_bar
+
+
+def resolve_workers(settings) -> int:
+    """
+    Number of workers to use for the thread/process backends.
+    """
+    if settings.n_workers is not None:
+        return settings.n_workers
+    return os.cpu_count() or 1
+
+
+def require_dask():
+    try:
+        import dask
+    except ImportError as exc:
+        raise ImportError("The dask backend requires dask: pip install 'dask[dataframe]'") from exc
+    return dask
+
+
+def map_ordered(func, items, settings, total=None, desc=None, unit="column", progress=None, stage=None,
+                labels=None, on_result=None):
+    """
+    Apply `func` to every item using the execution backend configured in `settings`
+    and return the results as a list in the same order as `items`.
+
+    The thread and process backends keep at most a few tasks per worker in flight,
+    so lazily generated items (e.g. per-column payloads) are not all materialised at once.
+
+    The dask backend submits tasks in batches of a few per worker to the active Dask scheduler
+    (a `distributed.Client`, if one is running, otherwise Dask's local threads).
+
+    Each result is reported to `progress` (see `events.py`) as an item of `stage`, named by
+    `labels` (default: its position), and passed to `on_result(position, result)` as soon as it
+    is collected, so a later stage can start on it before the others finish.
+    """
+    backend = settings.execution_backend
+    bar = progress_bar(progress, stage or desc, total, desc, unit)
+    results = []
+
+    def collect(result):
+        position = len(results)
+        results.append(result)
+        if on_result is not None:
+            on_result(position, result)
+        bar.update(labels[position] if labels is not None else position)
+
+    try:
+        if backend == 'serial':
+            for item in items:
+                collect(func(item))
+            return results
+
+        n_workers = resolve_workers(settings)
+        if backend == 'dask':
+            dask = require_dask()
+            batch = []
+            for item in items:
+                batch.append(dask.delayed(func, pure=False)(item))
+                if len(batch) >= 2 * n_workers:
+                    for result in dask.compute(*batch):
+                        collect(result)
+                    batch = []
+            for result in dask.compute(*batch):
+                collect(result)
+            return results
+
+        executor_cls = ThreadPoolExecutor if backend == 'thread' else ProcessPoolExecutor
+
+        with executor_cls(max_workers=n_workers) as executor:
+            pending = deque()
+            max_in_flight = 2 * n_workers
+            try:
+                for item in items:
+                    pending.append(executor.submit(func, item))
+                    if len(pending) >= max_in_flight:
+                        collect(pending.popleft().result())
+
+                while pending:
+                    collect(pending.popleft().result())
+            except BaseException:
+                # Stopped (e.g. cancelled): drop the queued tasks instead of waiting for them
+                for future in pending:
+                    future.cancel()
+                raise
+
+            return results
+    finally:
+        bar.close()
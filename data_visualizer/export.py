@@ -0,0 +1,239 @@
+# data_visualizer/export.py
+"""
+Machine-readable export of analysis results.
+
+`export_document` turns `results` into a plain document with a versioned schema. It leaves out
+HTML and, unless asked, plots; missing and non-finite numbers become null. It serializes to
+JSON (through orjson when installed) or msgpack. `stats_table` flattens the per-column statistics into one row per column with
+a fixed set of typed columns, so the profiles of many datasets stack into one Parquet dataset
+that can be queried directly.
+
+Schema (version 1):
+
+    schema_version, generator {name, version}
+    overview, missingness, sampling      as in `results` (when present)
+    variables                            list of {'name', <the column's stats>}; top-value
+                                         mappings become lists of {'value', 'count'}
+    correlations                         per method, {'columns', 'values'} (matrix rows) or
+                                         {'pairs'} (with correlations_top_k / correlations_min_abs)
+    plots                                with plots='reference', plot id -> plot; every plot
+                                         slot holds its id instead
+    profile                              timings (with settings.instrument)
+"""
+import datetime
+import json
+import math
+import numpy as np
+import pandas as pd
+
+EXPORT_SCHEMA_VERSION = 1
+
+_PLOT_FIELDS = ('plot', 'plot_bar')
+_VALUE_COUNT_FIELDS = ('value_counts_top_n', 'value_counts')
+_DISTINCT_FIELDS = ('unique_values', 'num_unique', 'unique')  # Per analyzer
+_NUMERIC_FIELDS = {  # Stats table column -> field of a numeric column's stats
+    'count': 'count', 'mean': 'mean', 'std': 'std', 'min': 'min', 'p25': '25%', 'p50': '50%',
+    'p75': '75%', 'max': 'max', 'skewness': 'skewness', 'kurtosis': 'kurtosis',
+    'outlier_percentage': 'outlier_percentage',
+}
+
+
+def _plain(value):
+    """
+    `value` as JSON/msgpack-native Python values: NumPy scalars unwrapped, NaN and missing as
+    None, timestamps as ISO strings and mapping keys as strings.
+    """
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return [_plain(item) for item in value.tolist()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _value_counts(mapping: dict) -> list:
+    # Ordered [{'value', 'count'}] keeps values that are not strings (numbers, booleans) intact
+    return [{'value': _plain(value), 'count': _plain(count)} for value, count in mapping.items()]
+
+
+def _variable(name, column_details: dict, plots: str, plot_registry: dict) -> dict:
+    variable = {'name': _plain(name)}
+    for field, value in column_details.items():
+        if field in _PLOT_FIELDS:
+            if plots == 'reference':
+                plot_id = f"variables/{name}/{field}"
+                plot_registry[plot_id] = value
+                variable[field] = plot_id
+            elif plots == 'inline':
+                variable[field] = value
+        elif field in _VALUE_COUNT_FIELDS and isinstance(value, dict):
+            variable[field] = _value_counts(value)
+        else:
+            variable[field] = _plain(value)
+    return variable
+
+
+def _correlations(results: dict) -> dict:
+    correlations = {}
+    for method, data in results.get('Correlations_JSON', {}).items():
+        if isinstance(data, list):
+            correlations[method] = {'pairs': _plain(data)}
+        else:
+            matrix = pd.DataFrame(data)
+            # Kept as an array: orjson writes it natively, the other encoders via `_encode_default`
+            correlations[method] = {'columns': _plain(list(matrix.columns)),
+                                    'values': np.ascontiguousarray(matrix.to_numpy(dtype=np.float64))}
+    return correlations
+
+
+def export_document(results: dict, plots: str = 'omit') -> dict:
+    """
+    The export document of `results` (see the module docstring for its schema).
+
+    Args:
+        plots: 'omit' leaves plots out; 'reference' puts each under `document['plots']` by an id
+            that its slot holds instead (so a store can keep them apart from the stats);
+            'inline' leaves them in their slots.
+    """
+    if plots not in ('omit', 'reference', 'inline'):
+        raise ValueError("plots must be 'omit', 'reference' or 'inline'")
+    from . import __version__
+
+    document = {
+        'schema_version': EXPORT_SCHEMA_VERSION,
+        'generator': {'name': 'data_visualizer', 'version': __version__},
+    }
+    for key in ('overview', 'missingness', 'sampling'):
+        if key in results:
+            document[key] = _plain(results[key])
+
+    plot_registry = {}
+    document['variables'] = [_variable(name, column_details, plots, plot_registry)
+                             for name, column_details in results.get('variables', {}).items()]
+    document['correlations'] = _correlations(results)
+    if plots == 'reference':
+        for method, plot in results.get('Correlations_Plots', {}).items():
+            plot_registry[f"correlations/{method}"] = plot
+        document['plots'] = plot_registry
+    elif plots == 'inline' and 'Correlations_Plots' in results:
+        document['correlation_plots'] = results['Correlations_Plots']
+    if '_profile' in results:
+        document['profile'] = _plain(results['_profile'])
+    return document
+
+
+def _encode_default(value):
+    # Correlation matrices for the encoders without NumPy support; NaN cells become null
+    if isinstance(value, np.ndarray):
+        return np.where(np.isnan(value), None, value).tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def dumps_json(document: dict) -> bytes:
+    """
+    UTF-8 JSON of an export document, through orjson (with its NumPy support) when installed.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(document, default=_encode_default, ensure_ascii=False, allow_nan=False).encode('utf-8')
+    return orjson.dumps(document, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def dumps_msgpack(document: dict) -> bytes:
+    try:
+        import msgpack
+    except ImportError as exc:
+        raise ImportError("msgpack export requires msgpack: pip install msgpack") from exc
+    return msgpack.packb(document, default=_encode_default, use_bin_type=True)
+
+
+_STATS_COLUMNS = ['dataset', 'column', 'position', 'data_type', 'missing_values', 'missing_percentage', 'distinct',
+                  'most_frequent', 'cardinality', *_NUMERIC_FIELDS, 'outlier_count', 'top_values', 'approximate',
+                  'approximate_fields', 'alerts']
+_STATS_DTYPES = {
+    'schema_version': 'int32', 'dataset': 'string', 'column': 'string', 'position': 'int64', 'data_type': 'string',
+    'missing_values': 'Int64', 'missing_percentage': 'float64', 'distinct': 'Int64', 'most_frequent': 'string',
+    'cardinality': 'string', **dict.fromkeys(_NUMERIC_FIELDS, 'float64'), 'outlier_count': 'Int64',
+    'top_values': 'string', 'approximate': 'boolean',
+}
+_LIST_COLUMNS = ('approximate_fields', 'alerts')
+
+
+def _number(value):
+    # Numeric strings are described like objects ('top', 'freq'): only actual numbers are kept
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_)):
+        return float(value)
+    return None
+
+
+def stats_table(results: dict, dataset: str = None) -> pd.DataFrame:
+    """
+    One row per column with a fixed set of typed columns (the same for every dataset):
+    identity, missing values, distinct count, mode, numeric summary, outliers, top values (as a
+    JSON string), approximation flags and alert types. Fields a column's type does not have
+    are null.
+    """
+    rows = []
+    for position, (name, column_details) in enumerate(results.get('variables', {}).items()):
+        distinct = next((column_details[field] for field in _DISTINCT_FIELDS if field in column_details), None)
+        most_frequent = column_details.get('most_frequent', column_details.get('top'))
+        top_values = next((column_details[field] for field in _VALUE_COUNT_FIELDS if field in column_details), None)
+        row = {
+            'dataset': dataset,
+            'column': str(name),
+            'position': position,
+            'data_type': column_details.get('Data_type'),
+            'missing_values': column_details.get('missing_values'),
+            'missing_percentage': column_details.get('missing_%'),
+            'distinct': int(distinct) if distinct is not None else None,  # The generic analyzer gives a string
+            'most_frequent': None if most_frequent is None else str(most_frequent),
+            'cardinality': column_details.get('cardinality'),
+            'outlier_count': column_details.get('outlier_count'),
+            'top_values': json.dumps(_value_counts(top_values), ensure_ascii=False) if top_values is not None else None,
+            'approximate': bool(column_details.get('approximate', False)),
+            'approximate_fields': list(column_details.get('approximate_fields') or []),
+            'alerts': [alert['alert_type'] for alert in column_details.get('alerts') or []],
+        }
+        for table_field, field in _NUMERIC_FIELDS.items():
+            row[table_field] = _number(column_details.get(field))
+        rows.append(row)
+
+    table = pd.DataFrame(rows, columns=_STATS_COLUMNS)
+    table.insert(0, 'schema_version', EXPORT_SCHEMA_VERSION)
+    return table.astype(_STATS_DTYPES)
+
+
+def _arrow_schema(pa):
+    # Fixed for every table, so the files of many datasets read back as one dataset
+    types = {'int32': pa.int32(), 'int64': pa.int64(), 'Int64': pa.int64(), 'float64': pa.float64(),
+             'string': pa.string(), 'boolean': pa.bool_()}
+    fields = [pa.field(name, types[dtype]) for name, dtype in _STATS_DTYPES.items()]
+    fields += [pa.field(name, pa.list_(pa.string())) for name in _LIST_COLUMNS]
+    order = ['schema_version', *_STATS_COLUMNS]
+    fields.sort(key=lambda field: order.index(field.name))
+    return pa.schema(fields, metadata={'data_visualizer.schema_version': str(EXPORT_SCHEMA_VERSION)})
+
+
+def write_parquet(table: pd.DataFrame, path):
+    """
+    Write a stats table to Parquet with the fixed Arrow schema, the schema version in the file
+    metadata.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from exc
+    pq.write_table(pa.Table.from_pandas(table, schema=_arrow_schema(pa), preserve_index=False), path)
@@ -0,0 +1,121 @@
+# data_visualizer/instrumentation.py
+"""
+Optional timing and memory spans around the profiling stages.
+
+Each span records wall time, process CPU time and (optionally) the peak of tracemalloc-traced
+allocations above the level at which it started. Finished spans go to the hooks registered with
+`register_span_hook` and are summarised under `results['_profile']`. With instrumentation off,
+`span()` returns one shared no-op context manager, so instrumented code costs a `None` check.
+"""
+import contextlib
+import threading
+import time
+import tracemalloc
+
+span_hooks = []
+
+_NULL_SPAN = contextlib.nullcontext()
+# Open memory-traced spans of every thread: tracemalloc's peak is process-wide, so whenever one
+# span resets it, all open spans must first take the peak reached so far
+_open_spans = []
+_open_spans_lock = threading.Lock()
+
+
+def register_span_hook(hook):
+    """
+    Call `hook(span)` for every finished span, e.g. to forward it to a metrics system. A span is a
+    dict with 'stage', 'column' (or None), 'wall_s', 'cpu_s' and 'peak_mb' (None unless memory is
+    traced). Spans from process-pool workers reach the hooks once their results are collected.
+    Can be used as a decorator.
+    """
+    span_hooks.append(hook)
+    return hook
+
+
+def span(recorder, stage: str, column=None):
+    """
+    Time a block into `recorder`, or do nothing if instrumentation is off (`recorder` is None).
+    """
+    if recorder is None:
+        return _NULL_SPAN
+    return recorder.span(stage, column)
+
+
+class SpanRecorder:
+    """
+    Collects spans for one report (or one worker job, with `emit_hooks=False`; its spans are
+    handed back and added to the main recorder).
+    """
+
+    def __init__(self, trace_memory: bool = False, emit_hooks: bool = True):
+        self.trace_memory = trace_memory
+        self.emit_hooks = emit_hooks
+        self.spans = []
+        self._started_tracing = False
+
+    @contextlib.contextmanager
+    def span(self, stage: str, column=None):
+        entry = self._enter_memory() if self.trace_memory else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': stage,
+                'column': column,
+                'wall_s': time.perf_counter() - wall,
+                'cpu_s': time.process_time() - cpu,
+                'peak_mb': self._exit_memory(entry) if entry is not None else None,
+            }
+            self.add([record])
+
+    def _enter_memory(self) -> list:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        with _open_spans_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            for open_entry in _open_spans:
+                open_entry[1] = max(open_entry[1], peak)
+            tracemalloc.reset_peak()
+            entry = [current, current]  # [level at start, highest peak seen so far]
+            _open_spans.append(entry)
+        return entry
+
+    def _exit_memory(self, entry: list) -> float:
+        with _open_spans_lock:
+            _open_spans.remove(entry)
+            peak = max(entry[1], tracemalloc.get_traced_memory()[1])
+            for open_entry in _open_spans:
+                open_entry[1] = max(open_entry[1], peak)
+        return (peak - entry[0]) / 2 ** 20
+
+    def add(self, spans: list):
+        self.spans.extend(spans)
+        if self.emit_hooks:
+            for record in spans:
+                for hook in span_hooks:
+                    hook(record)
+
+    def close(self):
+        """
+        Stop tracemalloc if this recorder started it (it restarts on the next traced span).
+        """
+        if self._started_tracing and not _open_spans:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def summary(self) -> dict:
+        """
+        Spans totalled per stage, and per column and stage, as stored under `results['_profile']`.
+        """
+        stages, columns = {}, {}
+        for record in self.spans:
+            target = stages if record['column'] is None else columns.setdefault(str(record['column']), {})
+            totals = target.setdefault(record['stage'], {'wall_s': 0.0, 'cpu_s': 0.0, 'peak_mb': None, 'calls': 0})
+            totals['wall_s'] += record['wall_s']
+            totals['cpu_s'] += record['cpu_s']
+            totals['calls'] += 1
+            if record['peak_mb'] is not None:
+                totals['peak_mb'] = max(totals['peak_mb'] or 0.0, record['peak_mb'])
+        return {'stages': stages, 'columns': columns, 'memory': 'tracemalloc' if self.trace_memory else None}
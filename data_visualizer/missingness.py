@@ -0,0 +1,137 @@
+# data_visualizer/missingness.py
+"""
+Missing-value bookkeeping shared across the report.
+
+`NullityMask` computes one boolean is-missing mask for the whole frame; the overview totals,
+per-column missing stats, the analyzers' non-null views and the missingness-pattern section
+all read from it instead of calling `isna()` again. `MissingnessAccumulator` turns mask blocks
+into co-missing column pairs and the most common null patterns, and merges across chunks.
+"""
+import numpy as np
+import pandas as pd
+from .sketches import HeavyHitters
+
+MISSINGNESS_BLOCK_ROWS = 1_000_000  # Rows per packbits/matmul block when summarising patterns
+
+
+class NullityMask:
+    """
+    Column-major (n_rows x n_columns) boolean mask of missing values, built once per frame.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.columns = list(data.columns)
+        self._positions = {column_name: j for j, column_name in enumerate(self.columns)}
+        self.mask = np.empty((len(data), len(self.columns)), dtype=bool, order='F')
+        for j in range(len(self.columns)):
+            self.mask[:, j] = data.iloc[:, j].isna().to_numpy()
+        self.counts = self.mask.sum(axis=0)
+
+    def __contains__(self, column_name) -> bool:
+        return column_name in self._positions
+
+    def column(self, column_name) -> np.ndarray:
+        return self.mask[:, self._positions[column_name]]
+
+    def missing_count(self, column_name) -> int:
+        return int(self.counts[self._positions[column_name]])
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def subset(self, column_names) -> "NullityMask":
+        """
+        Mask restricted to some columns, e.g. to ship with a single-column process-pool job.
+        """
+        subset = NullityMask.__new__(NullityMask)
+        positions = [self._positions[column_name] for column_name in column_names]
+        subset.columns = list(column_names)
+        subset._positions = {column_name: j for j, column_name in enumerate(subset.columns)}
+        subset.mask = np.asfortranarray(self.mask[:, positions])
+        subset.counts = self.counts[positions]
+        return subset
+
+    def summary(self, settings) -> dict:
+        """
+        Missingness-pattern section computed from this mask.
+        """
+        accumulator = MissingnessAccumulator(self.columns, settings.sketch_capacity)
+        for start in range(0, self.mask.shape[0], MISSINGNESS_BLOCK_ROWS):
+            accumulator.update(self.mask[start:start + MISSINGNESS_BLOCK_ROWS])
+        return accumulator.finalize(settings.missing_patterns_top_n)
+
+
+class MissingnessAccumulator:
+    """
+    Mergeable co-missing counts and null-pattern frequencies over blocks of a nullity mask.
+    Patterns are kept in a heavy-hitters summary, so they stay exact unless there are more
+    distinct patterns than `capacity`.
+    """
+
+    def __init__(self, columns, capacity: int = 1000):
+        self.columns = list(columns)
+        self.num_rows = 0
+        self.rows_with_missing = 0
+        self.co_missing = np.zeros((len(self.columns), len(self.columns)), dtype=np.int64)
+        self.patterns = HeavyHitters(capacity)
+
+    def update(self, mask: np.ndarray):
+        self.num_rows += mask.shape[0]
+        incomplete = mask.any(axis=1)
+        self.rows_with_missing += int(incomplete.sum())
+
+        # Only columns that have gaps in this block can co-occur
+        gaps = np.flatnonzero(mask.any(axis=0))
+        if len(gaps) == 0:
+            return
+        block = mask[incomplete][:, gaps]
+
+        # float32 matmul is exact for counts below 2**24, so accumulate per block of rows
+        for start in range(0, block.shape[0], MISSINGNESS_BLOCK_ROWS):
+            part = block[start:start + MISSINGNESS_BLOCK_ROWS].astype(np.float32)
+            self.co_missing[np.ix_(gaps, gaps)] += np.rint(part.T @ part).astype(np.int64)
+
+        # Each row's pattern packed into bytes over all columns, so keys agree across blocks
+        packed = np.packbits(mask[incomplete], axis=1)
+        rows = np.ascontiguousarray(packed).view(np.dtype((np.void, packed.shape[1]))).ravel()
+        unique_rows, counts = np.unique(rows, return_counts=True)
+        self.patterns.update_counts(pd.Series(counts, index=[row.tobytes() for row in unique_rows]))
+
+    def merge(self, other: "MissingnessAccumulator"):
+        self.num_rows += other.num_rows
+        self.rows_with_missing += other.rows_with_missing
+        self.co_missing += other.co_missing
+        self.patterns.merge(other.patterns)
+        return self
+
+    def _pattern_columns(self, key: bytes) -> list:
+        bits = np.unpackbits(np.frombuffer(key, dtype=np.uint8))[:len(self.columns)]
+        return [self.columns[j] for j in np.flatnonzero(bits)]
+
+    def finalize(self, top_n: int = 10) -> dict:
+        num_rows = self.num_rows
+        percentage = lambda count: float(count / num_rows * 100) if num_rows > 0 else 0.0
+
+        patterns = [
+            {'columns': self._pattern_columns(key), 'count': int(count), 'percentage': percentage(count)}
+            for key, count in self.patterns.top(top_n).items()
+        ]
+
+        upper = np.triu(self.co_missing, k=1)
+        pairs = np.flatnonzero(upper)
+        pairs = pairs[np.argsort(-upper.ravel()[pairs], kind='stable')][:top_n]
+        co_missing = []
+        for pair in pairs:
+            i, j = divmod(int(pair), len(self.columns))
+            co_missing.append({'columns': [self.columns[i], self.columns[j]], 'count': int(upper[i, j]),
+                               'percentage': percentage(upper[i, j])})
+
+        return {
+            'rows_with_missing': int(self.rows_with_missing),
+            'rows_with_missing_%': percentage(self.rows_with_missing),
+            'columns_with_missing': int(np.count_nonzero(np.diag(self.co_missing))),
+            'patterns': patterns,
+            'patterns_approximate': not self.patterns.is_exact,
+            'co_missing': co_missing,
+        }
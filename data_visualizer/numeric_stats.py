@@ -0,0 +1,185 @@
+# data_visualizer/numeric_stats.py
+from typing import Optional
+import numpy as np
+import pandas as pd
+from .sketches import KLLSketch
+
+QUANTILES = (0.25, 0.5, 0.75)
+SKETCH_CHUNK_ROWS = 1_000_000  # Rows fed to a quantile sketch at a time in approximate mode
+BATCH_CELLS = 1 << 23  # Values converted to float64 at a time (64 MB), in batches of whole columns
+
+
+def _zero_out_fperr(values: np.ndarray) -> np.ndarray:
+    # Same tolerance pandas uses so near-constant columns report 0 skew/kurtosis
+    return np.where(np.abs(values) < 1e-14, 0, values)
+
+
+def moment_statistics(counts: np.ndarray, m2: np.ndarray, m3: np.ndarray, m4: np.ndarray):
+    """
+    Sample std, skewness and excess kurtosis from counts and the sums of 2nd/3rd/4th powers of
+    deviations from the mean, using the same bias corrections as pandas' std/skew/kurt.
+    Works on arrays, so it serves both the batched block and merged streaming moments.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(m2 / (counts - 1))
+        std = np.where(counts < 2, np.nan, std)
+
+        m2_skew = _zero_out_fperr(m2)
+        m3_skew = _zero_out_fperr(m3)
+        skewness = (counts * (counts - 1) ** 0.5 / (counts - 2)) * (m3_skew / m2_skew ** 1.5)
+        skewness = np.where(m2_skew == 0, 0, skewness)
+        skewness = np.where(counts < 3, np.nan, skewness)
+
+        adj = 3 * (counts - 1) ** 2 / ((counts - 2) * (counts - 3))
+        numerator = _zero_out_fperr(counts * (counts + 1) * (counts - 1) * m4)
+        denominator = _zero_out_fperr((counts - 2) * (counts - 3) * m2 ** 2)
+        kurtosis = numerator / denominator - adj
+        kurtosis = np.where(denominator == 0, 0, kurtosis)
+        kurtosis = np.where(counts < 4, np.nan, kurtosis)
+
+    return std, skewness, kurtosis
+
+
+def _select(work: np.ndarray, positions: list, start: int, stop: int):
+    # Puts each of the sorted `positions` of work[start:stop] in its sorted place, in place.
+    # Single-kth partitions of the shrinking ranges stay on NumPy's fast selection path.
+    if not positions:
+        return
+    middle = len(positions) // 2
+    position = positions[middle]
+    work[start:stop].partition(position - start)
+    _select(work, positions[:middle], start, position)
+    _select(work, positions[middle + 1:], position + 1, stop)
+
+
+def _linear_quantiles(work: np.ndarray, quantiles) -> np.ndarray:
+    """
+    Linear-interpolated quantiles of the NaN-free 1-D `work` (reordered in place), selected by
+    partitioning rather than sorting. Mirrors numpy's 'linear' method so results match
+    `Series.quantile`.
+    """
+    n = len(work)
+    virtual = np.asarray(quantiles, dtype=np.float64) * (n - 1)
+    lower = np.floor(virtual).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    gamma = virtual - lower
+    _select(work, sorted(set(lower.tolist()) | set(upper.tolist())), 0, n)
+
+    a, b = work[lower], work[upper]
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+
+def _column_quantiles(values: np.ndarray, mask: np.ndarray, quantiles) -> np.ndarray:
+    # Each column's non-null values are copied once and partitioned; never a sorted copy of the batch
+    result = np.full((len(quantiles), values.shape[1]), np.nan)
+    for i in range(values.shape[1]):
+        work = values[~mask[:, i], i] if mask[:, i].any() else values[:, i].copy()
+        if len(work):
+            result[:, i] = _linear_quantiles(work, quantiles)
+    return result
+
+
+def _sketched_quantiles(values: np.ndarray, quantile_sketch_k: int, quantiles) -> np.ndarray:
+    # Column-wise KLL estimates; working memory is bounded by one chunk instead of a sorted copy
+    result = np.full((len(quantiles), values.shape[1]), np.nan)
+    for i in range(values.shape[1]):
+        sketch = KLLSketch(quantile_sketch_k)
+        for start in range(0, values.shape[0], SKETCH_CHUNK_ROWS):
+            sketch.update(values[start:start + SKETCH_CHUNK_ROWS, i])
+        result[:, i] = sketch.quantiles(quantiles)
+    return result
+
+
+def _batch_stats(values: np.ndarray, outlier_threshold: float, quantile_sketch_k: Optional[int]) -> dict:
+    """
+    Column-wise summary arrays of one float batch; NaN marks missing values.
+    """
+    mask = np.isnan(values)
+    counts = (~mask).sum(axis=0).astype(np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(mask, 0.0, values).sum(axis=0) / counts
+
+        adjusted = np.where(mask, 0.0, values - mean)
+        adjusted2 = adjusted ** 2
+        m2 = adjusted2.sum(axis=0)
+        m3 = (adjusted2 * adjusted).sum(axis=0)
+        adjusted2 **= 2
+        m4 = adjusted2.sum(axis=0)
+        del adjusted, adjusted2
+
+        std, skewness, kurtosis = moment_statistics(counts, m2, m3, m4)
+
+        col_min = np.where(counts > 0, np.where(mask, np.inf, values).min(axis=0, initial=np.inf), np.nan)
+        col_max = np.where(counts > 0, np.where(mask, -np.inf, values).max(axis=0, initial=-np.inf), np.nan)
+
+    if quantile_sketch_k is not None:
+        quartiles = _sketched_quantiles(values, quantile_sketch_k, QUANTILES)
+    else:
+        quartiles = _column_quantiles(values, mask, QUANTILES)
+
+    q1, median, q3 = quartiles
+    iqr = q3 - q1
+    lower_bound = q1 - outlier_threshold * iqr
+    upper_bound = q3 + outlier_threshold * iqr
+    with np.errstate(invalid='ignore'):
+        outlier_counts = ((values < lower_bound) | (values > upper_bound)).sum(axis=0)
+
+    return {'counts': counts, 'mean': mean, 'std': std, 'skewness': skewness, 'kurtosis': kurtosis,
+            'min': col_min, 'max': col_max, 'q1': q1, 'median': median, 'q3': q3,
+            'lower_bound': lower_bound, 'upper_bound': upper_bound, 'outlier_counts': outlier_counts}
+
+
+def compute_numeric_stats(block: pd.DataFrame, outlier_threshold: float = 1.5, quantile_sketch_k: Optional[int] = None) -> dict:
+    """
+    Compute the numeric summary for every column of `block` in a handful of vectorized passes.
+
+    The block is converted to 2-D float arrays in batches of columns (about `BATCH_CELLS`
+    values each, so the float copy and its temporaries stay bounded); counts, moments (mean,
+    std, skewness, kurtosis), min/max, quartiles and IQR outlier counts are then computed
+    column-wise. Results match pandas' `describe`, `skew`, `kurt` and `quantile`. When
+    `quantile_sketch_k` is given, quartiles (and therefore the IQR outlier bounds) are estimated
+    with a KLL sketch and flagged as approximate.
+
+    Returns:
+        Dict mapping column name to its stats dict (same keys as `_analyse_numeric`),
+        plus the IQR bounds used for outlier highlighting.
+    """
+    if block.shape[1] == 0:
+        return {}
+
+    n_rows = block.shape[0]
+    batch_columns = max(1, BATCH_CELLS // max(n_rows, 1))
+    stats = {}
+    for start in range(0, block.shape[1], batch_columns):
+        batch = block.iloc[:, start:start + batch_columns]
+        # Column-major so each column reduction is contiguous (and summed pairwise, like pandas)
+        values = np.asfortranarray(batch.to_numpy(dtype=np.float64, na_value=np.nan))
+        arrays = _batch_stats(values, outlier_threshold, quantile_sketch_k)
+        del values
+
+        for i, column_name in enumerate(batch.columns):
+            outlier_count = int(arrays['outlier_counts'][i])
+            skewness, kurtosis = arrays['skewness'][i], arrays['kurtosis'][i]
+            stats[column_name] = {
+                'count': float(arrays['counts'][i]),
+                'mean': float(arrays['mean'][i]),
+                'std': float(arrays['std'][i]),
+                'min': float(arrays['min'][i]),
+                '25%': float(arrays['q1'][i]),
+                '50%': float(arrays['median'][i]),
+                '75%': float(arrays['q3'][i]),
+                'max': float(arrays['max'][i]),
+                'skewness': float(skewness) if not np.isnan(skewness) else 0.0,
+                'kurtosis': float(kurtosis) if not np.isnan(kurtosis) else 0.0,
+                'outlier_count': outlier_count,
+                'outlier_percentage': (outlier_count / n_rows * 100) if n_rows > 0 else 0.0,
+                'outlier_bounds': (float(arrays['lower_bound'][i]), float(arrays['upper_bound'][i])),
+            }
+            if quantile_sketch_k is not None:
+                stats[column_name]['approximate'] = True
+                stats[column_name]['approximate_fields'] = ['25%', '50%', '75%', 'outlier_count', 'outlier_percentage']
+
+    return stats
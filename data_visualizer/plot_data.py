@@ -0,0 +1,107 @@
+# data_visualizer/plot_data.py
+"""
+Fixed-size plotting summaries computed from raw column values.
+
+Plots are drawn from these summaries instead of the raw data, so rendering time and the size
+of embedded figures (e.g. Plotly JSON) do not grow with the number of rows.
+"""
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+HISTOGRAM_BINS = 20
+KDE_GRID_POINTS = 200  # Points the density curve is evaluated at (seaborn's default gridsize)
+KDE_FINE_BINS = 2048  # Resolution of the fine histogram behind the binned KDE
+
+
+def binned_kde(values: np.ndarray, gridsize: int = KDE_GRID_POINTS, fine_bins: int = KDE_FINE_BINS) -> Optional[tuple]:
+    """
+    Gaussian KDE (Scott's bandwidth, evaluated over the data range like seaborn's histplot)
+    approximated by convolving a fine histogram with the kernel: O(n) binning plus a
+    convolution whose size is independent of n.
+
+    Returns:
+        (x, density) arrays of length `gridsize`, or None if the data has no spread.
+    """
+    n = len(values)
+    if n < 2:
+        return None
+    low, high = float(values.min()), float(values.max())
+    std = float(values.std(ddof=1))
+    if not std > 0 or high == low:
+        return None
+
+    bandwidth = std * n ** (-1 / 5)
+    pad = 4 * bandwidth
+    fine_counts, fine_edges = np.histogram(values, bins=fine_bins, range=(low - pad, high + pad))
+    delta = fine_edges[1] - fine_edges[0]
+
+    half_width = int(np.ceil(pad / delta))
+    offsets = np.arange(-half_width, half_width + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum() * delta  # Unit mass even when the kernel is coarsely sampled
+    density = np.convolve(fine_counts, kernel, mode='same') / n
+
+    centers = (fine_edges[:-1] + fine_edges[1:]) / 2
+    grid = np.linspace(low, high, gridsize)
+    return grid, np.interp(grid, centers, density)
+
+
+def numeric_plot_data(column_data: pd.Series, bins: int = HISTOGRAM_BINS, outlier_mask: Optional[np.ndarray] = None) -> dict:
+    """
+    Histogram and density summary for a numeric column.
+
+    Args:
+        outlier_mask: Boolean array aligned with `column_data`; outliers are counted in their own
+            histogram on the same bin edges and left out of the density curve.
+
+    Returns:
+        Dict with 'histogram' (counts, edges), 'outlier_histogram' (counts or None) and
+        'kde' (x, y scaled to histogram counts, or None).
+    """
+    values = column_data.to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = np.isfinite(values)
+    counts, edges = np.histogram(values[finite], bins=bins)
+
+    outlier_counts = None
+    inliers = values[finite]
+    outlier_mask = np.asarray(outlier_mask, dtype=bool) if outlier_mask is not None else None
+    if outlier_mask is not None and outlier_mask.any():
+        outlier_counts, _ = np.histogram(values[finite & outlier_mask], bins=edges)
+        counts = counts - outlier_counts
+        inliers = values[finite & ~outlier_mask]
+
+    kde = binned_kde(inliers)
+    if kde is not None:
+        # Same scaling seaborn applies so the curve sits on top of count bars
+        kde = (kde[0], kde[1] * len(inliers) * (edges[1] - edges[0]))
+
+    return {'histogram': (counts, edges), 'outlier_histogram': outlier_counts, 'kde': kde}
+
+
+def heatmap_matrix(correlation_matrix: pd.DataFrame, top_n: Optional[int] = None, order: str = 'original') -> pd.DataFrame:
+    """
+    The part of a correlation matrix a heatmap shows.
+
+    Args:
+        top_n: keep only the `top_n` variables with the strongest correlation (largest
+            off-diagonal |value|) to any other variable, in their original order
+        order: 'cluster' reorders the variables by average-linkage hierarchical clustering on
+            1 - |value|, so strongly correlated variables form blocks along the diagonal
+    """
+    matrix = correlation_matrix
+    if top_n is not None and len(matrix) > top_n:
+        strength = np.abs(matrix.to_numpy(dtype=np.float64))
+        np.fill_diagonal(strength, np.nan)
+        strength = np.nan_to_num(strength, nan=-1.0).max(axis=1)  # Undefined correlations rank last
+        keep = np.sort(np.argsort(-strength, kind='stable')[:top_n])
+        matrix = matrix.iloc[keep, keep]
+    if order == 'cluster' and len(matrix) > 2:
+        from scipy.cluster.hierarchy import leaves_list, linkage
+        from scipy.spatial.distance import squareform
+        distance = 1.0 - np.nan_to_num(np.abs(matrix.to_numpy(dtype=np.float64)), nan=0.0)
+        np.fill_diagonal(distance, 0.0)
+        distance = np.clip((distance + distance.T) / 2, 0.0, 1.0)  # Exactly symmetric for squareform
+        leaves = leaves_list(linkage(squareform(distance, checks=False), method='average'))
+        matrix = matrix.iloc[leaves, leaves]
+    return matrix
@@ -1,3 +1,7 @@
+import asyncio
+import contextlib
+import functools
+import threading
 import warnings
 
 # This will suppress all FutureWarnings
@@ -10,34 +14,162 @@ warnings.filterwarnings('ignore', category=UserWarning)
 import pandas as pd
 import pydantic
 from pydantic import Field
-from visions.typesets import CompleteSet  #used to get the types
 from .type_analyzers import  _analyse_generic
-from .type_registry import analyzer_registry
+from .type_registry import get_analyzer
+from .type_inference import infer_column_type, get_typeset
 from .alerts import generate_alerts, generate_dataset_alerts
-from .visualizer import get_plot_as_base64
-from .correlations import calculate_correlations,generate_correlation_heatmap
+from .visualizer import column_plot_spec, summary_plot_spec, heatmap_spec, render_plot_specs, PlotRenderer
+from .correlations import calculate_correlations, strongest_pairs
 from .report import generate_html_report 
 from .settings import Settings
-from tqdm import tqdm
-from colorama import Fore, Style, init
-from visions.types import Float, Integer, String  # Add to imports
+from .numeric_stats import compute_numeric_stats
+from .execution import map_ordered
+from .cache import ResultCache, hash_column, settings_fingerprint, make_key
+from .streaming import ProfileState, iter_file_chunks
+from .arrow_data import is_arrow_data, is_arrow_dataset, arrow_to_pandas, iter_dataset_chunks
+from .dask_backend import is_dask_data, profile_dask
+from .duplicates import find_duplicates
+from .sampling import sample_positions, sample_digest, sampling_summary, stage_rows
+from .missingness import NullityMask
+from .instrumentation import SpanRecorder, span
+from .export import export_document, dumps_json, dumps_msgpack, stats_table, write_parquet
+from .events import CONSOLE, CallbackProgress, AnalysisCancelled
+from colorama import Fore, init
 init(autoreset=True)  # This makes sure each print statement resets to the default color
 
 class AnalysisReport:
-    def __init__(self, data: pd.DataFrame, settings: Settings = None):
+    def __init__(self, data: pd.DataFrame, settings: Settings = None, on_event=None):
+        """
+        `data` is a pandas DataFrame, a pyarrow Table, RecordBatch or Dataset, a Polars DataFrame
+        or a Dask DataFrame. Arrow and Polars string columns are profiled on their Arrow buffers
+        instead of being copied into Python strings; a dataset is scanned in record batches, like
+        `from_chunks`. A Dask DataFrame is profiled by one task per partition (see `dask_backend.py`).
+
+        With `on_event`, progress goes to that callback as event dicts (see `events.py`) instead
+        of being printed and drawn as progress bars.
+        """
         init(autoreset=True)
+        self._chunks = None  # Set by from_chunks() (or for an Arrow dataset) for streaming profiling
+        self._state = None  # Mergeable ProfileState, once the report is streamed, updated or merged
+        self._dask = None  # Dask DataFrame, profiled partition by partition into the state
+        if is_dask_data(data):
+            data, self._dask = None, data
+        elif is_arrow_dataset(data):
+            data, self._chunks = None, iter_dataset_chunks(data)
+        elif is_arrow_data(data):
+            data = arrow_to_pandas(data)
         self.data = data
         self.settings = settings if settings is not None else Settings()
-        self.typeset = CompleteSet()
         self.results = None
+        self.numeric_stats = {}  # Batched per-column numeric summaries, filled by analyse()
+        self.nullity = None  # Shared missing-value mask, filled by analyse()
+        self.sample = None  # Rows the sampled stages run on (settings.sampling), filled by analyse()
+        self._plot_specs = {}  # Plots awaiting the rendering stage, keyed by their path in `results`
+        self._pending_cache = {}  # Column results cached once their plots are rendered
+        self.cache = ResultCache(self.settings.cache_dir, self.settings.cache_max_bytes) if self.settings.cache_dir else None
+        self.recorder = SpanRecorder(self.settings.instrument_memory) if self.settings.instrument else None  # None = instrumentation off
+        self.progress = CallbackProgress(on_event) if on_event is not None else CONSOLE  # Where banners, bars and events go
+        self._renderer = None  # Background PlotRenderer while columns are analysed (settings.overlap_plots)
+        self._async_run = threading.Lock()  # Held while an analyse_async()/to_html_async() run is in flight
+
+    @property
+    def typeset(self):
+        """
+        The visions typeset selected by `settings.typeset` (built lazily, shared between reports).
+        """
+        return get_typeset(self.settings.typeset)
+
+    @classmethod
+    def from_chunks(cls, chunks, settings: Settings = None, on_event=None) -> "AnalysisReport":
+        """
+        Create a report over an iterable of DataFrame chunks (e.g. `pd.read_csv(..., chunksize=...)`).
+        Chunks are consumed once by `analyse()` and never held in memory together.
+        """
+        report = cls(None, settings, on_event)
+        report._chunks = chunks
+        return report
+
+    @classmethod
+    def from_path(cls, path: str, chunksize: int = 100_000, settings: Settings = None, on_event=None,
+                  **read_kwargs) -> "AnalysisReport":
+        """
+        Create a streaming report over a CSV file, a Parquet file or a directory of Parquet files.
+        """
+        return cls.from_chunks(iter_file_chunks(path, chunksize, **read_kwargs), settings, on_event)
+
+    @classmethod
+    def from_state(cls, state, settings: Settings = None, on_event=None) -> "AnalysisReport":
+        """
+        Create a report from a `ProfileState` (or the path of one saved with `save_state()`).
+        """
+        if isinstance(state, str):
+            state = ProfileState.load(state)
+        report = cls(None, settings if settings is not None else state.settings, on_event)
+        report._state = state
+        return report
+
+    @property
+    def state(self) -> ProfileState:
+        """
+        The report's mergeable profile state, built on first access by streaming the report's
+        chunks (or its in-memory data) through the accumulators, or by reducing the states of a
+        Dask DataFrame's partitions. Once a report has a state, `analyse()` reports from it.
+        """
+        if self._state is None and self._dask is not None:
+            dask_data, self._dask = self._dask, None
+            with self._stage('dask_partitions'):
+                self._state = profile_dask(dask_data, self.settings)
+        if self._state is None:
+            self._state = ProfileState(self.settings)
+            if self._chunks is not None:
+                chunks, self._chunks = self._chunks, None
+                self._state.consume(chunks, self.progress)
+            elif self.data is not None:
+                self._state.update(self.data)
+        return self._state
+
+    def update(self, partition) -> "AnalysisReport":
+        """
+        Append rows (a DataFrame, an Arrow/Polars table or dataset, a Dask DataFrame or an
+        iterable of DataFrame chunks) to the report's profile state; only the new rows are scanned.
+        """
+        if is_dask_data(partition):
+            self.state.merge(profile_dask(partition, self.settings))
+        else:
+            self.state.consume(_partition_chunks(partition), self.progress)
+        self._reset_results()
+        return self
+
+    def merge(self, other) -> "AnalysisReport":
+        """
+        Merge in another partition of the same table: an `AnalysisReport` or a `ProfileState`.
+        """
+        self.state.merge(other.state if isinstance(other, AnalysisReport) else other)
+        self._reset_results()
+        return self
+
+    def save_state(self, path: str):
+        """
+        Save the profile state, e.g. one file per daily partition, for `from_state()` or `merge()`.
+        """
+        self.state.save(path)
+
+    def _reset_results(self):
+        self.results = None
+        self._plot_specs = {}
+        self._close_renderer()
 
     def _analyze_column(self, column_data: pd.Series, column_name: str) -> dict:
         """
         Analyze a single column and return its details.
         """
         dtype = column_data.dtype
-        missing_vals = column_data.isna().sum()
-        missing_percentage = (missing_vals / self.data.shape[0]) * 100
+        if self.nullity is not None and column_name in self.nullity:
+            missing_vals = self.nullity.missing_count(column_name)
+        else:
+            missing_vals = column_data.isna().sum()
+        num_rows = self.data.shape[0]
+        missing_percentage = (missing_vals / num_rows) * 100 if num_rows else 0.0
 
         column_details = {
             'Data_type': str(dtype),
@@ -46,33 +178,49 @@ class AnalysisReport:
         }
 
         if not self.settings.minimal:
-            inferred_type = self.typeset.infer_type(column_data)
-            registry_func = analyzer_registry.get(inferred_type, _analyse_generic)
-            column_details.update(registry_func(self, column_data))
+            with span(self.recorder, 'type_inference', column_name):
+                inferred_type = infer_column_type(stage_rows(self, column_data, 'type_inference'), self.settings)
+            registry_func = get_analyzer(inferred_type, _analyse_generic)
+            with span(self.recorder, 'analyzer', column_name):
+                column_details.update(registry_func(self, column_data))
             
             if self.settings.include_plots:
-                # Get outlier indices for numeric columns (for graph highlighting)
-                outlier_indices = column_details.get('outlier_indices', []) if inferred_type in [Float, Integer] else None
+                plot_rows = stage_rows(self, column_data, 'plots')
+
+                # Get the outlier mask for numeric columns (for graph highlighting)
+                outlier_mask = column_details.get('outlier_mask') if str(inferred_type) in ['Float', 'Integer'] else None
+                if outlier_mask is not None and len(outlier_mask) != len(plot_rows):
+                    outlier_mask = None  # Computed over all rows, not the plotted sample
                 
                 # Get word frequencies for string columns (for word cloud)
-                word_frequencies = column_details.get('word_frequencies', None) if inferred_type == String and self.settings.text_analysis else None
+                word_frequencies = column_details.get('word_frequencies', None) if str(inferred_type) == 'String' and self.settings.text_analysis else None
                 
-                # Generate main plot (distribution for numeric/categorical, or word cloud for text)
-                column_details['plot'] = get_plot_as_base64(
-                    column_data, column_name, settings=self.settings,
-                    outliers=outlier_indices, word_frequencies=word_frequencies
-                )
+                # Top values already summarised by a sketch (approximate mode); avoids a full value_counts()
+                plot_value_counts = column_details.get('plot_value_counts')
+
+                # Plots are only described here (small summaries); the rendering stage draws them
+                # after all stats are done. The slots keep the plot keys in their usual place.
+                with span(self.recorder, 'plot_spec', column_name):
+                    plot_specs = {}
+                    if plot_value_counts is not None and not word_frequencies:
+                        plot_specs['plot'] = summary_plot_spec(column_name, value_counts=plot_value_counts)
+                    else:
+                        plot_specs['plot'] = column_plot_spec(plot_rows, column_name, outlier_mask=outlier_mask,
+                                                              word_frequencies=word_frequencies)
                 
-                # If word frequencies exist and not empty, also generate a bar chart for value counts
-                if word_frequencies and len(word_frequencies) > 0:
-                    column_details['plot_bar'] = get_plot_as_base64(
-                        column_data, column_name, settings=self.settings,
-                        outliers=None, word_frequencies=None  # Force bar chart
-                    )
+                    # If word frequencies exist and not empty, also generate a bar chart for value counts
+                    if word_frequencies and len(word_frequencies) > 0:
+                        if plot_value_counts is not None:
+                            plot_specs['plot_bar'] = summary_plot_spec(column_name, value_counts=plot_value_counts)
+                        else:
+                            plot_specs['plot_bar'] = column_plot_spec(plot_rows, column_name)  # Force bar chart
+                column_details.update(dict.fromkeys(plot_specs))
+                column_details['plot_specs'] = plot_specs
             
             # Remove internal visualization data from output (only needed for plotting, not for JSON)
-            column_details.pop('outlier_indices', None)
+            column_details.pop('outlier_mask', None)
             column_details.pop('word_frequencies', None)
+            column_details.pop('plot_value_counts', None)
 
         # Generate alerts for the column (AFTER type-specific analysis to include outlier stats)
         if self.settings.include_alerts:
@@ -81,81 +229,259 @@ class AnalysisReport:
 
         return column_details
 
+    def _column_job(self, column_name) -> tuple:
+        """
+        Build the picklable payload a process-pool worker needs to analyse one column.
+        """
+        state = {
+            'numeric_stats': {column_name: self.numeric_stats[column_name]} if column_name in self.numeric_stats else {},
+            'nullity': self.nullity.subset([column_name]),
+            'sample': self.sample[[column_name]] if self.sample is not None else None,
+        }
+        return (self.settings, self.data[column_name], column_name, state)
+
     def analyse(self):
         """
         Analyze the dataset and return a dictionary of results.
         """
-        print(Fore.GREEN + "Starting analysis..." + Style.BRIGHT)
-        print(Fore.YELLOW + "Attempting to create an AnalysisReport object..." + Style.BRIGHT)
+        try:
+            return self._analyse()
+        except BaseException:
+            # Failed or cancelled at any stage: the background renderer must not outlive the run
+            self._close_renderer()
+            raise
+
+    def _analyse(self):
+        self.progress.message("Starting analysis...", Fore.GREEN)
+        self.progress.message("Attempting to create an AnalysisReport object...", Fore.YELLOW)
+
+        if self._chunks is not None or self._state is not None or self._dask is not None:
+            with self._stage('streaming'):
+                self.results = self.state.finalize()
+                self._add_correlations(self.results, self.state.correlation_matrices(self.progress))
+            self._collect_plot_specs(self.results['variables'])
+            self.progress.message("--- Full Analysis Done ---", Fore.GREEN)
+            return self._finish()
 
         final_results = {}
 
+        # One missing-value mask for the overview, column stats, analyzers and missingness section
+        with self._stage('nullity_mask'):
+            self.nullity = NullityMask(self.data)
+
         if self.settings.include_overview:
-            num_rows = self.data.shape[0]
-            num_columns = self.data.shape[1]
-            num_duplicates = self.data.duplicated().sum()
-            duplicate_percentage = (num_duplicates / num_rows * 100) if num_rows > 0 else 0.0
-            duplicate_indices = self.data.index[self.data.duplicated()].tolist()
-            duplicate_samples = self.data[self.data.duplicated(keep=False)].head(5).to_dict('records')
-
-            overview_stats = {
-                'num_Row': num_rows,
-                'num_Columns': num_columns,
-                'duplicated_rows': int(num_duplicates),
-                'duplicate_percentage': float(duplicate_percentage),
-                'duplicate_indices': duplicate_indices,
-                'duplicate_samples': duplicate_samples,
-                'missing_values': int(self.data.isna().sum().sum()),
-                'missing_percentage': float(self.data.isna().sum().sum() / (num_rows * num_columns) * 100) if num_rows * num_columns > 0 else 0.0,
-            }
-
-            if self.settings.include_alerts:
-                overview_stats['alerts'] = generate_dataset_alerts(
-                    {'duplicate_percentage': duplicate_percentage},
-                    settings=self.settings
-                )
-
-            final_results['overview'] = overview_stats
-
-        variable_stats = {}
+            with self._stage('overview'):
+                num_rows = self.data.shape[0]
+                num_columns = self.data.shape[1]
+                # One hash per row gives the count, a bounded index sample and the sample rows
+                duplicates = find_duplicates(self.data, subset=self.settings.duplicate_subset,
+                                             chunksize=self.settings.duplicate_chunksize,
+                                             max_indices=self.settings.max_duplicate_indices)
+                num_duplicates = duplicates['count']
+                duplicate_percentage = (num_duplicates / num_rows * 100) if num_rows > 0 else 0.0
+                duplicate_indices = duplicates['indices']
+                duplicate_samples = duplicates['samples']
+
+                overview_stats = {
+                    'num_Row': num_rows,
+                    'num_Columns': num_columns,
+                    'duplicated_rows': int(num_duplicates),
+                    'duplicate_percentage': float(duplicate_percentage),
+                    'duplicate_indices': duplicate_indices,
+                    'duplicate_samples': duplicate_samples,
+                    'missing_values': self.nullity.total,
+                    'missing_percentage': float(self.nullity.total / (num_rows * num_columns) * 100) if num_rows * num_columns > 0 else 0.0,
+                }
+
+                if self.settings.include_alerts:
+                    overview_stats['alerts'] = generate_dataset_alerts(
+                        {'duplicate_percentage': duplicate_percentage},
+                        settings=self.settings
+                    )
+
+                final_results['overview'] = overview_stats
+
+        if self.settings.include_missingness:
+            with self._stage('missingness'):
+                final_results['missingness'] = self.nullity.summary(self.settings)
+
+        # Rows for the stages in settings.sample_stages; every other statistic uses all rows
+        with self._stage('sampling'):
+            positions = sample_positions(self.data, self.settings)
+            self.sample = self.data.iloc[positions] if positions is not None else None
+        if self.sample is not None:
+            final_results['sampling'] = sampling_summary(self.settings, len(self.sample), len(self.data),
+                                                         self.settings.sample_stages)
+
         columns = self.data.columns
 
-        for column_name in tqdm(columns, desc="Analyzing columns", unit="column"):
-            column_data = self.data[column_name]
-            single_column_analysis = self._analyze_column(column_data, column_name)
-            variable_stats[column_name] = single_column_analysis
+        # Content hashes let unchanged columns (and their correlation rows) come from the cache
+        column_hashes = {column_name: hash_column(self.data[column_name]) for column_name in columns} if self.cache else {}
+        cached_results = {}
+        if self.cache:
+            fingerprint = settings_fingerprint(self.settings)
+            if self.sample is not None:
+                fingerprint = make_key(fingerprint, sample_digest(positions))
+            cache_keys = {column_name: make_key('column', column_hashes[column_name], fingerprint) for column_name in columns}
+            for column_name in columns:
+                hit = self.cache.get(cache_keys[column_name])
+                if hit is not None:
+                    cached_results[column_name] = hit
+        pending_columns = [column_name for column_name in columns if column_name not in cached_results]
+
+        if not self.settings.minimal:
+            # Summarise every numeric column in one vectorized pass; analyzers look up their row
+            numeric_block = self.data[pending_columns].select_dtypes(include='number')
+            quantile_sketch_k = self.settings.quantile_sketch_k if self.settings.approximate else None
+            with self._stage('numeric_stats'):
+                self.numeric_stats = compute_numeric_stats(numeric_block, self.settings.outlier_threshold, quantile_sketch_k)
+
+        if self.settings.execution_backend in ('process', 'dask'):
+            # Workers only receive their own column, never the whole frame
+            tasks = (self._column_job(column_name) for column_name in pending_columns)
+            task_func = _analyze_column_job
+        else:
+            tasks = pending_columns
+            task_func = lambda column_name: self._analyze_column(self.data[column_name], column_name)
+
+        on_result = None
+        if self._overlaps_plots():
+            # Each column's plots start rendering as soon as it is analysed
+            self._renderer = PlotRenderer(self.settings, self.recorder, self.progress)
+
+            def on_result(position, column_result):
+                for field, spec in column_result.pop('plot_specs', {}).items():
+                    self._renderer.submit(('variables', pending_columns[position], field), spec)
+
+        with self._stage('columns'):
+            column_results = map_ordered(task_func, tasks, self.settings, total=len(pending_columns),
+                                         desc="Analyzing columns", unit="column", progress=self.progress,
+                                         stage='columns', labels=pending_columns, on_result=on_result)
+        computed_results = dict(zip(pending_columns, column_results))
+        for column_result in computed_results.values():
+            worker_spans = column_result.pop('_spans', None)  # Recorded in a process-pool worker
+            if worker_spans:
+                self.recorder.add(worker_spans)
+        self._collect_plot_specs(computed_results)
+        if self.cache:
+            self._pending_cache = {cache_keys[column_name]: column_result for column_name, column_result in computed_results.items()}
+
+        variable_stats = {column_name: cached_results[column_name] if column_name in cached_results else computed_results[column_name]
+                          for column_name in columns}
 
         final_results['variables'] = variable_stats
 
         if self.settings.include_sample_data:
-            sample_data = self._data_sample()
+            with self._stage('sample_data'):
+                sample_data = self._data_sample()
             final_results['Sample_data'] = sample_data
 
+        if self.settings.include_correlations:
+            with self._stage('correlations'):
+                correlation_sample = self.sample if 'correlations' in self.settings.sample_stages else None
+                correlations = calculate_correlations(self.data, cache=self.cache, column_hashes=column_hashes,
+                                                      settings=self.settings, sample=correlation_sample,
+                                                      progress=self.progress)
+            self._add_correlations(final_results, correlations)
+
+        self.progress.message("--- Full Analysis Done ---", Fore.GREEN)
+        self.results = final_results
+        return self._finish()
+
+    def _add_correlations(self, final_results: dict, correlations: dict):
+        if not self.settings.include_correlations:
+            return
         # Initialize correlation results
         correlations_plots = {}
         correlations_json = {}
-        
-        if self.settings.include_correlations:
-            correlations = calculate_correlations(self.data)
-            if correlations:
-                for key, value in correlations.items():
-                    if isinstance(value, pd.DataFrame) and value.shape[0] > 1:
-                        # Only generate plots if include_correlations_plots is True
-                        if self.settings.include_correlations_plots:
-                            correlations_plots[key] = generate_correlation_heatmap(value)
-                        # Only include JSON data if include_correlations_json is True
-                        if self.settings.include_correlations_json:
-                            correlations_json[key] = value.to_dict()
-
-            # Add to results based on settings flags (only if include_correlations is True)
-            if self.settings.include_correlations_plots:
-                final_results['Correlations_Plots'] = correlations_plots
-            if self.settings.include_correlations_json:
-                final_results['Correlations_JSON'] = correlations_json
-
-        print(Fore.GREEN + "--- Full Analysis Done ---" + Style.BRIGHT)
-        self.results = final_results
-        return final_results
+        for key, value in (correlations or {}).items():
+            if isinstance(value, pd.DataFrame) and value.shape[0] > 1:
+                # Only generate plots if include_correlations_plots is True
+                if self.settings.include_correlations_plots:
+                    correlations_plots[key] = None
+                    self._plot_specs[('Correlations_Plots', key)] = heatmap_spec(value, self.settings.heatmap_top_n,
+                                                                                 self.settings.heatmap_order)
+                # Only include JSON data if include_correlations_json is True
+                if self.settings.include_correlations_json:
+                    if self.settings.correlations_top_k is not None or self.settings.correlations_min_abs is not None:
+                        # Wide tables: the strongest pairs as a sparse list, not an N x N dict
+                        correlations_json[key] = strongest_pairs(value, self.settings.correlations_top_k,
+                                                                 self.settings.correlations_min_abs)
+                    else:
+                        correlations_json[key] = value.to_dict()
+
+        # Add to results based on settings flags (only if include_correlations is True)
+        if self.settings.include_correlations_plots:
+            final_results['Correlations_Plots'] = correlations_plots
+        if self.settings.include_correlations_json:
+            final_results['Correlations_JSON'] = correlations_json
+
+    def _collect_plot_specs(self, variable_stats: dict):
+        for column_name, column_details in variable_stats.items():
+            for field, spec in column_details.pop('plot_specs', {}).items():
+                self._plot_specs[('variables', column_name, field)] = spec
+
+    @contextlib.contextmanager
+    def _stage(self, stage: str):
+        # A top-level stage: reported to the progress, and timed when instrumentation is on
+        with self.progress.stage(stage), span(self.recorder, stage):
+            yield
+
+    def _overlaps_plots(self) -> bool:
+        # Rendering alongside the column stage needs its own workers (and plots that are not deferred)
+        backend = self.settings.render_backend or self.settings.execution_backend
+        return (self.settings.overlap_plots and self.settings.include_plots and not self.settings.defer_plots
+                and backend != 'serial')
+
+    def _close_renderer(self):
+        if self._renderer is not None:
+            self._renderer.close()
+            self._renderer = None
+
+    def _finish(self) -> dict:
+        if not (self.settings.defer_plots and self._plot_specs):
+            self.render_plots()
+        self._update_profile()
+        return self.results
+
+    def _update_profile(self):
+        # Timings so far under results['_profile'] (only when instrumentation is on)
+        if self.recorder is not None:
+            self.results['_profile'] = self.recorder.summary()
+            self.recorder.close()
+
+    def render_plots(self) -> dict:
+        """
+        The rendering stage: draw the plots collected by `analyse()` into `results`.
+
+        `analyse()` calls this itself unless `settings.defer_plots` is set, in which case the stats
+        can be used (e.g. saved) first and the plots drawn afterwards.
+        """
+        if self.results is None:
+            self.analyse()
+        if self._plot_specs or self._renderer is not None:
+            with self._stage('plot_rendering'):
+                if self._renderer is not None:
+                    # Column plots are already being drawn; the rest (heatmaps) join them
+                    for path, spec in self._plot_specs.items():
+                        self._renderer.submit(path, spec)
+                    renderer, self._renderer = self._renderer, None
+                    rendered = renderer.collect()
+                else:
+                    rendered = render_plot_specs(self._plot_specs, self.settings, self.recorder, self.progress)
+            for path, plot in rendered.items():
+                target = self.results
+                for part in path[:-1]:
+                    target = target[part]
+                target[path[-1]] = plot
+            self._plot_specs = {}
+
+        # Cached column results always include their plots
+        for cache_key, column_result in self._pending_cache.items():
+            self.cache.set(cache_key, column_result)
+        self._pending_cache = {}
+        self._update_profile()
+        return self.results
 
     
     def to_html(self, filename="report.html"):
@@ -164,12 +490,103 @@ class AnalysisReport:
         """
         # First, make sure the analysis has been run
         if self.results is None:
-            print("Performing analysis...")
+            self.progress.message("Performing analysis...")
             self.analyse()
-        generate_html_report(self.results, filename)
-    
+        if self._plot_specs:
+            self.render_plots()
+        with self._stage('html_report'):
+            generate_html_report(self.results, filename, assets=self.settings.report_assets, progress=self.progress)
+        self._update_profile()
+
+    async def analyse_async(self, on_event=None, executor=None) -> dict:
+        """
+        `analyse()` on a worker thread (`executor`, default: the loop's), so the event loop keeps
+        serving while the report is computed.
+
+        Nothing is printed: events go to `on_event`, called on the event loop (see `events.py`).
+        Cancelling the awaiting task stops the run at its next column, plot, chunk or stage.
+        A report runs one async call at a time; starting another before it finishes raises
+        RuntimeError.
+        """
+        return await self._run_async(self.analyse, on_event, executor)
+
+    async def to_html_async(self, filename="report.html", on_event=None, executor=None):
+        """
+        `to_html()` on a worker thread, with the events and cancellation of `analyse_async()`.
+        """
+        await self._run_async(functools.partial(self.to_html, filename), on_event, executor)
+
+    async def _run_async(self, func, on_event, executor):
+        # A run swaps in its own progress and fills the report's results, so runs cannot overlap
+        if not self._async_run.acquire(blocking=False):
+            raise RuntimeError("This AnalysisReport is already running analyse_async() or to_html_async(); "
+                               "await that call first, or use a separate AnalysisReport")
+        loop = asyncio.get_running_loop()
+        progress = CallbackProgress(lambda event: loop.call_soon_threadsafe(on_event, event) if on_event else None)
+
+        def run():
+            previous, self.progress = self.progress, progress
+            try:
+                return func()
+            finally:
+                self.progress = previous
+                self._async_run.release()
+
+        try:
+            future = loop.run_in_executor(executor, run)
+        except BaseException:
+            self._async_run.release()
+            raise
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The worker stops at its next event; wait for it so the report is not left mid-run
+            progress.cancel()
+            with contextlib.suppress(AnalysisCancelled):
+                await future
+            raise
+
+    def to_dict(self, plots: str = 'omit') -> dict:
+        """
+        The results as a plain document with a versioned schema (see `export.py`): no HTML, and
+        plots left out ('omit'), collected under `document['plots']` by id ('reference') or kept
+        in place ('inline').
+        """
+        if self.results is None:
+            self.analyse()
+        if plots != 'omit' and self._plot_specs:
+            self.render_plots()
+        with self._stage('export'):
+            return export_document(self.results, plots)
+
+    def to_json(self, path: str = None, plots: str = 'omit') -> bytes:
+        """
+        `to_dict()` as UTF-8 JSON (through orjson when installed), written to `path` if given.
+        """
+        return _write_bytes(dumps_json(self.to_dict(plots)), path)
+
+    def to_msgpack(self, path: str = None, plots: str = 'omit') -> bytes:
+        """
+        `to_dict()` as msgpack (requires msgpack), written to `path` if given.
+        """
+        return _write_bytes(dumps_msgpack(self.to_dict(plots)), path)
+
+    def stats_table(self, dataset: str = None) -> pd.DataFrame:
+        """
+        The per-column statistics as a table with one row per column and the same typed columns
+        for every dataset (see `export.stats_table`), tagged with `dataset`.
+        """
+        if self.results is None:
+            self.analyse()
+        return stats_table(self.results, dataset)
+
+    def to_parquet(self, path: str, dataset: str = None):
+        """
+        Write `stats_table(dataset)` to Parquet (requires pyarrow). Files of different datasets
+        share one schema, so a directory of them reads back as one table.
+        """
+        write_parquet(self.stats_table(dataset), path)
 
-    
     def _data_sample(self):
         
         head_10 = self.data.head(10).to_html()
@@ -182,8 +599,40 @@ class AnalysisReport:
         
         
         return sample_data
-    
-    
 
 
+def _write_bytes(payload: bytes, path):
+    if path is not None:
+        with open(path, 'wb') as file:
+            file.write(payload)
+    return payload
+
+
+def _partition_chunks(partition):
+    # DataFrame chunks of anything update() accepts
+    if is_arrow_dataset(partition):
+        return iter_dataset_chunks(partition)
+    if is_arrow_data(partition):
+        return [arrow_to_pandas(partition)]
+    if isinstance(partition, pd.DataFrame):
+        return [partition]
+    return partition
+
+
+def _analyze_column_job(job: tuple) -> dict:
+    """
+    Process-pool entry point: rebuild a single-column report and analyse it.
+    """
+    settings, column_data, column_name, state = job
+    report = AnalysisReport(column_data.to_frame(), settings)
+    for attribute, value in state.items():
+        setattr(report, attribute, value)
+    if report.recorder is None:
+        return report._analyze_column(column_data, column_name)
 
+    # Spans travel back with the result; hooks run once they reach the main process
+    report.recorder.emit_hooks = False
+    column_details = report._analyze_column(column_data, column_name)
+    report.recorder.close()
+    column_details['_spans'] = report.recorder.spans
+    return column_details
@@ -1,29 +1,143 @@
 import os
-from jinja2 import Environment, FileSystemLoader
-from colorama import Fore, Style, init
+import base64
+import hashlib
+import re
+from functools import lru_cache
+from colorama import Fore, init
+from .events import CONSOLE
 init(autoreset=True)  # This makes sure each print statement resets to the default color
 
+_IMAGE_DATA_URI = re.compile(r'data:image/(png|svg\+xml);base64,')
+_ASSET_EXTENSIONS = {'png': '.png', 'svg+xml': '.svg'}
+_SLOWEST_COLUMNS = 20  # Columns listed in the timings section
 
+# Appended to the page when the results carry instrumentation (`settings.instrument`)
+_PROFILE_SECTION = """
+<div class="section" id="profiling-timings" style="max-width: 1100px; margin: 2rem auto; font-family: sans-serif;">
+    <h2>Profiling Timings</h2>
+    <table style="border-collapse: collapse; width: 100%;">
+        <tr><th align="left">Stage</th><th align="right">Wall (s)</th><th align="right">CPU (s)</th><th align="right">Peak (MB)</th><th align="right">Calls</th></tr>
+        {% for stage, timing in stages %}
+        <tr><td>{{ stage }}</td><td align="right">{{ "%.3f"|format(timing.wall_s) }}</td><td align="right">{{ "%.3f"|format(timing.cpu_s) }}</td>
+            <td align="right">{{ "%.1f"|format(timing.peak_mb) if timing.peak_mb is not none else "-" }}</td><td align="right">{{ timing.calls }}</td></tr>
+        {% endfor %}
+    </table>
+    {% if columns %}
+    <h3>Slowest Columns</h3>
+    <table style="border-collapse: collapse; width: 100%;">
+        <tr><th align="left">Column</th><th align="right">Wall (s)</th>{% for stage in column_stages %}<th align="right">{{ stage }}</th>{% endfor %}</tr>
+        {% for column_name, total, timings in columns %}
+        <tr><td><code>{{ column_name }}</code></td><td align="right">{{ "%.3f"|format(total) }}</td>
+            {% for stage in column_stages %}<td align="right">{{ "%.3f"|format(timings[stage].wall_s) if stage in timings else "-" }}</td>{% endfor %}</tr>
+        {% endfor %}
+    </table>
+    {% endif %}
+</div>
+"""
+
+# Appended to the page, before any timings, when stages ran on a row sample (`settings.sampling`)
+_SAMPLING_SECTION = """
+<div class="section" id="sampling" style="max-width: 1100px; margin: 2rem auto; font-family: sans-serif;">
+    <h2>Sampling</h2>
+    <p>{{ stages|join(', ') }} computed on a {{ sampling.method }} sample{% if sampling.stratify_by %} (by <code>{{ sampling.stratify_by }}</code>){% endif %}
+        of {{ "{:,}".format(sampling.rows) }} of {{ "{:,}".format(sampling.total_rows) }} rows.
+        All other statistics (counts, missing values, moments, extremes, top values, Pearson correlations) use every row.</p>
+</div>
+"""
+_SAMPLED_STAGE_NAMES = {
+    'type_inference': 'Column types',
+    'plots': 'plots',
+    'text': 'word frequencies',
+    'correlations': "Spearman and Cramér's V correlations",
+}
+
+
+@lru_cache(maxsize=None)
+def _template_environment():
+    """
+    Jinja2 environment over the bundled templates, built once; it also caches compiled templates.
+    """
+    from jinja2 import Environment, FileSystemLoader  # Only needed when a report is written
 
-def generate_html_report(profile_dict, output_filename="report.html"):
-    # get the path to directory
-    script_dir = os.path.dirname(__file__)
-    
     # join the current directory path with 'templates' folder name (telling jinja2 where to find report.py)
-    template_dir = os.path.join(script_dir, 'templates')
-    
-    
-    env = Environment(loader= FileSystemLoader(template_dir))
-    
-    template = env.get_template("report.html")
-    
-    ''' html_content = template.render(overview=profile_dict['overview'],
-                                    variables=profile_dict['variables'],
-                                    sample_data= profile_dict['Sample_data']) '''
-                                    
-    html_content = template.render(profile=profile_dict)
-    
+    template_dir = os.path.join(os.path.dirname(__file__), 'templates')
+    return Environment(loader=FileSystemLoader(template_dir))
+
+
+def _externalize_assets(value, asset_dir: str, asset_url: str, written: set):
+    """
+    Copy of `value` with every inline image replaced by the URL of a file in `asset_dir`. Files are
+    named by content hash, so identical plots are written (and downloaded) only once.
+    """
+    if isinstance(value, dict):
+        return {key: _externalize_assets(item, asset_dir, asset_url, written) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_externalize_assets(item, asset_dir, asset_url, written) for item in value]
+    match = _IMAGE_DATA_URI.match(value) if isinstance(value, str) else None
+    if match:
+        image = base64.b64decode(value[match.end():])
+        name = hashlib.sha1(image).hexdigest()[:20] + _ASSET_EXTENSIONS[match.group(1)]
+        if name not in written:
+            with open(os.path.join(asset_dir, name), 'wb') as f:
+                f.write(image)
+            written.add(name)
+        return f"{asset_url}/{name}"
+    return value
+
+
+def _profile_section(profile: dict) -> str:
+    # Timings table for the instrumentation results, or '' without them
+    if not profile:
+        return ''
+    totals = {column_name: sum(timing['wall_s'] for timing in timings.values())
+              for column_name, timings in profile['columns'].items()}
+    slowest = sorted(totals, key=totals.get, reverse=True)[:_SLOWEST_COLUMNS]
+    column_stages = sorted({stage for timings in profile['columns'].values() for stage in timings})
+    return _template_environment().from_string(_PROFILE_SECTION).render(
+        stages=list(profile['stages'].items()), column_stages=column_stages,
+        columns=[(column_name, totals[column_name], profile['columns'][column_name]) for column_name in slowest])
+
+
+def _sampling_section(sampling: dict) -> str:
+    # Which sections came from the row sample, or '' when every row was used
+    if not sampling:
+        return ''
+    stages = [_SAMPLED_STAGE_NAMES[stage] for stage in sampling['stages']]
+    if stages:
+        stages[0] = stages[0][0].upper() + stages[0][1:]
+    return _template_environment().from_string(_SAMPLING_SECTION).render(sampling=sampling, stages=stages)
+
+
+def generate_html_report(profile_dict, output_filename="report.html", assets="inline", progress=None):
+    """
+    Render the profile to an HTML file, streaming the template output to disk.
+
+    Args:
+        assets: 'inline' embeds plot images in the page as base64; 'external' writes them as
+            deduplicated image files to a '<report name>_assets' folder next to the report, which
+            keeps the HTML small and lets the browser load images as needed.
+
+    Results computed partly on a row sample ('sampling') get a section saying which, and results
+    carrying instrumentation ('_profile') a timings section. The closing message goes to
+    `progress` (see `events.py`) instead of stdout when one is given.
+    """
+    if assets == 'external':
+        stem = os.path.splitext(os.path.basename(output_filename))[0]
+        asset_url = f"{stem}_assets"
+        asset_dir = os.path.join(os.path.dirname(os.path.abspath(output_filename)), asset_url)
+        os.makedirs(asset_dir, exist_ok=True)
+        profile_dict = _externalize_assets(profile_dict, asset_dir, asset_url, set())
+
+    template = _template_environment().get_template("report.html")
+    extra_sections = _sampling_section(profile_dict.get('sampling')) + _profile_section(profile_dict.get('_profile'))
+
+    # Written piece by piece as the template renders, never held as one string
     with open(output_filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        for piece in template.generate(profile=profile_dict):
+            if extra_sections and '</body>' in piece:
+                piece = piece.replace('</body>', extra_sections + '</body>', 1)
+                extra_sections = ''
+            f.write(piece)
+        f.write(extra_sections)
 
-    print(Fore.GREEN + f"Report successfully generated: {output_filename}" + Style.BRIGHT)
+    (progress or CONSOLE).message(f"Report successfully generated: {output_filename}", Fore.GREEN)
@@ -0,0 +1,144 @@
+# data_visualizer/sampling.py
+"""
+Row sampling for the stages whose cost grows with the row count but whose picture does not.
+
+With `settings.sampling` set, the stages in `settings.sample_stages` (type inference, plots,
+word frequencies, Spearman and Cramér's V) run on a sample of about `settings.sample_size` rows.
+Counts, missing values, moments, extremes and top values are still computed over every row.
+Results describe the sample under `results['sampling']`.
+
+A 'reservoir' sample keeps the rows with the smallest keys, where a row's key is a seeded hash of
+its index label and values. A table therefore gets the same sample however it is chunked, and
+the samples of partitions merge into the sample of the whole.
+"""
+import hashlib
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+_KEY_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)  # Odd, so multiplying permutes the 64-bit keys
+
+
+def _row_keys(frame: pd.DataFrame, seed: int) -> np.ndarray:
+    # Seeded permutation of the row hashes; the index keeps repeated rows apart
+    keys = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    keys = (keys ^ np.uint64(seed & 0xFFFFFFFFFFFFFFFF)) * _KEY_MULTIPLIER
+    return keys ^ (keys >> np.uint64(31))
+
+
+def _smallest(keys: np.ndarray, size: int) -> np.ndarray:
+    # Positions of the `size` smallest keys, in key order
+    if len(keys) > size:
+        positions = np.argpartition(keys, size - 1)[:size]
+    else:
+        positions = np.arange(len(keys))
+    return positions[np.argsort(keys[positions], kind='stable')]
+
+
+def _stratified_positions(strata: pd.Series, size: int, seed: int) -> np.ndarray:
+    # Proportional allocation (at least one row per stratum), random rows within each stratum
+    codes, _ = pd.factorize(strata, use_na_sentinel=False)
+    counts = np.bincount(codes)
+    quotas = np.minimum(np.maximum(np.round(counts * size / len(strata)), 1), counts).astype(np.int64)
+    order = np.lexsort((np.random.default_rng(seed).random(len(strata)), codes))
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(len(order)) - starts[codes[order]]
+    return order[rank < quotas[codes[order]]]
+
+
+def sample_positions(data: pd.DataFrame, settings) -> Optional[np.ndarray]:
+    """
+    Sorted row positions of `data`'s sample, or None when the stages should use every row
+    (sampling off, no sampled stages, or no more rows than `settings.sample_size`).
+    """
+    size, method = settings.sample_size, settings.sampling
+    if method == 'none' or not settings.sample_stages or len(data) <= size:
+        return None
+    if method == 'head':
+        return np.arange(size)
+    if method == 'uniform':
+        positions = np.random.default_rng(settings.sample_seed).choice(len(data), size, replace=False)
+    elif method == 'reservoir':
+        positions = _smallest(_row_keys(data, settings.sample_seed), size)
+    else:
+        if settings.sample_stratify_by is None:
+            raise ValueError("sampling='stratified' needs settings.sample_stratify_by")
+        positions = _stratified_positions(data[settings.sample_stratify_by], size, settings.sample_seed)
+    return np.sort(positions)
+
+
+def sample_digest(positions: np.ndarray) -> str:
+    """
+    Hash of the sampled positions, so cached results are tied to the rows they were computed on.
+    """
+    return hashlib.blake2b(np.ascontiguousarray(positions, dtype=np.int64).tobytes(), digest_size=16).hexdigest()
+
+
+def stage_rows(report_object, column_data: pd.Series, stage: str) -> pd.Series:
+    """
+    The rows of a column that `stage` runs on: the report's sample of it when the stage is
+    sampled, otherwise the column itself.
+    """
+    sample = getattr(report_object, 'sample', None)
+    if sample is None or stage not in report_object.settings.sample_stages or column_data.name not in sample:
+        return column_data
+    return sample[column_data.name]
+
+
+def sampling_summary(settings, sample_rows: int, total_rows: int, stages) -> dict:
+    """
+    What `results['sampling']` records about a sample.
+    """
+    return {
+        'method': settings.sampling,
+        'rows': int(sample_rows),
+        'total_rows': int(total_rows),
+        'stages': list(stages),
+        'stratify_by': settings.sample_stratify_by if settings.sampling == 'stratified' else None,
+        'seed': settings.sample_seed if settings.sampling != 'head' else None,
+    }
+
+
+class RowSample:
+    """
+    Mergeable sample of a chunked table: its first rows ('head'), or a reservoir of the rows
+    with the smallest keys ('uniform' and 'reservoir'). A stratified sample needs the whole
+    table's strata up front, so it cannot be built chunk by chunk.
+    """
+
+    def __init__(self, settings):
+        if settings.sampling == 'stratified':
+            raise ValueError("stratified sampling needs the whole table; use sampling='reservoir' "
+                             "for chunked or partitioned data")
+        self.size = settings.sample_size
+        self.method = settings.sampling
+        self.seed = settings.sample_seed
+        self.frame = None
+        self.keys = np.empty(0, dtype=np.uint64)
+
+    def update(self, chunk: pd.DataFrame):
+        if self.method == 'head':
+            if self.frame is None or len(self.frame) < self.size:
+                rows = chunk.head(self.size - (0 if self.frame is None else len(self.frame)))
+                self.frame = rows if self.frame is None else pd.concat([self.frame, rows])
+            return
+        keys = _row_keys(chunk, self.seed)
+        if self.frame is not None and len(self.keys) == self.size:
+            candidates = keys < self.keys.max()  # Only rows that can displace a kept one
+            chunk, keys = chunk[candidates], keys[candidates]
+        self._keep(chunk, keys)
+
+    def merge(self, other: "RowSample"):
+        if other.frame is None:
+            return self
+        if self.method == 'head':
+            self.update(other.frame)
+        else:
+            self._keep(other.frame, other.keys)
+        return self
+
+    def _keep(self, rows: pd.DataFrame, keys: np.ndarray):
+        if self.frame is not None:
+            rows, keys = pd.concat([self.frame, rows]), np.concatenate([self.keys, keys])
+        kept = _smallest(keys, self.size)
+        self.frame, self.keys = rows.iloc[kept], keys[kept]
@@ -1,4 +1,5 @@
 # data_visualizer/settings.py
+from typing import List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
 class Settings(BaseModel):
@@ -12,14 +13,56 @@ class Settings(BaseModel):
     outlier_threshold: float = Field(default=1.5, ge=0.0)
     duplicate_threshold: float = Field(default=5.0, ge=0.0)  # % of rows duplicated to trigger alert
     text_analysis: bool = True  # Enable/disable text analysis
+    text_tokenizer: str = Field(default='whitespace', pattern='^(whitespace|word)$')  # 'whitespace' = str.split(), 'word' = runs of word characters
+    text_lowercase: bool = False  # Lowercase text before counting words
+    text_stopwords: Optional[Union[Literal['english'], List[str]]] = None  # None, 'english' or a list of words to skip
+    text_top_k: int = Field(default=10, ge=1)  # Words kept in word_frequencies (and the word cloud)
+    text_counter_capacity: int = Field(default=10_000, ge=10)  # Word counters kept; counts are approximate beyond this many distinct words
     use_plotly: bool = False  # Toggle Plotly vs. seaborn plots
     include_plots: bool = True  # Toggle plots/visualizations
+    plot_dpi: int = Field(default=100, ge=10)  # Resolution of matplotlib plots
+    plot_format: str = Field(default='png', pattern='^(png|svg)$')  # Image format of matplotlib plots
+    render_backend: Optional[str] = Field(default=None, pattern='^(serial|thread|process)$')  # How plots are rendered (None = same as execution_backend); matplotlib/seaborn plots draw one at a time per process, so only 'process' renders them in parallel
+    defer_plots: bool = False  # analyse() returns stats with empty plot slots; render_plots() (or to_html()) draws them
+    overlap_plots: bool = False  # Draw each column's plots while later columns are analysed (with threads, one plot at a time alongside the analysis; 'process' draws several at once)
+    instrument: bool = False  # Record per-stage and per-column wall/CPU time under results['_profile'] and send spans to hooks
+    instrument_memory: bool = False  # With instrument, also record each span's peak traced allocations (tracemalloc; slows the run)
     include_correlations : bool = True  # Toggle correlation analysis
     include_correlations_plots: bool = True  # Toggle correlation analysis/heatmaps
     include_correlations_json: bool = False  # Toggle correlation JSON data
+    correlations_top_k: Optional[int] = Field(default=None, ge=1)  # Correlations_JSON lists only the k strongest pairs per matrix instead of the full matrix
+    correlations_min_abs: Optional[float] = Field(default=None, ge=0.0, le=1.0)  # Correlations_JSON lists only pairs with |value| >= this instead of the full matrix
+    heatmap_max_annotated: int = Field(default=20, ge=0)  # Variables up to which heatmaps annotate every cell; larger matrices are drawn as one raster image
+    heatmap_top_n: Optional[int] = Field(default=None, ge=2)  # Heatmaps show only the N variables most correlated with any other (None = all)
+    heatmap_order: str = Field(default='original', pattern='^(original|cluster)$')  # 'cluster' orders heatmap variables by hierarchical clustering
     include_alerts: bool = True  # Toggle alerts (column and dataset-level)
     include_sample_data: bool = True  # Toggle head/tail samples
     include_overview: bool = True  # Toggle overview stats (core, but customizable)
+    execution_backend: str = Field(default='serial', pattern='^(serial|thread|process|dask)$')  # How columns are analysed ('dask' = on the active Dask scheduler)
+    n_workers: Optional[int] = Field(default=None, ge=1)  # Workers for thread/process backends; dask submits twice this many tasks at a time (None = all CPUs)
+    dask_split_every: int = Field(default=8, ge=2)  # Partition states merged per task in the reduction tree of a Dask DataFrame
+    approximate: bool = False  # Use bounded-memory sketches for distinct counts, top-N values and quantiles
+    sketch_capacity: int = Field(default=1000, ge=10)  # Counters kept by top-N (heavy hitter) sketches
+    hll_precision: int = Field(default=14, ge=4, le=18)  # HyperLogLog precision; error ~1.04/sqrt(2**p)
+    quantile_sketch_k: int = Field(default=200, ge=8)  # KLL quantile sketch size; rank error ~1.65/k
+    cache_dir: Optional[str] = None  # Directory for the persistent per-column result cache (None = disabled)
+    cache_max_bytes: int = Field(default=1 << 30, ge=0)  # Cache size before least-recently-used entries are evicted
+    cramers_v_max_categories: Optional[int] = Field(default=None, ge=2)  # Categories per column in Cramér's V tables; the rest are lumped together (None = all)
+    type_inference: str = Field(default='complete', pattern='^(complete|fast)$')  # 'fast' maps dtypes directly and samples object columns
+    typeset: str = Field(default='complete', pattern='^(complete|standard)$')  # visions typeset; 'standard' skips URL/path/file/image/geometry types
+    type_inference_sample_size: int = Field(default=1000, ge=1)  # Values sampled per object column by fast inference
+    duplicate_subset: Optional[List[str]] = None  # Columns that identify a duplicate row (None = all columns)
+    duplicate_chunksize: Optional[int] = Field(default=None, ge=1)  # Hash rows for duplicate detection this many at a time (None = all at once)
+    max_duplicate_indices: Optional[int] = Field(default=100, ge=0)  # Duplicate row labels listed in the overview (None = all)
+    streaming_duplicates: str = Field(default='exact', pattern='^(exact|approximate|off)$')  # Duplicate rows of chunked, updated, merged and Dask reports: 'exact' keeps 8 bytes per distinct row, 'approximate' estimates the count from a fixed-size HyperLogLog of row hashes, 'off' skips them
+    include_missingness: bool = True  # Toggle the missingness-pattern section (co-missing pairs, common null patterns)
+    missing_patterns_top_n: int = Field(default=10, ge=1)  # Null patterns and co-missing pairs listed
+    report_assets: str = Field(default='inline', pattern='^(inline|external)$')  # 'external' writes plot images to deduplicated files beside the HTML report
+    sampling: str = Field(default='none', pattern='^(none|head|uniform|reservoir|stratified)$')  # Rows the sample_stages run on: all, the first, a uniform random, a mergeable reservoir or a stratified sample
+    sample_size: int = Field(default=100_000, ge=1)  # Rows in the sample (stratified: about this many)
+    sample_stratify_by: Optional[str] = None  # Column whose values are sampled proportionally (sampling='stratified')
+    sample_stages: List[Literal['type_inference', 'plots', 'text', 'correlations']] = ['type_inference', 'plots', 'text', 'correlations']  # Stages run on the sample; all other stats use every row
+    sample_seed: int = 0  # Seed of the random sampling methods
     
 
     class Config:
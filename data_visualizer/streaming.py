@@ -0,0 +1,353 @@
+# data_visualizer/streaming.py
+"""
+Chunked, incremental and partitioned profiling.
+
+Every statistic is kept in a mergeable accumulator that is updated one chunk at a time, so
+the data is never held in full. Memory is one chunk plus fixed-size sketches, plus, for exact
+duplicate counts, the distinct row hashes seen so far: 8 bytes per distinct row, which grow
+with the table (and travel with saved and merged states). `settings.streaming_duplicates`
+trades them for a fixed-size HyperLogLog estimate ('approximate') or drops the duplicate
+count ('off'). Figures that would need the full data to be exact (quantiles, distinct counts,
+top values once a column has more distinct values than the sketch capacity) come from
+sketches and are listed under each column's `approximate_fields`; an estimated duplicate
+count is listed under the overview's.
+
+The accumulators of a dataset make up a `ProfileState`, which can be saved, loaded, extended
+with new rows and merged with the state of another partition of the same table.
+"""
+import glob
+import os
+import pickle
+import pandas as pd
+from .accumulators import NumericAccumulator, ValueAccumulator, BooleanAccumulator, PearsonAccumulator
+from .missingness import MissingnessAccumulator
+from .duplicates import RowHashIndex, hash_rows, MAX_DUPLICATE_SAMPLES
+from .type_registry import get_analyzer
+from .type_inference import infer_column_type
+from .type_analyzers import _analyse_numeric, _analyse_category, _analyse_boolean, _analyse_string, _analyse_generic
+from .alerts import generate_alerts, generate_dataset_alerts
+from .visualizer import summary_plot_spec
+from .cache import settings_fingerprint
+from .sampling import RowSample, sampling_summary
+from .correlations import calculate_correlations
+from .sketches import HyperLogLog
+from .events import progress_bar
+
+STATE_FORMAT_VERSION = 3
+
+
+def iter_file_chunks(path: str, chunksize: int = 100_000, **read_kwargs):
+    """
+    Yield DataFrame chunks from a CSV file, a Parquet file or a directory of Parquet files.
+    """
+    if os.path.isdir(path) or path.endswith(('.parquet', '.pq')):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Reading Parquet in chunks requires pyarrow: pip install pyarrow") from exc
+
+        files = sorted(glob.glob(os.path.join(path, '**', '*.parquet'), recursive=True)) if os.path.isdir(path) else [path]
+        for file in files:
+            for batch in pq.ParquetFile(file).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, **read_kwargs)
+
+
+def _accumulator_for(analyzer, settings):
+    if analyzer is _analyse_numeric:
+        return NumericAccumulator(settings)
+    if analyzer is _analyse_boolean:
+        return BooleanAccumulator(settings)
+    return ValueAccumulator(settings, track_words=analyzer is _analyse_string and settings.text_analysis)
+
+
+def _row_hash_summary(settings):
+    # What duplicate rows are counted from: every distinct row hash, a HyperLogLog of them, or nothing
+    if not settings.include_overview or settings.streaming_duplicates == 'off':
+        return None
+    if settings.streaming_duplicates == 'approximate':
+        return HyperLogLog(settings.hll_precision)
+    return RowHashIndex()
+
+
+class ProfileState:
+    """
+    Serializable, mergeable profile of a dataset: per-column accumulators plus dataset-wide
+    missingness, duplicate-row hashes, correlation statistics and head/tail samples.
+
+    `update()` adds a chunk of rows (O(rows in the chunk)); `merge()` adds the state of another
+    partition of the same table, so e.g. a year of daily partitions is profiled by merging 365
+    saved states rather than rescanning the data.
+    """
+
+    def __init__(self, settings):
+        self.version = STATE_FORMAT_VERSION
+        self.settings = settings
+        self.num_rows = 0
+        self.columns = None
+        self.dtypes = {}
+        self.missing = {}
+        self.missingness = None
+        self.analyzers = {}
+        self.accumulators = {}
+        self.row_hashes = _row_hash_summary(settings)  # None when duplicates are not counted
+        self.duplicate_indices = []
+        self.duplicate_samples = []
+        self.head = None
+        self.tail = None
+        self.correlations = None
+        # Spearman and Cramér's V need raw rows: with sampled correlations, a mergeable sample of them
+        self.sample = None
+        if settings.include_correlations and settings.sampling != 'none' and 'correlations' in settings.sample_stages:
+            self.sample = RowSample(settings)
+
+    @classmethod
+    def typed_from(cls, frame: pd.DataFrame, settings) -> "ProfileState":
+        """
+        An empty state whose column types are inferred from `frame` (its rows are not counted).
+        States of different partitions updated from copies of it always merge.
+        """
+        state = cls(settings)
+        state._init_columns(frame)
+        return state
+
+    def _init_columns(self, chunk: pd.DataFrame):
+        # Column types are inferred from the first chunk and kept for the rest of the stream
+        self.columns = list(chunk.columns)
+        for column_name in self.columns:
+            self.dtypes[column_name] = str(chunk[column_name].dtype)
+            self.missing[column_name] = 0
+            if not self.settings.minimal:
+                inferred_type = infer_column_type(chunk[column_name], self.settings)
+                analyzer = get_analyzer(inferred_type, _analyse_generic)
+                self.analyzers[column_name] = analyzer
+                self.accumulators[column_name] = _accumulator_for(analyzer, self.settings)
+        self.head = chunk.head(10)
+        if self.settings.include_missingness:
+            self.missingness = MissingnessAccumulator(self.columns, self.settings.sketch_capacity)
+        if self.settings.include_correlations:
+            self.correlations = PearsonAccumulator(chunk.select_dtypes(include='number').columns)
+
+    def consume(self, chunks, progress=None) -> "ProfileState":
+        """
+        Update the state with every chunk, reporting each to `progress` (see `events.py`).
+        """
+        bar = progress_bar(progress, 'chunks', None, "Profiling chunks", "chunk")
+        try:
+            for number, chunk in enumerate(chunks):
+                self.update(chunk)
+                bar.update(number)
+        finally:
+            bar.close()
+        return self
+
+    def update(self, chunk: pd.DataFrame):
+        if self.columns is None:
+            self._init_columns(chunk)
+
+        null_mask = chunk[self.columns].isna().to_numpy()
+        for column_name, missing in zip(self.columns, null_mask.sum(axis=0)):
+            self.missing[column_name] += int(missing)
+        if self.missingness is not None:
+            self.missingness.update(null_mask)
+        for column_name, accumulator in self.accumulators.items():
+            accumulator.update(chunk[column_name])
+        if self.correlations is not None:
+            self.correlations.update(chunk)
+        if self.sample is not None:
+            self.sample.update(chunk)
+
+        if isinstance(self.row_hashes, HyperLogLog):
+            self.row_hashes.update_hashes(hash_rows(chunk, self.settings.duplicate_subset))
+        elif self.row_hashes is not None:
+            duplicated = self.row_hashes.add(hash_rows(chunk, self.settings.duplicate_subset))
+            if duplicated.any():
+                max_indices = self.settings.max_duplicate_indices
+                room = len(duplicated) if max_indices is None else max_indices - len(self.duplicate_indices)
+                if room > 0:
+                    self.duplicate_indices.extend(chunk.index[duplicated][:room].tolist())
+                if len(self.duplicate_samples) < MAX_DUPLICATE_SAMPLES:
+                    self.duplicate_samples.extend(chunk[duplicated].head(MAX_DUPLICATE_SAMPLES - len(self.duplicate_samples)).to_dict('records'))
+
+        self.tail = pd.concat([self.tail, chunk.tail(10)]).tail(10) if self.tail is not None else chunk.tail(10)
+        self.num_rows += len(chunk)
+
+    def merge(self, other: "ProfileState") -> "ProfileState":
+        """
+        Add another state of the same table (same columns and result settings), as if its rows
+        had been appended to this one's.
+        """
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(pickle.loads(pickle.dumps(other.__dict__)))  # Independent copy
+            return self
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge profile states with different columns")
+        if settings_fingerprint(other.settings) != settings_fingerprint(self.settings):
+            raise ValueError("Cannot merge profile states built with different settings")
+
+        for column_name in self.columns:
+            self._merge_column(column_name, other)
+            self.missing[column_name] += other.missing[column_name]
+        if self.missingness is not None and other.missingness is not None:
+            self.missingness.merge(other.missingness)
+        else:
+            self.missingness = None
+        if self.correlations is not None and other.correlations is not None:
+            self.correlations.merge(other.correlations)
+        else:
+            self.correlations = None
+        if self.sample is not None:
+            self.sample.merge(other.sample)
+
+        if self.row_hashes is not None:
+            self.row_hashes.merge(other.row_hashes)
+        max_indices = self.settings.max_duplicate_indices
+        room = len(other.duplicate_indices) if max_indices is None else max_indices - len(self.duplicate_indices)
+        self.duplicate_indices.extend(other.duplicate_indices[:max(room, 0)])
+        self.duplicate_samples.extend(other.duplicate_samples[:MAX_DUPLICATE_SAMPLES - len(self.duplicate_samples)])
+        self.tail = pd.concat([self.tail, other.tail]).tail(10)
+        self.num_rows += other.num_rows
+        return self
+
+    def _merge_column(self, column_name, other: "ProfileState"):
+        if column_name not in self.accumulators:  # Minimal mode keeps only counts
+            return
+        accumulator, other_accumulator = self.accumulators[column_name], other.accumulators[column_name]
+        if type(accumulator) is type(other_accumulator):
+            accumulator.merge(other_accumulator)
+        elif self.missing[column_name] == self.num_rows:
+            # All-null so far (typed from nothing): the other side's type and values win
+            self.analyzers[column_name] = other.analyzers[column_name]
+            self.accumulators[column_name] = pickle.loads(pickle.dumps(other_accumulator))
+        elif other.missing[column_name] != other.num_rows:
+            raise ValueError(f"Column {column_name!r} was profiled as {self.analyzers[column_name].__name__} "
+                             f"in one state and {other.analyzers[column_name].__name__} in the other")
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> "ProfileState":
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if not isinstance(state, cls) or getattr(state, 'version', None) != STATE_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a profile state of this version")
+        return state
+
+    def finalize(self) -> dict:
+        settings = self.settings
+        final_results = {}
+        num_columns = len(self.columns or [])
+
+        if settings.include_overview:
+            total_missing = sum(self.missing.values())
+            overview_stats = {
+                'num_Row': self.num_rows,
+                'num_Columns': num_columns,
+            }
+            if self.row_hashes is not None:
+                if isinstance(self.row_hashes, HyperLogLog):
+                    num_duplicates = max(self.num_rows - self.row_hashes.estimate(), 0)
+                else:
+                    num_duplicates = self.num_rows - len(self.row_hashes)
+                overview_stats['duplicated_rows'] = int(num_duplicates)
+                overview_stats['duplicate_percentage'] = float(num_duplicates / self.num_rows * 100) if self.num_rows > 0 else 0.0
+            overview_stats.update({
+                'duplicate_indices': self.duplicate_indices,
+                'duplicate_samples': self.duplicate_samples,
+                'missing_values': int(total_missing),
+                'missing_percentage': float(total_missing / (self.num_rows * num_columns) * 100) if self.num_rows * num_columns > 0 else 0.0,
+            })
+            if isinstance(self.row_hashes, HyperLogLog):
+                overview_stats['approximate_fields'] = ['duplicated_rows', 'duplicate_percentage']
+            if settings.include_alerts:
+                overview_stats['alerts'] = generate_dataset_alerts(
+                    {'duplicate_percentage': overview_stats.get('duplicate_percentage')}, settings=settings
+                )
+            final_results['overview'] = overview_stats
+
+        if self.missingness is not None:
+            final_results['missingness'] = self.missingness.finalize(settings.missing_patterns_top_n)
+
+        variable_stats = {}
+        for column_name in self.columns or []:
+            missing_vals = self.missing[column_name]
+            column_details = {
+                'Data_type': self.dtypes[column_name],
+                'missing_values': int(missing_vals),
+                'missing_%': float(missing_vals / self.num_rows * 100) if self.num_rows > 0 else 0.0,
+            }
+
+            if not settings.minimal:
+                column_details.update(self._finalize_column(column_name))
+
+            if settings.include_alerts:
+                column_details['alerts'] = generate_alerts(column_details, settings=settings)
+            variable_stats[column_name] = column_details
+
+        final_results['variables'] = variable_stats
+
+        if self.sample is not None and self.sample.frame is not None and len(self.sample.frame) < self.num_rows:
+            final_results['sampling'] = sampling_summary(settings, len(self.sample.frame), self.num_rows, ['correlations'])
+
+        if settings.include_sample_data and self.head is not None:
+            final_results['Sample_data'] = {'Head': self.head.to_html(), 'Tail': self.tail.to_html()}
+
+        return final_results
+
+    def correlation_matrices(self, progress=None) -> dict:
+        """
+        Correlation matrices computable from the state: Pearson from its exact sums, plus
+        Spearman and Cramér's V from the row sample when correlations are sampled (rank and
+        contingency based measures need raw rows).
+        """
+        if self.correlations is None:
+            return {}
+        matrices = {'pearson': self.correlations.finalize()}
+        if self.sample is not None and self.sample.frame is not None:
+            on_sample = calculate_correlations(self.sample.frame, settings=self.settings, progress=progress)
+            matrices.update(spearman=on_sample['spearman'], cramers_v=on_sample['cramers_v'])
+        return matrices
+
+    def _finalize_column(self, column_name) -> dict:
+        settings = self.settings
+        analyzer = self.analyzers[column_name]
+        accumulator = self.accumulators[column_name]
+        if isinstance(accumulator, ValueAccumulator):
+            unique_key = 'unique_values' if analyzer is _analyse_category else 'num_unique'
+            column_details, approximate_fields = accumulator.finalize(self.num_rows, settings, unique_key,
+                                                                      generic=analyzer is _analyse_generic)
+        else:
+            column_details, approximate_fields = accumulator.finalize(self.num_rows, settings)
+
+        if settings.include_plots:
+            # Drawn later by the rendering stage, like the in-memory report's plots
+            plot_specs = {}
+            if isinstance(accumulator, NumericAccumulator):
+                histogram = accumulator.histogram()
+                if histogram is not None:
+                    plot_specs['plot'] = summary_plot_spec(column_name, histogram=histogram)
+                    approximate_fields.append('plot')
+            elif isinstance(accumulator, BooleanAccumulator):
+                plot_specs['plot'] = summary_plot_spec(column_name, value_counts=column_details['value_counts'])
+            elif analyzer is not _analyse_generic:
+                word_frequencies = column_details.get('word_frequencies')
+                value_counts = column_details['value_counts_top_n']
+                if word_frequencies:
+                    plot_specs['plot'] = summary_plot_spec(column_name, word_frequencies=word_frequencies)
+                    plot_specs['plot_bar'] = summary_plot_spec(column_name, value_counts=value_counts)
+                else:
+                    plot_specs['plot'] = summary_plot_spec(column_name, value_counts=value_counts)
+            if plot_specs:
+                column_details.update(dict.fromkeys(plot_specs))
+                column_details['plot_specs'] = plot_specs
+
+        column_details.pop('word_frequencies', None)
+        column_details['approximate'] = bool(approximate_fields)
+        column_details['approximate_fields'] = approximate_fields
+        return column_details
+
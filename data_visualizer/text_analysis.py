@@ -0,0 +1,82 @@
+# data_visualizer/text_analysis.py
+"""
+Chunked tokenization and bounded-memory word counting for string columns.
+
+Text is tokenized a slice of rows at a time with vectorized `str` methods, and token counts go
+into a heavy-hitters summary, so memory stays flat regardless of how much text a column holds.
+"""
+from functools import lru_cache
+import pandas as pd
+from .sketches import HeavyHitters
+from .arrow_data import is_arrow_backed, token_counts
+
+TEXT_CHUNK_ROWS = 10_000  # Rows tokenized at a time (bounds the exploded token Series)
+_WORD_PATTERN = r'\w+'
+
+
+@lru_cache(maxsize=None)
+def _english_stopwords() -> frozenset:
+    # The word-cloud dependency ships a standard English list; only loaded when asked for
+    from wordcloud import STOPWORDS
+    return frozenset(STOPWORDS)
+
+
+def resolve_stopwords(settings) -> frozenset:
+    if settings.text_stopwords is None:
+        return frozenset()
+    if isinstance(settings.text_stopwords, str):
+        return _english_stopwords()
+    return frozenset(word.lower() for word in settings.text_stopwords)
+
+
+def tokenize(values: pd.Series, settings, stopwords: frozenset = frozenset()) -> pd.Series:
+    """
+    Tokens of a slice of (non-null) values as one flat Series.
+
+    'whitespace' splits on runs of whitespace, exactly like `str.split()`; 'word' keeps runs of
+    word characters, dropping punctuation.
+    """
+    text = values.astype(str)
+    if settings.text_lowercase:
+        text = text.str.lower()
+    if settings.text_tokenizer == 'word':
+        tokens = text.str.findall(_WORD_PATTERN)
+    else:
+        tokens = text.str.split()
+    tokens = tokens.explode().dropna()
+    if stopwords:
+        tokens = tokens[~tokens.str.lower().isin(stopwords)]
+    return tokens
+
+
+class TokenCounter:
+    """
+    Mergeable token frequencies holding at most `text_counter_capacity` counters; exact while
+    the vocabulary fits, Space-Saving approximate beyond that.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.stopwords = resolve_stopwords(settings)
+        self.counts = HeavyHitters(settings.text_counter_capacity)
+
+    def update(self, values: pd.Series):
+        # Arrow-backed text is split on its own buffers; only distinct tokens become Python strings
+        native = is_arrow_backed(values) and self.settings.text_tokenizer == 'whitespace'
+        for start in range(0, len(values), TEXT_CHUNK_ROWS):
+            chunk = values.iloc[start:start + TEXT_CHUNK_ROWS]
+            if native:
+                self.counts.update_counts(token_counts(chunk, self.settings.text_lowercase, self.stopwords))
+            else:
+                self.counts.update_counts(tokenize(chunk, self.settings, self.stopwords).value_counts(sort=False))
+
+    def merge(self, other: "TokenCounter"):
+        self.counts.merge(other.counts)
+        return self
+
+    @property
+    def is_exact(self) -> bool:
+        return self.counts.is_exact
+
+    def top(self, n: int = None) -> dict:
+        return self.counts.top(n or self.settings.text_top_k)
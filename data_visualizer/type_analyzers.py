@@ -1,9 +1,13 @@
 import pandas as pd
 import numpy as np
-from visions.typesets import VisionsTypeset  #used to get the types
-from visions.types import Numeric, Boolean, Categorical, String, Object, Float, Integer
 from .type_registry import register_analyzer
-from collections import Counter
+from .numeric_stats import compute_numeric_stats
+from .accumulators import ValueAccumulator
+from .text_analysis import TokenCounter
+from .arrow_data import is_arrow_backed, value_stats
+from .sampling import stage_rows
+
+SKETCH_CHUNK_ROWS = 100_000  # Rows per value_counts() call in approximate mode
 
 
 
@@ -13,15 +17,16 @@ from collections import Counter
     Args:
         column_data: pandas Series with numeric data
         threshold: IQR multiplier (e.g., 1.5 for standard bounds)
+        return_mask: also return the boolean outlier mask (only needed for plot highlighting)
     
     Returns:
-        Dict with outlier_count, outlier_percentage, and outliers list
+        Dict with outlier_count, outlier_percentage and, if requested, outlier_mask
     '''
 
-def _detect_outliers_iqr(column_data: pd.Series, threshold: float) -> dict:
+def _detect_outliers_iqr(column_data: pd.Series, threshold: float, return_mask: bool = False) -> dict:
     
     if column_data.empty or not pd.api.types.is_numeric_dtype(column_data):
-        return {'outlier_count': 0, 'outlier_percentage': 0.0, 'outliers': []}
+        return {'outlier_count': 0, 'outlier_percentage': 0.0}
     
     Q1 = column_data.quantile(0.25)
     Q3 = column_data.quantile(0.75)
@@ -29,22 +34,58 @@ def _detect_outliers_iqr(column_data: pd.Series, threshold: float) -> dict:
     lower_bound = Q1 - threshold * IQR
     upper_bound = Q3 + threshold * IQR
     
-    outlier_mask = (column_data < lower_bound) | (column_data > upper_bound)
-    outlier_indices = column_data[outlier_mask].index.tolist()
-    outlier_count = len(outlier_indices)
+    return _outlier_stats(column_data, lower_bound, upper_bound, return_mask)
+
+
+def _outlier_stats(column_data: pd.Series, lower_bound: float, upper_bound: float, return_mask: bool) -> dict:
+    # Positional boolean mask: no index labels are materialised, and it is only kept for plotting
+    outlier_mask = ((column_data < lower_bound) | (column_data > upper_bound)).to_numpy(dtype=bool, na_value=False)
+    outlier_count = int(outlier_mask.sum())
     total_count = len(column_data)
-    outlier_percentage = (outlier_count / total_count * 100) if total_count > 0 else 0.0
-    
-    return {
+    outlier_info = {
         'outlier_count': outlier_count,
-        'outlier_percentage': outlier_percentage,
-        'outlier_indices': outlier_indices  # For graph highlighting only
+        'outlier_percentage': (outlier_count / total_count * 100) if total_count > 0 else 0.0,
     }
+    if return_mask:
+        outlier_info['outlier_mask'] = outlier_mask  # For graph highlighting only
+    return outlier_info
+
+def _shared_null_mask(report_object, column_data: pd.Series):
+    # The report's precomputed nullity mask for this column, so isna() is not recomputed
+    nullity = getattr(report_object, 'nullity', None)
+    if nullity is not None and column_data.name in nullity and len(nullity.mask) == len(column_data):
+        return nullity.column(column_data.name)
+    return None
 
-@register_analyzer(Float)
-@register_analyzer(Integer)
-@register_analyzer(Numeric)
+
+def _non_null(report_object, column_data: pd.Series) -> pd.Series:
+    null_mask = _shared_null_mask(report_object, column_data)
+    return column_data.dropna() if null_mask is None else column_data[~null_mask]
+
+
+@register_analyzer('Float')
+@register_analyzer('Integer')
+@register_analyzer('Numeric')
 def _analyse_numeric(report_object, column_data):
+    threshold = report_object.settings.outlier_threshold
+
+    # Numeric-dtype columns are summarised up front in one batched pass (see numeric_stats.py)
+    precomputed = getattr(report_object, 'numeric_stats', {}).get(column_data.name)
+    if precomputed is None and pd.api.types.is_numeric_dtype(column_data) and not pd.api.types.is_bool_dtype(column_data):
+        quantile_sketch_k = report_object.settings.quantile_sketch_k if report_object.settings.approximate else None
+        precomputed = compute_numeric_stats(column_data.to_frame(), threshold, quantile_sketch_k).get(column_data.name)
+
+    if precomputed is not None:
+        numeric_stats = dict(precomputed)
+        lower_bound, upper_bound = numeric_stats.pop('outlier_bounds')
+        if report_object.settings.include_plots:
+            plot_rows = stage_rows(report_object, column_data, 'plots')  # The mask highlights the plotted rows
+            numeric_stats['outlier_mask'] = _outlier_stats(plot_rows, lower_bound, upper_bound, return_mask=True)['outlier_mask']
+        return numeric_stats
+
+    # Values that visions coerces to numbers (e.g. numeric strings) keep the per-column path
+    if is_arrow_backed(column_data):
+        column_data = column_data.astype(object)  # pandas only coerces object values in skew/kurt
     numeric_stats = column_data.describe().to_dict()
     
     # calculate skewness in data and add it
@@ -54,23 +95,49 @@ def _analyse_numeric(report_object, column_data):
     numeric_stats['kurtosis'] = float(column_data.kurt()) if not pd.isna(column_data.kurt()) else 0.0
         
     # Add outlier detection using settings threshold
-    outlier_info = _detect_outliers_iqr(column_data, report_object.settings.outlier_threshold)
+    outlier_info = _detect_outliers_iqr(column_data, threshold, return_mask=report_object.settings.include_plots)
     numeric_stats.update(outlier_info)
     
     return numeric_stats
 
 
-@register_analyzer(Object)
-@register_analyzer(Categorical)
+def _analyse_values_approximately(report_object, column_data, unique_key: str, track_words: bool = False, generic: bool = False) -> dict:
+    """
+    Sketch-based replacement for nunique/mode/value_counts: the column is fed to a
+    HyperLogLog + heavy-hitters accumulator in slices, so no hash table ever holds
+    more than one slice's distinct values.
+    """
+    accumulator = ValueAccumulator(report_object.settings, track_words=track_words)
+    for start in range(0, len(column_data), SKETCH_CHUNK_ROWS):
+        accumulator.update(column_data.iloc[start:start + SKETCH_CHUNK_ROWS])
+
+    stats, approximate_fields = accumulator.finalize(len(column_data), report_object.settings, unique_key, generic=generic)
+    stats['approximate'] = bool(approximate_fields)
+    stats['approximate_fields'] = approximate_fields
+    if not generic:
+        stats['plot_value_counts'] = accumulator.values.top(10)  # For the bar chart only
+    return stats
+
+
+@register_analyzer('Object')
+@register_analyzer('Categorical')
 def _analyse_category(report_object,column_data):
     
+    if report_object.settings.approximate:
+        return _analyse_values_approximately(report_object, column_data, 'unique_values')
+
+    if is_arrow_backed(column_data):
+        return _analyse_arrow_values(report_object, column_data, 'unique_values')
+
     categorical_stats={}
     
     num_unique = column_data.nunique()
     categorical_stats['unique_values'] = num_unique
     
     # Safe handling of mode for empty or all-null columns
-    if not column_data.empty and column_data.dropna().shape[0] > 0:
+    null_mask = _shared_null_mask(report_object, column_data)
+    has_values = column_data.notna().any() if null_mask is None else not null_mask.all()
+    if not column_data.empty and has_values:
         categorical_stats['most_frequent'] = column_data.mode().iloc[0]
     else:
         categorical_stats['most_frequent'] = None
@@ -85,7 +152,7 @@ def _analyse_category(report_object,column_data):
 
     return categorical_stats
 
-@register_analyzer(Boolean)
+@register_analyzer('Boolean')
 def _analyse_boolean(report_object,column_data):
     value_counts = column_data.value_counts().to_dict()
     
@@ -96,8 +163,18 @@ def _analyse_boolean(report_object,column_data):
     return bool_stats
 
 
-@register_analyzer(String)
+@register_analyzer('String')
 def _analyse_string(report_object, column_data: pd.Series) -> dict:
+    if report_object.settings.approximate:
+        return _analyse_values_approximately(report_object, column_data, 'num_unique',
+                                             track_words=report_object.settings.text_analysis)
+
+    if is_arrow_backed(column_data):
+        string_stats = _analyse_arrow_values(report_object, column_data, 'num_unique')
+        if report_object.settings.text_analysis:
+            string_stats.update(_word_frequencies(report_object, column_data))
+        return string_stats
+
     string_stats = {
         'num_unique': column_data.nunique(),
         'most_frequent': column_data.mode().iloc[0] if not column_data.empty else None,
@@ -106,13 +183,43 @@ def _analyse_string(report_object, column_data: pd.Series) -> dict:
     }
 
     if report_object.settings.text_analysis:
-        words = ' '.join(column_data.dropna().astype(str)).split()
-        word_freq = Counter(words).most_common(10)
-        string_stats['word_frequencies'] = dict(word_freq)
+        string_stats.update(_word_frequencies(report_object, column_data))
 
     return string_stats
 
+
+def _word_frequencies(report_object, column_data: pd.Series) -> dict:
+    # Tokenized in slices into a bounded counter, never one giant joined string
+    column_data = stage_rows(report_object, column_data, 'text')
+    word_counter = TokenCounter(report_object.settings)
+    word_counter.update(_non_null(report_object, column_data))
+    stats = {'word_frequencies': word_counter.top()}
+    if not word_counter.is_exact:
+        stats['approximate'] = True
+        stats['approximate_fields'] = ['word_frequencies']
+    return stats
+
+
+def _analyse_arrow_values(report_object, column_data: pd.Series, unique_key: str) -> dict:
+    """
+    nunique/mode/value_counts of an Arrow-backed string column from a single native pass
+    (same results as the pandas path). The top 10 also feed the bar chart.
+    """
+    top_n = report_object.settings.top_n_values
+    stats = value_stats(column_data, max(top_n, 10))
+    top_counts = stats['value_counts_top_n']
+    return {
+        unique_key: stats['num_unique'],
+        'most_frequent': stats['most_frequent'],
+        'cardinality': 'High' if stats['num_unique'] > 50 else 'Low',
+        'value_counts_top_n': dict(list(top_counts.items())[:top_n]),
+        'plot_value_counts': dict(list(top_counts.items())[:10]),
+    }
+
 def _analyse_generic(report_object,column_data):
+    if report_object.settings.approximate:
+        return _analyse_values_approximately(report_object, column_data, 'num_unique', generic=True)
+
     generic_stats = {
         'num_unique': str(column_data.nunique()),
         
@@ -0,0 +1,77 @@
+# data_visualizer/type_inference.py
+"""
+Column type inference.
+
+The 'complete' mode runs the visions typeset over the whole column. The 'fast' mode maps
+pandas dtypes straight to visions types and runs the typeset's expensive string checks
+(URL, path, date, numeric-string, ...) on a sample of object/string columns only.
+"""
+from functools import lru_cache
+import pandas as pd
+
+# A sample that infers as Object is conclusive: every narrower type requires *all* values to
+# match, so if sampled values already fail, the full column fails too. A String sample is not:
+# unsampled values of other types widen the column to Object, so it is checked over all values
+_SAMPLE_CONCLUSIVE_TYPES = ('Object',)
+
+
+@lru_cache(maxsize=None)
+def get_typeset(name: str = 'complete'):
+    """
+    Shared visions typeset instance, built on first use ('complete' or 'standard').
+    """
+    if name == 'standard':
+        from visions.typesets import StandardSet
+        return StandardSet()
+    from visions.typesets import CompleteSet
+    return CompleteSet()
+
+
+def _dtype_type(column_data: pd.Series):
+    # Types that follow from the dtype alone; None when values need to be inspected
+    from visions.types import Boolean, Categorical, Complex, DateTime, TimeDelta
+    dtype = column_data.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return Boolean
+    if isinstance(dtype, pd.CategoricalDtype):
+        return Categorical
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return DateTime
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return TimeDelta
+    if pd.api.types.is_complex_dtype(dtype):
+        return Complex
+    return None
+
+
+def infer_column_type(column_data: pd.Series, settings):
+    """
+    Visions type of a column, as dispatched on by `analyzer_registry`.
+    """
+    typeset = get_typeset(settings.typeset)
+    if settings.type_inference == 'complete':
+        return typeset.infer_type(column_data)
+
+    if column_data.count() == 0:
+        from visions.types import Generic
+        return Generic
+
+    inferred_type = _dtype_type(column_data)
+    if inferred_type is not None:
+        return inferred_type
+
+    if not (pd.api.types.is_object_dtype(column_data.dtype) or pd.api.types.is_string_dtype(column_data.dtype)):
+        # Numeric dtypes: the typeset's own checks (e.g. integral floats -> Integer) are vectorized and cheap
+        return typeset.infer_type(column_data)
+
+    non_null = column_data.dropna()
+    if len(non_null) > settings.type_inference_sample_size:
+        sample = non_null.sample(settings.type_inference_sample_size, random_state=0)
+        inferred_type = typeset.infer_type(sample)
+        if str(inferred_type) in _SAMPLE_CONCLUSIVE_TYPES:
+            return inferred_type
+        if str(inferred_type) == 'String' and pd.api.types.infer_dtype(non_null, skipna=True) == 'string':
+            return inferred_type  # No specialised type in the sample, and every value is a string
+
+    # Small columns, or a sample that looks specialised (URLs, dates, numeric strings): confirm on all values
+    return typeset.infer_type(column_data)
@@ -14,8 +14,9 @@ def register_analyzer(vision_type):
         This is the inner function (the real decorator).
         It takes the function to be decorated and registers it.
         """
-        # The core logic: add the function to our registry
-        analyzer_registry[vision_type] = analyzer_function
+        # The core logic: add the function to our registry.
+        # Keyed by the type's name so analyzers register without importing visions.
+        analyzer_registry[str(vision_type)] = analyzer_function
         
         # Return the original, unmodified function
         return analyzer_function
@@ -23,3 +24,10 @@ def register_analyzer(vision_type):
     # The outer function returns the inner function
     return decorator
 
+
+
+def get_analyzer(inferred_type, default=None):
+    """
+    Analyzer registered for a visions type (or type name), or `default`.
+    """
+    return analyzer_registry.get(str(inferred_type), default)
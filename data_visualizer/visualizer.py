@@ -1,100 +1,332 @@
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import io
 import base64
+import threading
 import warnings
-from typing import List, Optional, Union, Dict
-from wordcloud import WordCloud
-import plotly.express as px
-import plotly.graph_objects as go
+from functools import lru_cache
+from typing import Optional, Union, Dict
 import json
 from .settings import Settings
+from .plot_data import numeric_plot_data, heatmap_matrix
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .execution import map_ordered, resolve_workers
+from .events import progress_bar
+from .instrumentation import SpanRecorder
+from .arrow_data import is_arrow_backed, value_stats
 
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Verdana']
+# matplotlib is not thread-safe (shared font caches), so only one thread draws at a time: every
+# matplotlib/seaborn plot holds this lock, and the 'thread' render backend draws them one after
+# another (only 'process' renders them in parallel; Plotly figures are built without it)
+RENDER_LOCK = threading.RLock()
+PLOT_STYLE = 'seaborn-v0_8-whitegrid'
+_MIME_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+HEATMAP_MAX_TICK_LABELS = 60  # Variables beyond which a raster heatmap leaves out its tick labels
 
-def get_plot_as_base64(column_data: pd.Series, column_name: str, settings: "Settings" , outliers: Optional[List] = None, word_frequencies: Optional[dict] = None) -> Dict[str, Union[str, dict]]:
-    
+
+@lru_cache(maxsize=None)
+def _styled_matplotlib():
+    """
+    matplotlib, imported and styled once per process on first use so plot-free runs never load it.
+    """
+    import matplotlib
+    import matplotlib.style
+    matplotlib.rcParams['font.family'] = 'sans-serif'
+    matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Verdana']
+    matplotlib.style.use(PLOT_STYLE)
+    return matplotlib
+
+
+def summary_plot_spec(column_name: str, histogram: Optional[tuple] = None, value_counts: Optional[dict] = None,
+                      word_frequencies: Optional[dict] = None, outlier_histogram: Optional[np.ndarray] = None,
+                      kde: Optional[tuple] = None) -> dict:
+    """
+    Everything needed to draw a column's plot later, from pre-aggregated summaries.
+
+    Args:
+        histogram: (counts, edges) for numeric columns
+        value_counts: top values -> counts for categorical columns
+        word_frequencies: word -> count for a word cloud
+        outlier_histogram: outlier counts on the same edges as `histogram`, drawn highlighted
+        kde: (x, y) density curve scaled to the histogram counts
+    """
+    return {'kind': 'summary', 'column_name': column_name, 'histogram': histogram, 'value_counts': value_counts,
+            'word_frequencies': word_frequencies, 'outlier_histogram': outlier_histogram, 'kde': kde}
+
+
+def column_plot_spec(column_data: pd.Series, column_name: str, outlier_mask: Optional[np.ndarray] = None,
+                     word_frequencies: Optional[dict] = None) -> dict:
+    """
+    Plot spec for a column's raw values: a histogram for numeric data, otherwise a word cloud
+    (when `word_frequencies` is given) or a top-10 bar chart.
+    """
+    if pd.api.types.is_numeric_dtype(column_data):
+        # Bin once (O(n), vectorized) and draw from the summary, so figure size is independent of row count
+        plot_data = numeric_plot_data(column_data, outlier_mask=outlier_mask)
+        return summary_plot_spec(column_name, histogram=plot_data['histogram'],
+                                 outlier_histogram=plot_data['outlier_histogram'], kde=plot_data['kde'])
+    if word_frequencies:
+        return summary_plot_spec(column_name, word_frequencies=word_frequencies)
+    if is_arrow_backed(column_data):
+        return summary_plot_spec(column_name, value_counts=value_stats(column_data, 10)['value_counts_top_n'])
+    return summary_plot_spec(column_name, value_counts=column_data.value_counts().nlargest(10).to_dict())
+
+
+def heatmap_spec(correlation_matrix: pd.DataFrame, top_n: Optional[int] = None, order: str = 'original') -> dict:
+    """
+    Heatmap of a correlation matrix, cut to its `top_n` most correlated variables and/or in
+    hierarchical-cluster `order` (see `heatmap_matrix`).
+    """
+    return {'kind': 'heatmap', 'matrix': heatmap_matrix(correlation_matrix, top_n, order)}
+
+
+def render_plot(spec: dict, settings: "Settings"):
+    """
+    Draw one plot spec: a Plotly figure dict or an inline image (correlation heatmaps are
+    always images, returned as a bare data URI).
+    """
+    if spec['kind'] == 'heatmap':
+        return _render_heatmap(spec['matrix'], settings)
     if settings.use_plotly:
-        if pd.api.types.is_numeric_dtype(column_data):
-            # Numeric: Histogram with outliers
-            fig = px.histogram(
-                x=column_data.dropna(), nbins=20, title=f'Distribution of {column_name}',
-                color_discrete_sequence=['#17a2b8']
-            )
-            if outliers:
-                outlier_series = pd.Series(outliers)
-                fig.add_trace(
-                    go.Histogram(
-                        x=outlier_series, nbinsx=20, name='Outliers',
-                        marker_color='#dc3545', opacity=0.5
-                    )
-                )
-            return {'type': 'plotly', 'data': json.loads(fig.to_json())}
-        elif word_frequencies:
-            # String: Word cloud as scatter (Plotly lacks native word clouds)
-            words = list(word_frequencies.keys())
-            sizes = list(word_frequencies.values())
-            max_size = max(sizes) if sizes else 1
-            fig = go.Figure(data=[
-                go.Scatter(
-                    x=[i % 5 for i in range(len(words))],  # Simple grid layout
-                    y=[i // 5 for i in range(len(words))],
-                    text=words,
-                    mode='text',
-                    textfont=dict(size=[max(1, min(s * 30 / max_size, 30)) for s in sizes]),
-                    marker=dict(color='#2ca02c')
-                )
-            ])
-            fig.update_layout(
-                title=f'Word Cloud for {column_name}',
-                showlegend=False, xaxis=dict(visible=False), yaxis=dict(visible=False)
-            )
-            return {'type': 'plotly', 'data': json.loads(fig.to_json())}
-        else:
-            # Categorical: Bar plot
-            top_10 = column_data.value_counts().nlargest(10)
-            fig = px.bar(
-                x=top_10.index.astype(str), y=top_10.values,
-                title=f'Top 10 Values for {column_name}',
-                color_discrete_sequence=['#2ca02c']
-            )
-            fig.update_layout(xaxis_tickangle=45)
-            return {'type': 'plotly', 'data': json.loads(fig.to_json())}
+        return _plotly_summary_plot(spec)
+    return _matplotlib_summary_plot(spec, settings)
+
+
+def render_plot_specs(specs: dict, settings: "Settings", recorder: Optional[SpanRecorder] = None,
+                      progress=None) -> dict:
+    """
+    The rendering stage: draw a batch of plot specs (keyed by any label) on the backend chosen
+    by `settings.render_backend`, and return the rendered plots under the same keys.
+    Per-plot spans go to `recorder` when instrumentation is on, finished plots to `progress`.
+    """
+    backend = settings.render_backend or settings.execution_backend
+    stage_settings = settings.model_copy(update={'execution_backend': backend})
+    results = map_ordered(_render_plot_job, ((spec, settings) for spec in specs.values()), stage_settings,
+                          total=len(specs), desc="Rendering plots", unit="plot", progress=progress, stage='plots',
+                          labels=[_plot_label(key) for key in specs])
+    rendered = {}
+    for key, (plot, spans) in zip(specs, results):
+        rendered[key] = plot
+        if recorder is not None:
+            recorder.add(spans)
+    return rendered
+
+
+class PlotRenderer:
+    """
+    Draws plot specs in the background as they are submitted, so plots are rendered while
+    the profiler is still analysing later columns (`settings.overlap_plots`). Uses a thread or
+    process pool per `settings.render_backend` (or `execution_backend`); in a thread pool,
+    matplotlib plots still draw one at a time (`RENDER_LOCK`), overlapping only the analysis.
+    """
+
+    def __init__(self, settings: "Settings", recorder: Optional[SpanRecorder] = None, progress=None):
+        backend = settings.render_backend or settings.execution_backend
+        executor_cls = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+        self.executor = executor_cls(max_workers=resolve_workers(settings))
+        self.settings = settings
+        self.recorder = recorder
+        self.progress = progress
+        self.futures = {}
+
+    def submit(self, key, spec: dict):
+        self.futures[key] = self.executor.submit(_render_plot_job, (spec, self.settings))
+
+    def collect(self) -> dict:
+        """
+        Wait for every submitted plot and return the plots under their keys.
+        """
+        bar = progress_bar(self.progress, 'plots', len(self.futures), "Rendering plots", "plot")
+        rendered = {}
+        try:
+            for key, future in self.futures.items():
+                plot, spans = future.result()
+                rendered[key] = plot
+                if self.recorder is not None:
+                    self.recorder.add(spans)
+                bar.update(_plot_label(key))
+        finally:
+            bar.close()
+            self.close()
+        return rendered
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _plot_label(key) -> str:
+    # Results path of a plot as an id, e.g. 'variables/age/plot'
+    return '/'.join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+
+def _render_plot_job(job: tuple) -> tuple:
+    # Returns (plot, spans); spans are timed where the plot is drawn, possibly in a worker process
+    spec, settings = job
+    if not settings.instrument:
+        return render_plot(spec, settings), []
+    recorder = SpanRecorder(settings.instrument_memory, emit_hooks=False)
+    stage = 'render_heatmap' if spec['kind'] == 'heatmap' else 'render_plot'
+    with recorder.span(stage, spec.get('column_name')):
+        plot = render_plot(spec, settings)
+    recorder.close()
+    return plot, recorder.spans
+
+
+def get_plot_as_base64(column_data: pd.Series, column_name: str, settings: "Settings" , outlier_mask: Optional[np.ndarray] = None, word_frequencies: Optional[dict] = None) -> Dict[str, Union[str, dict]]:
+    return render_plot(column_plot_spec(column_data, column_name, outlier_mask, word_frequencies), settings)
+
+
+def get_summary_plot_as_base64(column_name: str, settings: "Settings", **summaries) -> Dict[str, Union[str, dict]]:
+    """
+    Plot a column from pre-aggregated summaries (see `summary_plot_spec`) right away.
+    """
+    return render_plot(summary_plot_spec(column_name, **summaries), settings)
+
+
+def _plotly_summary_plot(spec: dict) -> dict:
+    import plotly.graph_objects as go
+    column_name = spec['column_name']
+    if spec['histogram'] is not None:
+        counts, edges = spec['histogram']
+        outlier_histogram = spec['outlier_histogram']
+        centers = (edges[:-1] + edges[1:]) / 2
+        total = counts if outlier_histogram is None else counts + outlier_histogram
+        fig = go.Figure(data=[go.Bar(x=centers, y=total, width=np.diff(edges), marker_color='#17a2b8', name=column_name)])
+        if outlier_histogram is not None:
+            fig.add_trace(go.Bar(x=centers, y=outlier_histogram, width=np.diff(edges), name='Outliers',
+                                 marker_color='#dc3545', opacity=0.5))
+        fig.update_layout(title=f'Distribution of {column_name}', bargap=0, barmode='overlay')
+        return {'type': 'plotly', 'data': json.loads(fig.to_json())}
+    elif spec['word_frequencies']:
+        return _plotly_word_cloud(spec['word_frequencies'], column_name)
     else:
-        # Seaborn logic
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=UserWarning, module="matplotlib")
-            plt.figure(figsize=(6, 4))
-            plt.style.use('seaborn-v0_8-whitegrid')
-
-            if pd.api.types.is_numeric_dtype(column_data):
-                if outliers is not None and len(outliers) > 0:
-                    # Split data into inliers and outliers for highlighting
-                    inliers = column_data[~column_data.isin(outliers)]
-                    sns.histplot(inliers, kde=True, bins=20, color="#17a2b8", label='Inliers')
-                    sns.histplot(outliers, kde=False, bins=20, color="#dc3545", alpha=0.5, label='Outliers')
-                    plt.legend()
-                else:
-                    # No outliers detected, show normal histogram
-                    sns.histplot(column_data, kde=True, bins=20, color="#17a2b8")
-                plt.title(f'Distribution of {column_name}')
-            elif word_frequencies is not None and word_frequencies:
-                wordcloud = WordCloud(width=400, height=200, background_color='white', colormap='viridis').generate_from_frequencies(word_frequencies)
-                plt.imshow(wordcloud, interpolation='bilinear')
-                plt.axis('off')
-                plt.title(f'Word Cloud for {column_name}')
-            else:
-                top_10 = column_data.value_counts().nlargest(10)
-                clean_labels = [str(label).replace('$', '\\$').replace('_', '\\_') for label in top_10.index]
-                sns.barplot(x=clean_labels, y=top_10.values, palette="viridis")
-                plt.title(f'Top 10 Values for {column_name}')
-                plt.xticks(rotation=45, ha='right')
-
-            plt.tight_layout()
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight')
-            plt.close()
-            data = base64.b64encode(buf.getbuffer()).decode('ascii')
-            return {'type': 'base64', 'data': f"data:image/png;base64,{data}"}
\ No newline at end of file
+        return _plotly_top_values(pd.Series(spec['value_counts'] or {}, dtype='int64').nlargest(10), column_name)
+
+
+def _matplotlib_summary_plot(spec: dict, settings: "Settings") -> dict:
+    column_name = spec['column_name']
+    with RENDER_LOCK, warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=UserWarning, module="matplotlib")
+        fig, ax = _new_figure((6, 4), settings)
+
+        if spec['histogram'] is not None:
+            counts, edges = spec['histogram']
+            outlier_histogram, kde = spec['outlier_histogram'], spec['kde']
+            label = 'Inliers' if outlier_histogram is not None else None
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color="#17a2b8", edgecolor='white', label=label)
+            if kde is not None:
+                ax.plot(kde[0], kde[1], color="#17a2b8")
+            if outlier_histogram is not None:
+                ax.bar(edges[:-1], outlier_histogram, width=np.diff(edges), align='edge', color="#dc3545",
+                       alpha=0.5, edgecolor='white', label='Outliers')
+                ax.legend()
+            ax.set_xlabel(str(column_name))
+            ax.set_ylabel('Count')
+            ax.set_title(f'Distribution of {column_name}')
+        elif spec['word_frequencies']:
+            _draw_word_cloud(ax, spec['word_frequencies'], column_name)
+        else:
+            _draw_top_values(ax, pd.Series(spec['value_counts'] or {}, dtype='int64').nlargest(10), column_name)
+
+        return {'type': 'base64', 'data': _figure_to_data_uri(fig, settings)}
+
+
+def _render_heatmap(correlation_matrix: pd.DataFrame, settings: "Settings") -> str:
+    if len(correlation_matrix) > settings.heatmap_max_annotated:
+        return _render_raster_heatmap(correlation_matrix, settings)
+    import seaborn as sns
+    with RENDER_LOCK:
+        fig, ax = _new_figure((10, 8), settings)
+        sns.heatmap(correlation_matrix, annot=True, fmt=".2f", cmap="coolwarm", square=True, cbar_kws={"shrink": .8}, ax=ax)
+        ax.set_title("Correlation Heatmap")
+        return _figure_to_data_uri(fig, settings)
+
+
+def _render_raster_heatmap(correlation_matrix: pd.DataFrame, settings: "Settings") -> str:
+    # One image for the whole matrix instead of a patch and a text artist per cell, so drawing
+    # time barely grows with the number of variables
+    with RENDER_LOCK:
+        fig, ax = _new_figure((10, 8), settings)
+        image = ax.imshow(np.ma.masked_invalid(correlation_matrix.to_numpy(dtype=np.float64)), cmap="coolwarm")
+        fig.colorbar(image, ax=ax, shrink=.8)
+        ax.grid(False)
+        num_variables = len(correlation_matrix)
+        if num_variables <= HEATMAP_MAX_TICK_LABELS:
+            fontsize = min(10, max(4, 600 / num_variables))
+            ax.set_xticks(range(num_variables), [str(name) for name in correlation_matrix.columns], rotation=90, fontsize=fontsize)
+            ax.set_yticks(range(num_variables), [str(name) for name in correlation_matrix.index], fontsize=fontsize)
+        else:
+            ax.set_xticks([])
+            ax.set_yticks([])
+            ax.set_xlabel(f"{num_variables} variables")
+        ax.set_title("Correlation Heatmap")
+        return _figure_to_data_uri(fig, settings)
+
+
+def _plotly_word_cloud(word_frequencies: dict, column_name: str) -> dict:
+    import plotly.graph_objects as go
+    words = list(word_frequencies.keys())
+    sizes = list(word_frequencies.values())
+    max_size = max(sizes) if sizes else 1
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=[i % 5 for i in range(len(words))],  # Simple grid layout
+            y=[i // 5 for i in range(len(words))],
+            text=words,
+            mode='text',
+            textfont=dict(size=[max(1, min(s * 30 / max_size, 30)) for s in sizes]),
+            marker=dict(color='#2ca02c')
+        )
+    ])
+    fig.update_layout(
+        title=f'Word Cloud for {column_name}',
+        showlegend=False, xaxis=dict(visible=False), yaxis=dict(visible=False)
+    )
+    return {'type': 'plotly', 'data': json.loads(fig.to_json())}
+
+
+def _plotly_top_values(top_10: pd.Series, column_name: str) -> dict:
+    import plotly.express as px
+    fig = px.bar(
+        x=top_10.index.astype(str), y=top_10.values,
+        title=f'Top 10 Values for {column_name}',
+        color_discrete_sequence=['#2ca02c']
+    )
+    fig.update_layout(xaxis_tickangle=45)
+    return {'type': 'plotly', 'data': json.loads(fig.to_json())}
+
+
+def _draw_word_cloud(ax, word_frequencies: dict, column_name: str):
+    from wordcloud import WordCloud
+    wordcloud = WordCloud(width=400, height=200, background_color='white', colormap='viridis', random_state=0).generate_from_frequencies(word_frequencies)
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title(f'Word Cloud for {column_name}')
+
+
+def _draw_top_values(ax, top_10: pd.Series, column_name: str):
+    import seaborn as sns
+    clean_labels = [str(label).replace('$', '\\$').replace('_', '\\_') for label in top_10.index]
+    sns.barplot(x=clean_labels, y=top_10.values, palette="viridis", ax=ax)
+    ax.set_title(f'Top 10 Values for {column_name}')
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+
+
+def _new_figure(figsize: tuple, settings: "Settings"):
+    # Object-oriented figure: no pyplot state, saved through the Agg (or SVG) canvas directly
+    _styled_matplotlib()
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize, dpi=settings.plot_dpi)
+    return fig, fig.subplots()
+
+
+def _figure_to_data_uri(fig, settings: "Settings") -> str:
+    # One tight-layout pass, then a single draw; a layout engine or bbox_inches='tight'
+    # would make savefig draw the figure more than once
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format=settings.plot_format)
+    data = base64.b64encode(buf.getbuffer()).decode('ascii')
+    return f"data:{_MIME_TYPES[settings.plot_format]};base64,{data}"
@@ -0,0 +1,69 @@
+import contextlib
+import io
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer import AnalysisReport, Settings
+
+
+def make_frame(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    """
+    A small table with every kind of column the analyzers dispatch on, with gaps.
+    """
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'normal': rng.normal(10, 3, n),
+        'gappy': rng.exponential(2.0, n),
+        'integer': rng.integers(-50, 50, n),
+        'nullable': pd.array(rng.integers(0, 5, n), dtype='Int64'),
+        'constant': np.full(n, 3.5),
+        'category': rng.choice(['red', 'green', 'blue', 'teal'], n),
+        'sparse_category': rng.choice(['x', 'y', None], n),
+        'text': rng.choice(['the quick fox', 'a lazy dog', 'the dog and the fox'], n),
+        'flag': rng.random(n) > 0.3,
+    })
+    frame.loc[rng.random(n) < 0.1, 'gappy'] = np.nan
+    frame.loc[rng.random(n) < 0.2, 'nullable'] = pd.NA
+    return frame
+
+
+def analyse(data, **settings) -> dict:
+    """
+    `AnalysisReport(data, Settings(**settings)).analyse()` without plots or console output.
+    """
+    settings.setdefault('include_plots', False)
+    settings.setdefault('include_correlations_plots', False)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return AnalysisReport(data, Settings(**settings)).analyse()
+
+
+def assert_same(left, right, rel: float = 1e-12, path: str = ''):
+    """
+    Recursive equality of results; floats within `rel` and NaN equal to NaN.
+    """
+    if isinstance(left, dict):
+        assert isinstance(right, dict), path
+        assert list(left) == list(right), path
+        for key in left:
+            assert_same(left[key], right[key], rel, f'{path}/{key}')
+    elif isinstance(left, (list, tuple)):
+        assert len(left) == len(right), path
+        for i, (a, b) in enumerate(zip(left, right)):
+            assert_same(a, b, rel, f'{path}/{i}')
+    elif isinstance(left, pd.DataFrame):
+        pd.testing.assert_frame_equal(left, right, rtol=rel)
+    elif isinstance(left, np.ndarray):
+        np.testing.assert_allclose(left, right, rtol=rel, equal_nan=True, err_msg=path)
+    elif isinstance(left, (float, np.floating)) and not isinstance(right, (bool, np.bool_)):
+        if math.isnan(left):
+            assert math.isnan(right), path
+        else:
+            assert right == pytest.approx(left, rel=rel, abs=rel), path
+    else:
+        assert left == right, path
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return make_frame()
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+from conftest import analyse, assert_same, make_frame
+
+pa = pytest.importorskip('pyarrow')
+from data_visualizer.arrow_data import arrow_to_pandas, is_arrow_backed, token_counts, value_stats  # noqa: E402
+
+
+def test_arrow_table_profiles_like_the_pandas_frame():
+    frame = make_frame(1000)
+    from_arrow = analyse(pa.Table.from_pandas(frame, preserve_index=False))
+    from_pandas = analyse(frame)
+    for name, column_details in from_pandas['variables'].items():
+        arrow_details = dict(from_arrow['variables'][name])
+        arrow_details['Data_type'] = column_details['Data_type']  # 'string' instead of 'object'
+        assert_same(arrow_details, column_details, rel=1e-9, path=name)
+    for key in from_pandas:
+        if key not in ('variables', 'Sample_data'):
+            assert_same(from_arrow[key], from_pandas[key], rel=1e-9, path=key)
+
+
+def test_string_columns_stay_arrow_backed():
+    frame = arrow_to_pandas(pa.table({'text': ['a', None, 'b'], 'number': [1.0, 2.0, 3.0]}))
+    assert is_arrow_backed(frame['text']) and not is_arrow_backed(frame['number'])
+
+
+def test_value_stats_break_ties_like_pandas():
+    values = ['b', 'a', 'c', 'b', 'a', None, 'd', 'c', 'e']
+    column = arrow_to_pandas(pa.table({'v': values}))['v']
+    expected = pd.Series(values, dtype=object)
+    stats = value_stats(column, 3)
+    assert stats['num_unique'] == expected.nunique()
+    assert stats['most_frequent'] == expected.mode().iloc[0]
+    assert stats['value_counts_top_n'] == expected.value_counts().nlargest(3).to_dict()
+
+
+def test_token_counts_match_python_split():
+    values = [' The fox  and the dog ', 'the end', None, '']
+    column = arrow_to_pandas(pa.table({'v': values}))['v']
+    counts = token_counts(column, lowercase=True, stopwords=frozenset({'and'}))
+    words = [word.lower() for text in values if text for word in text.split() if word.lower() != 'and']
+    assert counts.to_dict() == pd.Series(words).value_counts().to_dict()
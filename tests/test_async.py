@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import pytest
+from data_visualizer import AnalysisReport, Settings
+from data_visualizer import events
+from data_visualizer.events import CONSOLE
+from conftest import analyse, assert_same, make_frame
+
+_SETTINGS = dict(include_plots=False, include_correlations_plots=False)
+
+
+@pytest.fixture
+def held_after_first_column(monkeypatch):
+    """
+    Async runs wait after their first finished column until the returned event is set (or the
+    run is cancelled), so a test can act while a run is known to be in flight.
+    """
+    release = threading.Event()
+    emit = events.CallbackProgress.emit
+
+    def held_emit(self, event):
+        emit(self, event)
+        if event['event'] == 'item_done' and event['stage'] == 'columns' and event['done'] == 1:
+            while not (release.is_set() or self.cancelled.is_set()):
+                release.wait(0.01)
+
+    monkeypatch.setattr(events.CallbackProgress, 'emit', held_emit)
+    yield release
+    release.set()
+
+
+def test_events_arrive_on_the_loop_and_results_match():
+    frame = make_frame(500)
+    received = []
+
+    async def run():
+        loop_thread = threading.get_ident()
+        return await AnalysisReport(frame, Settings(**_SETTINGS)).analyse_async(
+            on_event=lambda event: received.append((threading.get_ident() == loop_thread, event)))
+
+    results = asyncio.run(run())
+    assert all(on_loop for on_loop, _ in received)
+    columns = [event for _, event in received if event['event'] == 'item_done' and event['stage'] == 'columns']
+    assert [event['done'] for event in columns] == list(range(1, len(frame.columns) + 1))
+    assert {event['item'] for event in columns} == set(frame.columns)
+    started = [event['stage'] for _, event in received if event['event'] == 'stage_started']
+    assert started == [event['stage'] for _, event in received if event['event'] == 'stage_finished']
+    assert_same(results, analyse(frame))
+
+
+def test_cancelling_stops_the_run_and_restores_the_report(held_after_first_column):
+    report = AnalysisReport(make_frame(500), Settings(**_SETTINGS))
+
+    async def run():
+        first_column = asyncio.Event()
+        task = asyncio.create_task(report.analyse_async(
+            on_event=lambda event: first_column.set() if event['event'] == 'item_done' else None))
+        await first_column.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert report.progress is CONSOLE
+        held_after_first_column.set()
+        return await report.analyse_async()  # The report can run again
+
+    results = asyncio.run(run())
+    assert len(results['variables']) == 9
+
+
+def test_overlapping_runs_on_one_report_are_refused(held_after_first_column):
+    report = AnalysisReport(make_frame(500), Settings(**_SETTINGS))
+
+    async def run():
+        first_column = asyncio.Event()
+        task = asyncio.create_task(report.analyse_async(
+            on_event=lambda event: first_column.set() if event['event'] == 'item_done' else None))
+        await first_column.wait()
+        with pytest.raises(RuntimeError, match='already running'):
+            await report.analyse_async()
+        held_after_first_column.set()
+        return await task
+
+    assert len(asyncio.run(run())['variables']) == 9
+
+
+def test_cancelling_at_the_last_stage_shuts_the_background_renderer(monkeypatch):
+    from data_visualizer.visualizer import PlotRenderer
+    closed = []
+    close = PlotRenderer.close
+    monkeypatch.setattr(PlotRenderer, 'close', lambda renderer: closed.append(renderer) or close(renderer))
+
+    def on_event(event):
+        if event['event'] == 'message' and event['message'] == '--- Full Analysis Done ---':
+            report.progress.cancel()  # Raised by the next event: the start of plot rendering
+
+    report = AnalysisReport(make_frame(200), Settings(include_plots=True, use_plotly=True, overlap_plots=True,
+                                                      render_backend='thread', n_workers=2,
+                                                      include_correlations_plots=False), on_event=on_event)
+    with pytest.raises(events.AnalysisCancelled):
+        report.analyse()
+    assert report._renderer is None and len(closed) == 1
+    assert closed[0].executor._shutdown
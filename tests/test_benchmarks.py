@@ -0,0 +1,33 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from datasets import DATASETS  # noqa: E402
+import run_benchmarks  # noqa: E402
+
+
+@pytest.mark.parametrize('name', list(DATASETS))
+def test_datasets_are_reproducible_per_seed(name):
+    frame = DATASETS[name](0.01, seed=3)
+    pd.testing.assert_frame_equal(frame, DATASETS[name](0.01, seed=3))
+    assert not frame.equals(DATASETS[name](0.01, seed=4))
+    assert len(DATASETS[name](0.02, seed=3)) >= len(frame)
+
+
+def test_every_stage_is_measured(tmp_path):
+    frame = DATASETS['mixed_types'](0.01)
+    stages = run_benchmarks.run_stages(frame, run_benchmarks.Settings(**run_benchmarks.PRESETS['no_plots']),
+                                       str(tmp_path))
+    assert {'overview', 'type_inference', 'numeric_analyzers', 'correlations', 'analyse'} <= set(stages)
+    assert all(seconds >= 0 for seconds in stages.values())
+
+
+def test_compare_flags_only_regressions_above_the_floor():
+    baseline = {'results': {'tall': {'shape': [10, 2], 'minimal': {
+        'analyse': {'seconds': 1.0, 'peak_mb': 100.0}, 'overview': {'seconds': 1.0}, 'tiny': {'seconds': 1e-4}}}}}
+    current = {'results': {'tall': {'shape': [10, 2], 'minimal': {
+        'analyse': {'seconds': 2.0, 'peak_mb': 110.0}, 'overview': {'seconds': 1.1}, 'tiny': {'seconds': 1.0}}}}}
+    regressions = run_benchmarks.compare(baseline, current, threshold=1.25)
+    assert [(stage, metric) for _, _, stage, metric, *_ in regressions] == [('analyse', 'seconds')]
@@ -0,0 +1,54 @@
+import contextlib
+import io
+import numpy as np
+import pandas as pd
+from data_visualizer import AnalysisReport, Settings
+from conftest import analyse, assert_same
+
+_SETTINGS = dict(include_plots=False, include_correlations_plots=False, include_correlations_json=True)
+
+
+def _cached_run(frame, cache_dir):
+    report = AnalysisReport(frame, Settings(cache_dir=str(cache_dir), **_SETTINGS))
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        results = report.analyse()
+    return results, dict(report.cache.stats)
+
+
+def test_warm_run_is_served_from_the_cache(frame, tmp_path):
+    cold, cold_stats = _cached_run(frame, tmp_path)
+    warm, warm_stats = _cached_run(frame, tmp_path)
+    assert cold_stats['hits'] == 0 and cold_stats['misses'] > 0
+    assert warm_stats['misses'] == 0 and warm_stats['hits'] == cold_stats['misses']
+    assert_same(cold, warm)
+    assert_same(analyse(frame, include_correlations_json=True), cold)
+
+
+def test_changed_columns_are_recomputed(frame, tmp_path):
+    _cached_run(frame, tmp_path)
+    changed = frame.copy()
+    changed['normal'] = np.random.default_rng(5).normal(size=len(frame))
+    changed['category'] = changed['category'].str.upper()
+
+    results, stats = _cached_run(changed, tmp_path)
+    assert 0 < stats['misses'] < stats['hits']
+    # Rows recomputed for the changed columns agree with a full computation, cell for cell
+    assert_same(analyse(changed, include_correlations_json=True), results)
+
+
+def test_settings_that_change_results_invalidate(frame, tmp_path):
+    _cached_run(frame, tmp_path)
+    report = AnalysisReport(frame, Settings(cache_dir=str(tmp_path), top_n_values=3, **_SETTINGS))
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        results = report.analyse()
+    assert len(results['variables']['category']['value_counts_top_n']) == 3
+    assert report.cache.stats['misses'] > 0
+
+
+def test_numbers_and_their_strings_are_cached_apart(tmp_path):
+    numbers = pd.DataFrame({'value': pd.Series([1, 2, 2, 3] * 50, dtype=object)})
+    strings = numbers.astype(str).astype(object)
+    _cached_run(numbers, tmp_path)
+    results, stats = _cached_run(strings, tmp_path)
+    assert stats['hits'] == 0
+    assert_same(results, analyse(strings, include_correlations_json=True))
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer import correlations
+from data_visualizer.correlations import (_cramers_v_matrix, _pearson_rows, _spearman_rows, pearson_matrix,
+                                           spearman_matrix, strongest_pairs)
+from data_visualizer.settings import Settings
+
+
+def _scipy_cramers_v(x: pd.Series, y: pd.Series) -> float:
+    stats = pytest.importorskip('scipy.stats')
+    table = pd.crosstab(x, y)
+    if min(table.shape) < 2:
+        return 0.0
+    chi2 = stats.chi2_contingency(table)[0]
+    return float(np.sqrt(chi2 / (table.to_numpy().sum() * (min(table.shape) - 1))))
+
+
+def _categorical_frame(n=1500, seed=3):
+    rng = np.random.default_rng(seed)
+    base = rng.choice(list('abcde'), n)
+    frame = pd.DataFrame({
+        'base': base,
+        'related': np.where(rng.random(n) < 0.7, base, rng.choice(list('abcde'), n)),
+        'binary': rng.choice(['yes', 'no'], n),
+        'binary_2': rng.choice(['on', 'off'], n),  # 2x2 with 'binary': Yates' correction
+        'gappy': rng.choice(['p', 'q', 'r', None], n),
+        'constant': np.full(n, 'k'),
+    })
+    return frame
+
+
+def test_cramers_v_matches_crosstab_and_chi2_contingency():
+    frame = _categorical_frame()
+    matrix = _cramers_v_matrix(frame)
+    for i, left in enumerate(frame):
+        for right in frame.columns[i + 1:]:
+            expected = _scipy_cramers_v(frame[left], frame[right])
+            assert matrix.loc[left, right] == pytest.approx(expected, abs=1e-12), (left, right)
+            assert matrix.loc[right, left] == matrix.loc[left, right]
+    assert (np.diag(matrix) == 1.0).all()
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_cramers_v_backends_agree(backend):
+    frame = _categorical_frame()
+    serial = _cramers_v_matrix(frame)
+    parallel = _cramers_v_matrix(frame, Settings(execution_backend=backend, n_workers=2))
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_cramers_v_lumps_rare_categories():
+    rng = np.random.default_rng(4)
+    frame = pd.DataFrame({'many': rng.integers(0, 40, 3000).astype(str), 'few': rng.choice(list('xyz'), 3000)})
+    # The 4 most frequent categories (ties in order of appearance) are kept, the rest lumped together
+    uniques = pd.factorize(frame['many'])[1]
+    counts = frame['many'].value_counts().reindex(uniques).to_numpy()
+    kept = uniques[np.argsort(-counts, kind='stable')[:4]]
+    lumped = frame['many'].where(frame['many'].isin(kept), 'other')
+
+    matrix = _cramers_v_matrix(frame, Settings(cramers_v_max_categories=5))
+    assert matrix.loc['many', 'few'] == pytest.approx(_scipy_cramers_v(lumped, frame['few']), abs=1e-12)
+
+
+def _gappy_numeric_frame(columns=12, n=800, seed=4):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=n)
+    frame = pd.DataFrame({f'c{j}': base * rng.normal() + rng.normal(size=n) for j in range(columns)})
+    frame['ties'] = rng.integers(0, 4, n).astype(float)
+    frame['constant'] = 1.0
+    for j in range(0, columns, 2):  # Half the columns with their own gaps, two sharing one
+        frame.loc[rng.random(n) < 0.15, f'c{j}'] = np.nan
+    frame['c3'] = frame['c3'].where(frame['c2'].notna())
+    return frame
+
+
+@pytest.mark.parametrize('max_patterns', [32, 2])
+def test_matrices_and_rows_match_pandas_pairwise_complete(monkeypatch, max_patterns):
+    monkeypatch.setattr(correlations, '_MAX_NULL_PATTERNS', max_patterns)
+    frame = _gappy_numeric_frame()
+    positions = np.array([0, 3, 5, len(frame.columns) - 1])
+    for method, matrix, rows in (('pearson', pearson_matrix, _pearson_rows), ('spearman', spearman_matrix, _spearman_rows)):
+        expected = frame.corr(method=method)
+        pd.testing.assert_frame_equal(matrix(frame), expected, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(rows(frame, positions), expected.to_numpy()[positions], rtol=1e-9, atol=1e-12)
+
+
+def test_strongest_pairs_by_rank_and_threshold():
+    matrix = pd.DataFrame([[1.0, 0.2, -0.9, np.nan], [0.2, 1.0, 0.5, 0.1], [-0.9, 0.5, 1.0, 0.3],
+                           [np.nan, 0.1, 0.3, 1.0]], index=list('abcd'), columns=list('abcd'))
+    pairs = strongest_pairs(matrix)
+    assert [(p['column_1'], p['column_2'], p['value']) for p in pairs[:2]] == [('a', 'c', -0.9), ('b', 'c', 0.5)]
+    assert len(pairs) == 5  # The NaN pair is left out
+    assert strongest_pairs(matrix, top_k=2) == pairs[:2]
+    assert strongest_pairs(matrix, min_abs=0.3) == pairs[:3]
@@ -0,0 +1,35 @@
+import contextlib
+import io
+import pytest
+from data_visualizer import AnalysisReport, Settings
+from data_visualizer.dask_backend import _typing_rows
+from conftest import analyse, make_frame
+from test_streaming import _SETTINGS, assert_matches_in_memory
+
+dd = pytest.importorskip('dask.dataframe')
+
+
+def _analyse_dask(data) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return AnalysisReport(data, Settings(**_SETTINGS)).analyse()
+
+
+def test_partitions_match_in_memory(frame):
+    data = dd.from_pandas(frame, npartitions=5, sort=False)
+    computed = data.compute()  # Dask may convert object columns to strings
+    assert_matches_in_memory(_analyse_dask(data), analyse(computed, include_correlations_json=True), computed)
+
+
+def test_empty_leading_partitions_keep_the_column_types():
+    frame = make_frame(2000)
+    frame['position'] = range(len(frame))
+    data = dd.from_pandas(frame, npartitions=8, sort=False)
+    filtered = data[data['position'] >= 1500]  # The first six partitions are empty
+    assert _typing_rows(filtered)['position'].iloc[0] == 1500  # The head of the first non-empty partition
+
+    expected = filtered.compute()
+    streamed = _analyse_dask(filtered)
+    in_memory = analyse(expected, include_correlations_json=True)
+    assert {name: stats['Data_type'] for name, stats in streamed['variables'].items()} == \
+        {name: stats['Data_type'] for name, stats in in_memory['variables'].items()}
+    assert_matches_in_memory(streamed, in_memory, expected)
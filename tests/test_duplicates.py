@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer.duplicates import find_duplicates
+from conftest import analyse
+
+
+def _with_duplicates(n=5000, seed=11):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'a': rng.integers(0, 30, n), 'b': rng.choice(['x', 'y', None], n),
+                          'c': rng.integers(0, 3, n).astype(float)})
+    frame.loc[frame.index[::50], 'c'] = np.nan
+    frame.index = [f'row{i}' for i in range(n)]
+    return frame
+
+
+@pytest.mark.parametrize('chunksize', [None, 777])
+@pytest.mark.parametrize('subset', [None, ['a', 'b']])
+def test_duplicates_match_pandas(chunksize, subset):
+    frame = _with_duplicates()
+    found = find_duplicates(frame, subset=subset, chunksize=chunksize, max_indices=None, max_samples=20)
+    duplicated = frame.duplicated(subset=subset)
+    assert found['count'] == duplicated.sum()
+    assert found['indices'] == frame.index[duplicated].tolist()
+    expected_samples = frame[frame.duplicated(subset=subset, keep=False)].head(20)
+    pd.testing.assert_frame_equal(pd.DataFrame(found['samples'], columns=frame.columns),
+                                  expected_samples.reset_index(drop=True))
+
+
+def test_overview_reports_duplicates():
+    frame = _with_duplicates()
+    overview = analyse(frame, include_correlations=False, max_duplicate_indices=5)['overview']
+    duplicated = frame.duplicated()
+    assert overview['duplicated_rows'] == duplicated.sum()
+    assert overview['duplicate_percentage'] == pytest.approx(duplicated.mean() * 100)
+    assert overview['duplicate_indices'] == frame.index[duplicated][:5].tolist()
+
+
+@pytest.mark.parametrize('chunksize', [None, 2])
+def test_numbers_and_their_strings_are_not_duplicates(chunksize):
+    frame = pd.DataFrame({'a': [1, '1', 1.0, True, 'x', 'x', None, 2], 'b': ['1', 1, 1, 1, 2, 2, None, 'y']}, dtype=object)
+    for subset in (['a'], ['b'], None):
+        result = find_duplicates(frame, subset=subset, chunksize=chunksize)
+        assert result['count'] == frame.duplicated(subset=subset).sum(), subset
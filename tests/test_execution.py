@@ -0,0 +1,21 @@
+import pytest
+from data_visualizer.execution import map_ordered
+from data_visualizer.settings import Settings
+from conftest import analyse, assert_same
+
+
+def _square(x):
+    return x * x
+
+
+@pytest.mark.parametrize('backend', ['serial', 'thread', 'process'])
+def test_map_ordered_keeps_input_order(backend):
+    settings = Settings(execution_backend=backend, n_workers=2)
+    assert list(map_ordered(_square, range(20), settings, total=20)) == [x * x for x in range(20)]
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+def test_parallel_backends_match_serial(frame, backend):
+    serial = analyse(frame)
+    parallel = analyse(frame, execution_backend=backend, n_workers=2)
+    assert_same(serial, parallel)
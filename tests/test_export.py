@@ -0,0 +1,66 @@
+import contextlib
+import io
+import json
+import sys
+import pandas as pd
+import pytest
+from data_visualizer import AnalysisReport, Settings
+from data_visualizer.export import EXPORT_SCHEMA_VERSION, dumps_json
+from conftest import make_frame
+
+_SETTINGS = dict(include_plots=False, include_correlations_plots=False, include_correlations_json=True)
+
+
+def _report(frame=None, **settings) -> AnalysisReport:
+    report = AnalysisReport(make_frame(500) if frame is None else frame, Settings(**{**_SETTINGS, **settings}))
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        report.analyse()
+    return report
+
+
+def test_json_document_schema(monkeypatch):
+    report = _report()
+    document = json.loads(report.to_json())
+    assert document['schema_version'] == EXPORT_SCHEMA_VERSION
+    assert [variable['name'] for variable in document['variables']] == list(report.results['variables'])
+    assert document['overview'] == json.loads(json.dumps(report.results['overview'], default=str))
+    pearson = document['correlations']['pearson']
+    constant = pearson['columns'].index('constant')
+    assert pearson['values'][constant][constant] is None  # NaN becomes null
+    category = next(variable for variable in document['variables'] if variable['name'] == 'category')
+    assert category['value_counts_top_n'] == [{'value': value, 'count': count} for value, count
+                                              in report.results['variables']['category']['value_counts_top_n'].items()]
+
+    monkeypatch.setitem(sys.modules, 'orjson', None)  # The standard library encoder gives the same document
+    assert json.loads(dumps_json(report.to_dict())) == document
+
+
+def test_plots_are_referenced_by_id():
+    report = _report(include_plots=True, use_plotly=True)
+    document = report.to_dict(plots='reference')
+    normal = next(variable for variable in document['variables'] if variable['name'] == 'normal')
+    assert normal['plot'] == 'variables/normal/plot'
+    assert document['plots']['variables/normal/plot'] == report.results['variables']['normal']['plot']
+    assert 'plot' not in next(iter(report.to_dict()['variables']))
+
+
+def test_msgpack_holds_the_json_document():
+    msgpack = pytest.importorskip('msgpack')
+    report = _report()
+    assert msgpack.unpackb(report.to_msgpack(), raw=False) == json.loads(report.to_json())
+
+
+def test_parquet_files_of_different_datasets_read_back_as_one_table(tmp_path):
+    pytest.importorskip('pyarrow')
+    first = _report()
+    second = _report(pd.DataFrame({'only_text': ['a', 'b', 'a'], 'number': [1, 2, None]}))
+    first.to_parquet(str(tmp_path / 'first.parquet'), dataset='first')
+    second.to_parquet(str(tmp_path / 'second.parquet'), dataset='second')
+    table = pd.read_parquet(tmp_path)
+    assert len(table) == len(first.results['variables']) + 2
+    assert table.groupby('dataset').size().to_dict() == {'first': len(first.results['variables']), 'second': 2}
+    assert table['schema_version'].eq(EXPORT_SCHEMA_VERSION).all()
+    expected = first.stats_table('first')
+    numeric = table[table['dataset'] == 'first'].set_index('column')['mean']
+    pd.testing.assert_series_equal(numeric, expected.set_index('column')['mean'], check_dtype=False)
+    assert str(expected['missing_values'].dtype) == 'Int64' and str(expected['mean'].dtype) == 'float64'
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_and_minimal_run_leave_optional_libraries_unloaded():
+    # The import-time benchmark doubles as the check: it exits non-zero if a heavy library is loaded
+    result = subprocess.run([sys.executable, os.path.join(REPO_ROOT, 'benchmarks', 'import_time.py'),
+                             '--repeat', '1', '--max-seconds', '60'], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert 'heavy modules loaded on import: none' in result.stdout
+    assert 'heavy modules loaded by a minimal run: none' in result.stdout
@@ -0,0 +1,43 @@
+import pytest
+from data_visualizer import instrumentation
+from data_visualizer.instrumentation import SpanRecorder, register_span_hook
+from conftest import analyse, assert_same, make_frame
+
+
+@pytest.fixture
+def spans():
+    received = []
+    hook = register_span_hook(received.append)
+    yield received
+    instrumentation.span_hooks.remove(hook)
+
+
+def test_profile_totals_the_spans_sent_to_hooks(spans):
+    frame = make_frame(500)
+    results = analyse(frame, instrument=True)
+    profile = results.pop('_profile')
+    assert profile['memory'] is None and spans
+    assert set(profile['columns']) == set(map(str, frame.columns))
+    stage_spans = [span for span in spans if span['column'] is None]
+    assert {span['stage'] for span in stage_spans} == set(profile['stages'])
+    for stage, totals in profile['stages'].items():
+        assert totals['calls'] == sum(span['stage'] == stage for span in stage_spans)
+        assert totals['peak_mb'] is None
+    assert_same(results, analyse(frame))  # Instrumentation does not change the results
+
+
+def test_memory_peaks_are_traced_and_tracing_stops():
+    recorder = SpanRecorder(trace_memory=True, emit_hooks=False)
+    with recorder.span('outer'):
+        with recorder.span('inner', 'a'):
+            block = bytearray(4 * 2 ** 20)
+        del block
+    recorder.close()
+    summary = recorder.summary()
+    assert summary['columns']['a']['inner']['peak_mb'] >= 4
+    assert summary['stages']['outer']['peak_mb'] >= summary['columns']['a']['inner']['peak_mb']
+    assert not instrumentation.tracemalloc.is_tracing()
+
+
+def test_spans_are_a_no_op_when_off():
+    assert instrumentation.span(None, 'stage') is instrumentation.span(None, 'other')
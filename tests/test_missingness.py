@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer.missingness import NullityMask
+from data_visualizer.settings import Settings
+from conftest import analyse
+
+
+def test_mask_counts_match_isna(frame):
+    nullity = NullityMask(frame)
+    for column in frame:
+        np.testing.assert_array_equal(nullity.column(column), frame[column].isna().to_numpy())
+        assert nullity.missing_count(column) == frame[column].isna().sum()
+    assert nullity.total == frame.isna().sum().sum()
+    subset = nullity.subset(['gappy', 'nullable'])
+    np.testing.assert_array_equal(subset.column('nullable'), nullity.column('nullable'))
+
+
+def test_patterns_and_co_missing_pairs(frame):
+    summary = NullityMask(frame).summary(Settings(missing_patterns_top_n=3))
+    missing = frame.isna()
+    incomplete = missing[missing.any(axis=1)]
+    assert summary['rows_with_missing'] == len(incomplete)
+    assert summary['columns_with_missing'] == missing.any().sum()
+
+    patterns = incomplete.apply(lambda row: tuple(frame.columns[row.to_numpy()]), axis=1).value_counts()
+    assert [(tuple(p['columns']), p['count']) for p in summary['patterns']] == list(patterns.head(3).items())
+    assert not summary['patterns_approximate']
+
+    top_pair = summary['co_missing'][0]
+    left, right = top_pair['columns']
+    assert top_pair['count'] == (missing[left] & missing[right]).sum()
+    assert top_pair['percentage'] == pytest.approx(top_pair['count'] / len(frame) * 100)
+
+
+def test_report_uses_the_shared_mask(frame):
+    results = analyse(frame, include_correlations=False)
+    assert results['overview']['missing_values'] == frame.isna().sum().sum()
+    for column in frame:
+        assert results['variables'][column]['missing_values'] == frame[column].isna().sum()
+    assert results['missingness']['rows_with_missing'] == frame.isna().any(axis=1).sum()
+
+
+def test_empty_frame_reports_no_missing_values():
+    results = analyse(pd.DataFrame({'x': pd.Series([], dtype=float), 's': pd.Series([], dtype=object)}))
+    assert results['overview']['num_Row'] == 0
+    for column_details in results['variables'].values():
+        assert column_details['missing_values'] == 0 and column_details['missing_%'] == 0.0
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer import numeric_stats
+from data_visualizer.numeric_stats import compute_numeric_stats
+
+_DESCRIBED = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def _numeric_frame(n=3001, seed=1):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'normal': rng.normal(size=n),
+        'skewed': rng.lognormal(size=n),
+        'gaps': rng.normal(size=n),
+        'ints': rng.integers(0, 10, n),
+        'nullable': pd.array(rng.integers(0, 100, n), dtype='Int64'),
+        'constant': np.full(n, 2.0),
+        'empty': np.full(n, np.nan),
+    })
+    frame.loc[rng.random(n) < 0.3, 'gaps'] = np.nan
+    frame.loc[::3, 'nullable'] = pd.NA
+    return frame
+
+
+def _assert_matches_pandas(frame, stats):
+    for column in frame:
+        data = frame[column].astype('float64')
+        expected = data.describe()
+        for field in _DESCRIBED:
+            assert stats[column][field] == pytest.approx(expected[field], rel=1e-12, nan_ok=True), (column, field)
+        skew, kurt = data.skew(), data.kurt()
+        assert stats[column]['skewness'] == pytest.approx(0.0 if np.isnan(skew) else skew, rel=1e-9, abs=1e-12)
+        assert stats[column]['kurtosis'] == pytest.approx(0.0 if np.isnan(kurt) else kurt, rel=1e-9, abs=1e-12)
+        q1, q3 = data.quantile([0.25, 0.75])
+        outliers = ((data < q1 - 1.5 * (q3 - q1)) | (data > q3 + 1.5 * (q3 - q1))).sum()
+        assert stats[column]['outlier_count'] == outliers
+
+
+def test_matches_pandas():
+    frame = _numeric_frame()
+    _assert_matches_pandas(frame, compute_numeric_stats(frame))
+
+
+def test_column_batches_match_one_batch(monkeypatch):
+    frame = _numeric_frame()
+    whole = compute_numeric_stats(frame)
+    monkeypatch.setattr(numeric_stats, 'BATCH_CELLS', len(frame) * 2)  # Two columns per batch
+    batched = compute_numeric_stats(frame)
+    assert list(batched) == list(whole)
+    for column in whole:
+        for field, value in whole[column].items():
+            assert batched[column][field] == pytest.approx(value, nan_ok=True), (column, field)
+    _assert_matches_pandas(frame, batched)
+
+
+def test_empty_block():
+    stats = compute_numeric_stats(_numeric_frame().iloc[:0])
+    assert stats['normal']['count'] == 0
+    assert np.isnan(stats['normal']['50%'])
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer.plot_data import binned_kde, heatmap_matrix, numeric_plot_data
+
+
+def test_histogram_is_binned_from_all_finite_values():
+    values = pd.Series(np.r_[np.random.default_rng(7).normal(size=10_000), np.nan, np.inf])
+    counts, edges = numeric_plot_data(values)['histogram']
+    expected_counts, expected_edges = np.histogram(values[np.isfinite(values)], bins=len(counts))
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_outliers_get_their_own_histogram_on_the_same_edges():
+    values = pd.Series(np.r_[np.random.default_rng(8).normal(size=5000), [25.0, 30.0, -40.0]])
+    mask = (values.abs() > 20).to_numpy()
+    data = numeric_plot_data(values, outlier_mask=mask)
+    counts, edges = data['histogram']
+    all_counts, _ = np.histogram(values, bins=edges)
+    np.testing.assert_array_equal(counts + data['outlier_histogram'], all_counts)
+    assert data['outlier_histogram'].sum() == 3
+
+
+def test_binned_kde_matches_gaussian_kde():
+    stats = pytest.importorskip('scipy.stats')
+    values = np.random.default_rng(9).gamma(2.0, size=20_000)
+    grid, density = binned_kde(values)
+    expected = stats.gaussian_kde(values)(grid)
+    np.testing.assert_allclose(density, expected, atol=2e-3 * expected.max())
+
+
+def test_binned_kde_needs_spread():
+    assert binned_kde(np.full(10, 1.0)) is None
+    assert binned_kde(np.array([1.0])) is None
+
+
+def _block_correlations():
+    # Two blocks of correlated variables, interleaved, plus one unrelated and one constant
+    rng = np.random.default_rng(10)
+    a, b = rng.normal(size=(2, 2000))
+    columns = {}
+    for i in range(3):
+        columns[f'a{i}'] = a + 0.3 * rng.normal(size=2000)
+        columns[f'b{i}'] = b + 0.3 * rng.normal(size=2000)
+    columns['noise'] = rng.normal(size=2000)
+    columns['constant'] = np.ones(2000)
+    return pd.DataFrame(columns).corr()
+
+
+def test_heatmap_top_n_keeps_the_most_correlated_in_order():
+    matrix = _block_correlations()
+    top = heatmap_matrix(matrix, top_n=6)
+    assert list(top.columns) == [f'{block}{i}' for i in range(3) for block in 'ab']
+    pd.testing.assert_frame_equal(top, matrix.loc[top.index, top.columns])
+    assert heatmap_matrix(matrix, top_n=20) is matrix
+
+
+def test_heatmap_cluster_order_groups_the_blocks():
+    pytest.importorskip('scipy')
+    matrix = _block_correlations()
+    clustered = heatmap_matrix(matrix, order='cluster')
+    assert sorted(clustered.columns) == sorted(matrix.columns) and list(clustered.index) == list(clustered.columns)
+    pd.testing.assert_frame_equal(clustered, matrix.loc[clustered.index, clustered.columns])
+    blocks = [name[0] for name in clustered.columns if name[0] in 'ab']
+    assert blocks in (list('aaabbb'), list('bbbaaa'))
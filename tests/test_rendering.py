@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+from data_visualizer import Settings
+from data_visualizer.visualizer import PlotRenderer, column_plot_spec, heatmap_spec, render_plot, render_plot_specs
+from conftest import make_frame
+
+
+def _specs() -> dict:
+    frame = make_frame(500)
+    return {('variables', name, 'plot'): column_plot_spec(frame[name].dropna(), name)
+            for name in ['normal', 'gappy', 'category', 'flag']}
+
+
+@pytest.mark.parametrize('use_plotly', [False, True])
+def test_thread_rendering_matches_serial(use_plotly):
+    specs = _specs()
+    serial = render_plot_specs(specs, Settings(use_plotly=use_plotly, render_backend='serial'))
+    threaded = render_plot_specs(specs, Settings(use_plotly=use_plotly, render_backend='thread', n_workers=4))
+    assert list(serial) == list(specs)
+    assert threaded == serial
+
+
+def test_background_renderer_returns_plots_under_their_keys():
+    specs = _specs()
+    renderer = PlotRenderer(Settings(render_backend='thread', n_workers=2))
+    for key, spec in reversed(list(specs.items())):
+        renderer.submit(key, spec)
+    rendered = renderer.collect()
+    assert set(rendered) == set(specs)
+    assert rendered == render_plot_specs(specs, Settings(render_backend='serial'))
+
+
+def test_large_heatmaps_render_as_one_image():
+    matrix = make_frame(500)[['normal', 'gappy', 'integer', 'constant']].corr()
+    plot = render_plot(heatmap_spec(matrix), Settings(heatmap_max_annotated=2))
+    assert plot.startswith('data:image/png;base64,')
@@ -0,0 +1,27 @@
+import base64
+from data_visualizer.report import _externalize_assets
+
+
+def _data_uri(payload: bytes, kind: str = 'png') -> str:
+    return f"data:image/{kind};base64," + base64.b64encode(payload).decode('ascii')
+
+
+def test_identical_images_are_written_once(tmp_path):
+    same = _data_uri(b'same image')
+    profile = {
+        'variables': {'a': {'plot': same, 'mean': 1.0}, 'b': {'plot': same}},
+        'Correlations_Plots': {'pearson': _data_uri(b'<svg/>', 'svg+xml')},
+        'alerts': [same, 'plain text'],
+    }
+    written = set()
+    externalized = _externalize_assets(profile, str(tmp_path), 'report_assets', written)
+
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert len(files) == 2 and sorted(written) == files
+    url = externalized['variables']['a']['plot']
+    assert url.startswith('report_assets/') and url.endswith('.png')
+    assert externalized['variables']['b']['plot'] == url == externalized['alerts'][0]
+    assert (tmp_path / url.split('/')[1]).read_bytes() == b'same image'
+    assert externalized['Correlations_Plots']['pearson'].endswith('.svg')
+    assert externalized['variables']['a']['mean'] == 1.0 and externalized['alerts'][1] == 'plain text'
+    assert profile['variables']['a']['plot'] == same  # The input is left as it was
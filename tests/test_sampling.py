@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer import Settings
+from data_visualizer.sampling import RowSample, sample_positions
+from conftest import analyse, assert_same, make_frame
+
+_EXACT_FIELDS = ('missing_values', 'mean', 'std', 'min', 'max', 'value_counts_top_n', 'most_frequent')
+
+
+@pytest.mark.parametrize('method', ['head', 'uniform', 'reservoir', 'stratified'])
+def test_sampled_stages_leave_exact_statistics_unchanged(method):
+    frame = make_frame(3000)
+    full = analyse(frame)
+    sampled = analyse(frame, sampling=method, sample_size=500, sample_stratify_by='category')
+    assert sampled['sampling']['method'] == method and sampled['sampling']['total_rows'] == 3000
+    assert 400 <= sampled['sampling']['rows'] <= 600
+    assert 'sampling' not in full
+    assert sampled['overview'] == full['overview']
+    for name, column_details in full['variables'].items():
+        for field in _EXACT_FIELDS:
+            if field in column_details:
+                assert_same(sampled['variables'][name][field], column_details[field], path=f'{name}/{field}')
+
+
+def test_reservoir_sample_does_not_depend_on_chunking():
+    frame = make_frame(3000)
+    settings = Settings(sampling='reservoir', sample_size=250, sample_seed=5)
+    whole = frame.iloc[sample_positions(frame, settings)]
+    left, right = RowSample(settings), RowSample(settings)
+    for start in range(0, 1700, 400):
+        left.update(frame.iloc[start:min(start + 400, 1700)])
+    right.update(frame.iloc[1700:])
+    merged = left.merge(right).frame
+    pd.testing.assert_frame_equal(merged.sort_index(), whole)
+
+
+def test_stratified_sample_keeps_the_strata_proportions():
+    frame = make_frame(4000)
+    settings = Settings(sampling='stratified', sample_size=400, sample_stratify_by='sparse_category')
+    positions = sample_positions(frame, settings)
+    assert np.all(np.diff(positions) > 0)
+    sampled = frame['sparse_category'].iloc[positions].value_counts(dropna=False, normalize=True)
+    expected = frame['sparse_category'].value_counts(dropna=False, normalize=True)
+    pd.testing.assert_series_equal(sampled.sort_index(), expected.sort_index(), atol=0.01, check_names=False)
+
+
+def test_stratified_sampling_needs_a_column_and_the_whole_table():
+    frame = make_frame(3000)
+    with pytest.raises(ValueError, match='sample_stratify_by'):
+        sample_positions(frame, Settings(sampling='stratified', sample_size=100))
+    with pytest.raises(ValueError, match='whole table'):
+        RowSample(Settings(sampling='stratified', sample_size=100, sample_stratify_by='category'))
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from data_visualizer.sketches import HeavyHitters, HyperLogLog, KLLSketch
+from conftest import analyse
+
+
+def _ids_seen_twice(n=100_000, seed=0):
+    ids = np.array([f'id{i}' for i in range(n // 2)] * 2)
+    np.random.default_rng(seed).shuffle(ids)
+    return pd.Series(ids)
+
+
+def test_heavy_hitters_exact_while_values_fit():
+    values = pd.Series(list('aaabbc') * 10)
+    sketch = HeavyHitters(capacity=10)
+    for start in range(0, len(values), 7):
+        sketch.update(values.iloc[start:start + 7])
+    assert sketch.is_exact
+    assert sketch.top(3) == {'a': 30, 'b': 20, 'c': 10}
+
+
+def test_heavy_hitters_never_empty_on_uniform_values():
+    # Every value has the same count: a Misra-Gries summary would subtract them all away
+    values = _ids_seen_twice(20_000)
+    sketch = HeavyHitters(capacity=100)
+    for start in range(0, len(values), 1000):
+        sketch.update(values.iloc[start:start + 1000])
+    assert not sketch.is_exact
+    assert len(sketch.counts) == 100
+    assert sketch.most_frequent() is not None
+    assert len(sketch.top(10)) == 10
+
+
+def test_heavy_hitters_counts_are_bounded_upper_estimates():
+    rng = np.random.default_rng(1)
+    values = pd.Series(np.where(rng.random(50_000) < 0.2, 'hot', rng.integers(0, 20_000, 50_000).astype(str)))
+    true_counts = values.value_counts()
+    left, right = HeavyHitters(capacity=50), HeavyHitters(capacity=50)
+    for start in range(0, 25_000, 5000):
+        left.update(values.iloc[start:start + 5000])
+        right.update(values.iloc[25_000 + start:30_000 + start])
+    merged = left.merge(right)
+
+    excess = merged.counts - true_counts.reindex(merged.counts.index)
+    assert (excess >= 0).all() and (excess <= merged.error_bound).all()
+    assert true_counts.drop(merged.counts.index).max() <= merged.error_bound
+    assert merged.most_frequent() == 'hot'
+    assert merged.total == len(values)
+
+
+def test_approximate_mode_reports_mode_and_top_values_on_unique_ids():
+    frame = pd.DataFrame({'id': _ids_seen_twice()})
+    exact = analyse(frame, text_analysis=False, type_inference='fast')['variables']['id']
+    approximate = analyse(frame, text_analysis=False, type_inference='fast', approximate=True)['variables']['id']
+    assert approximate['approximate']
+    assert approximate['most_frequent'] is not None
+    assert len(approximate['value_counts_top_n']) == len(exact['value_counts_top_n']) == 10
+    assert abs(approximate['num_unique'] - exact['num_unique']) / exact['num_unique'] < 0.03
+
+
+def test_hyperloglog_estimate_and_merge():
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(np.arange(60_000))
+    right.update(np.arange(40_000, 100_000))
+    assert abs(left.merge(right).estimate() - 100_000) / 100_000 < 0.03
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(2).lognormal(size=200_000)
+    sketch, other = KLLSketch(200), KLLSketch(200, seed=1)
+    sketch.update(values[:100_000])
+    other.update(values[100_000:])
+    estimates = sketch.merge(other).quantiles([0.1, 0.5, 0.9])
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    np.testing.assert_allclose(ranks, [0.1, 0.5, 0.9], atol=0.02)
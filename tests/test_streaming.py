@@ -0,0 +1,92 @@
+import contextlib
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer import AnalysisReport, Settings
+from conftest import analyse, assert_same
+
+_SETTINGS = dict(include_plots=False, include_correlations_plots=False, include_correlations_json=True)
+
+
+def _quiet(run):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return run()
+
+
+def _chunks(frame, size):
+    return (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+
+
+def assert_matches_in_memory(streamed, in_memory, frame):
+    """
+    Exact fields equal the in-memory report; sketched quartiles are within the KLL rank error.
+    """
+    assert streamed['overview'] == in_memory['overview']
+    assert_same(streamed['missingness'], in_memory['missingness'])
+    assert_same(streamed['Correlations_JSON']['pearson'], in_memory['Correlations_JSON']['pearson'], rel=1e-9)
+    for column, stats in in_memory['variables'].items():
+        streamed_stats = streamed['variables'][column]
+        approximate = set(streamed_stats.get('approximate_fields', []))
+        for field, value in stats.items():
+            if field not in approximate and field != 'alerts':
+                assert_same(value, streamed_stats[field], rel=1e-9, path=f'{column}/{field}')
+        values = frame[column].dropna().astype('float64').sort_values().to_numpy() if '50%' in approximate else None
+        for field, q in (('25%', 0.25), ('50%', 0.5), ('75%', 0.75)):
+            if values is not None:
+                # Ties give a value a range of ranks; q must fall in it, up to the rank error
+                below = np.searchsorted(values, streamed_stats[field], side='left') / len(values)
+                at_or_below = np.searchsorted(values, streamed_stats[field], side='right') / len(values)
+                assert below - 0.05 < q < at_or_below + 0.05, (column, field)
+
+
+def test_chunks_match_in_memory(frame):
+    streamed = _quiet(lambda: AnalysisReport.from_chunks(_chunks(frame, 300), Settings(**_SETTINGS)).analyse())
+    assert_matches_in_memory(streamed, analyse(frame, include_correlations_json=True), frame)
+
+
+def test_from_path_reads_csv_in_chunks(tmp_path):
+    frame = pd.DataFrame({'x': np.arange(1000.0), 'label': ['a', 'b', 'c', 'd'] * 250})
+    path = tmp_path / 'data.csv'
+    frame.to_csv(path, index=False)
+    results = _quiet(lambda: AnalysisReport.from_path(str(path), chunksize=128, settings=Settings(**_SETTINGS)).analyse())
+    assert results['overview']['num_Row'] == 1000
+    assert results['variables']['x']['mean'] == pytest.approx(499.5)
+    assert results['variables']['label']['value_counts_top_n'] == {'a': 250, 'b': 250, 'c': 250, 'd': 250}
+
+
+def test_updates_merges_and_saved_states_match_in_memory(frame, tmp_path):
+    in_memory = analyse(frame, include_correlations_json=True)
+    chunked = _quiet(lambda: AnalysisReport.from_chunks(_chunks(frame, 300), Settings(**_SETTINGS)).analyse())
+
+    first = AnalysisReport.from_chunks(_chunks(frame.iloc[:700], 300), Settings(**_SETTINGS))
+    _quiet(lambda: first.update(frame.iloc[700:1200]))
+    second = AnalysisReport(frame.iloc[1200:], Settings(**_SETTINGS))
+    _quiet(lambda: second.state)
+    second.save_state(str(tmp_path / 'second.state'))
+    _quiet(lambda: first.merge(AnalysisReport.from_state(str(tmp_path / 'second.state'))))
+    merged = _quiet(first.analyse)
+
+    assert_matches_in_memory(merged, in_memory, frame)
+    assert merged['overview'] == chunked['overview']
+    assert_same(merged['missingness'], chunked['missingness'])
+
+
+def test_duplicates_can_be_estimated_or_left_out():
+    rng = np.random.default_rng(12)
+    frame = pd.DataFrame({'a': rng.integers(0, 200, 20_000), 'b': rng.integers(0, 50, 20_000)})
+    exact = frame.duplicated().sum()
+
+    def overview(mode):
+        settings = Settings(**_SETTINGS, streaming_duplicates=mode)
+        report = AnalysisReport.from_chunks(_chunks(frame, 3000), settings)
+        return _quiet(report.analyse)['overview'], report.state.row_hashes
+
+    counted, _ = overview('exact')
+    assert counted['duplicated_rows'] == exact and 'approximate_fields' not in counted
+    estimated, sketch = overview('approximate')
+    assert estimated['duplicated_rows'] == pytest.approx(exact, rel=0.02)
+    assert estimated['approximate_fields'] == ['duplicated_rows', 'duplicate_percentage']
+    assert sketch.registers.nbytes == 2 ** Settings().hll_precision
+    skipped, nothing = overview('off')
+    assert nothing is None and 'duplicated_rows' not in skipped and skipped['num_Row'] == len(frame)
@@ -0,0 +1,50 @@
+import re
+from collections import Counter
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer import text_analysis
+from data_visualizer.settings import Settings
+from data_visualizer.text_analysis import TokenCounter
+
+
+def _sentences(n=3000, seed=12):
+    rng = np.random.default_rng(seed)
+    words = np.array(['The', 'quick', 'brown', 'fox,', 'jumps', 'over', 'the', 'lazy', 'dog.', 'and'])
+    return pd.Series([' '.join(rng.choice(words, rng.integers(1, 8))) for _ in range(n)])
+
+
+def _counted(values, settings):
+    counter = TokenCounter(settings)
+    counter.update(values)
+    return counter
+
+
+@pytest.mark.parametrize('tokenizer, split', [('whitespace', str.split), ('word', lambda text: re.findall(r'\w+', text))])
+def test_chunked_counts_match_naive_counting(monkeypatch, tokenizer, split):
+    monkeypatch.setattr(text_analysis, 'TEXT_CHUNK_ROWS', 250)
+    values = _sentences()
+    settings = Settings(text_tokenizer=tokenizer, text_top_k=20)
+    expected = Counter(token for text in values for token in split(text))
+    counter = _counted(values, settings)
+    assert counter.is_exact
+    assert counter.top() == dict(sorted(expected.items(), key=lambda item: -item[1])[:20])
+
+
+def test_lowercase_and_stopwords():
+    values = _sentences()
+    counter = _counted(values, Settings(text_lowercase=True, text_stopwords=['the', 'and']))
+    top = counter.top()
+    assert 'the' not in top and 'The' not in top and 'and' not in top
+    assert top['quick'] == sum(text.lower().split().count('quick') for text in values)
+
+
+def test_bounded_counter_stays_filled_and_merges():
+    values = pd.Series([f'token{i} common' for i in range(30_000)])
+    settings = Settings(text_counter_capacity=100, text_top_k=5)
+    left, right = _counted(values[:15_000], settings), _counted(values[15_000:], settings)
+    merged = left.merge(right)
+    assert not merged.is_exact
+    top = merged.top()
+    assert len(top) == 5
+    assert next(iter(top)) == 'common' and top['common'] >= 30_000
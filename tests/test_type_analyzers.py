@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from data_visualizer.type_analyzers import _detect_outliers_iqr
+
+
+def test_outlier_mask_is_positional_on_any_index():
+    values = np.r_[np.random.default_rng(10).normal(size=1000), [15.0, -12.0], [np.nan]]
+    column = pd.Series(values, index=np.arange(len(values))[::-1] * 7)  # Unsorted, non-default labels
+    info = _detect_outliers_iqr(column, 1.5, return_mask=True)
+
+    q1, q3 = column.quantile([0.25, 0.75])
+    expected = ((column < q1 - 1.5 * (q3 - q1)) | (column > q3 + 1.5 * (q3 - q1))).to_numpy()
+    mask = info['outlier_mask']
+    assert mask.dtype == bool and len(mask) == len(column)
+    np.testing.assert_array_equal(mask, expected)
+    assert info['outlier_count'] == expected.sum()
+    assert mask[1000] and mask[1001] and not mask[-1]
+
+
+def test_outlier_mask_only_kept_for_plots():
+    column = pd.Series(np.arange(100.0))
+    assert 'outlier_mask' not in _detect_outliers_iqr(column, 1.5)
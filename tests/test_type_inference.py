@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_visualizer.settings import Settings
+from data_visualizer.type_inference import infer_column_type
+from conftest import analyse, assert_same
+
+_N = 3000  # Above the default sample size, so fast inference samples the object columns
+_rng = np.random.default_rng(6)
+_COLUMNS = {
+    'floats': pd.Series(_rng.normal(size=_N)),
+    'integral_floats': pd.Series(_rng.integers(0, 9, _N).astype(float)),
+    'ints': pd.Series(_rng.integers(0, 9, _N)),
+    'bools': pd.Series(_rng.random(_N) > 0.5),
+    'categorical': pd.Series(pd.Categorical(_rng.choice(list('abc'), _N))),
+    'dates': pd.Series(pd.date_range('2020-01-01', periods=_N, freq='h')),
+    'strings': pd.Series(_rng.choice(['alpha', 'beta', 'gamma'], _N)),
+    'numeric_strings': pd.Series(_rng.integers(0, 100, _N).astype(str)),
+    'urls': pd.Series([f'https://example.com/{i}' for i in range(_N)]),
+    # Specialised in every sampled value but one: fast inference must confirm on all of them
+    'almost_numeric': pd.Series([str(i) for i in range(_N - 1)] + ['n/a']),
+    # Strings in (almost surely) every sampled value, but a few unsampled ints widen the column to Object
+    'strings_and_ints': pd.Series(list(_rng.choice(['alpha', 'beta', 'gamma'], 100_000)) + [1, 2, 3], dtype=object),
+}
+
+
+@pytest.mark.parametrize('name', list(_COLUMNS))
+def test_fast_inference_matches_complete(name):
+    column = _COLUMNS[name]
+    complete = infer_column_type(column, Settings(type_inference='complete'))
+    fast = infer_column_type(column, Settings(type_inference='fast'))
+    assert str(fast) == str(complete)
+
+
+def test_fast_inference_profiles_like_complete(frame):
+    assert_same(analyse(frame), analyse(frame, type_inference='fast'))
+
+
+def test_fast_inference_dispatches_mixed_columns_like_complete():
+    frame = pd.DataFrame({'mixed': _COLUMNS['strings_and_ints']})
+    assert_same(analyse(frame), analyse(frame, type_inference='fast'))